@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared Phonetool parser against the legacy per-call regexes.
+
+Generates synthetic user pages of increasing size, checks that both parsers
+extract the same fields, and reports the time per page.
+
+Usage:
+    python bench_phonetool_parser.py [--pages 200] [--reports 12]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from phonetool_parser import default_parser
+
+
+def legacy_parse(content: str, username: str) -> dict:
+    """parse_user_info as it was before phonetool_parser (uncompiled, full-page scans)."""
+    info = {"username": username, "name": "", "title": "", "level": "", "manager": "",
+            "building": "", "direct_reports": [], "total_reports": 0}
+    
+    for pattern in [r'<title>([^<]+?)\s*-\s*PhoneTool', r'<h1[^>]*>([^<]+)</h1>',
+                    r'"name"\s*:\s*"([^"]+)"']:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            info["name"] = match.group(1).strip()
+            break
+    
+    for pattern in [r'(?:Job Title|Title)["\s:]+([^<"\n]+)', r'"jobTitle"\s*:\s*"([^"]+)"',
+                    r'<span[^>]*class="[^"]*title[^"]*"[^>]*>([^<]+)</span>']:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            info["title"] = match.group(1).strip()
+            break
+    
+    level_match = re.search(r'(?:Level|L)[\s:]+(\d+|[IVX]+)', content, re.IGNORECASE)
+    if level_match:
+        info["level"] = level_match.group(1).strip()
+    
+    for pattern in [r'Manager["\s:]+<a[^>]+href="/users/([^"]+)"', r'"manager"\s*:\s*"([^"]+)"']:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            info["manager"] = match.group(1).strip()
+            break
+    
+    section = re.search(
+        r'(?:Direct Reports?|Reports to|Team Members?)(.*?)(?:<h\d|<div class="section"|$)',
+        content,
+        re.IGNORECASE | re.DOTALL
+    )
+    if section:
+        info["direct_reports"] = list(set(re.findall(r'/users/([a-z0-9]+)', section.group(1), re.IGNORECASE)))
+    
+    total_match = re.search(r'(\d+)\s+(?:total\s+)?(?:direct\s+)?reports?', content, re.IGNORECASE)
+    if total_match:
+        info["total_reports"] = int(total_match.group(1))
+    else:
+        info["total_reports"] = len(info["direct_reports"])
+    
+    return info
+
+
+def synthetic_page(username: str, reports: int, filler: int, rng: random.Random) -> str:
+    """A phonetool-like page with `filler` paragraphs of unrelated markup."""
+    paragraphs = "".join(
+        f'<p class="bio">Worked on project {rng.randint(1, 999)} with '
+        f'<a href="/teams/{rng.randint(1, 99)}">team</a> since {rng.randint(2010, 2024)}.</p>'
+        for _ in range(filler)
+    )
+    links = "".join(
+        f'<li><a href="/users/{username}r{i}">{username.upper()} R{i}</a></li>' for i in range(reports)
+    )
+    manager = f"{username}mgr"
+    return (
+        f"<html><head><title>{username.title()} Person - PhoneTool</title></head><body>"
+        f"<h1>{username.title()} Person</h1>"
+        f'<div class="details"><span>Job Title: Senior Engineer</span><span>Level: 6</span>'
+        f'<span>Manager: <a href="/users/{manager}">{manager}</a></span></div>'
+        f"{paragraphs}"
+        f'<h2>Direct Reports</h2><div>{reports} direct reports</div><ul>{links}</ul>'
+        f'<div class="section">Recent activity</div>{paragraphs}'
+        "</body></html>"
+    )
+
+
+def comparable(info: dict) -> dict:
+    # Legacy deduplicates through a set, so report order is not meaningful
+    return {**info, "direct_reports": sorted(info["direct_reports"])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Phonetool page parser")
+    parser.add_argument("--pages", type=int, default=200, help="Pages per size")
+    parser.add_argument("--reports", type=int, default=12, help="Direct reports per page")
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    
+    print("=" * 80)
+    print("⏱️  PHONETOOL PARSER BENCHMARK")
+    print("=" * 80)
+    print(f"{'Filler':>8} {'Page KB':>8} {'Legacy ms':>10} {'Shared ms':>10} {'Speedup':>8}")
+    
+    for filler in (10, 100, 1000, 5000):
+        pages = [(f"user{i}", synthetic_page(f"user{i}", args.reports, filler, rng))
+                 for i in range(args.pages)]
+        
+        for username, content in pages:
+            legacy = comparable(legacy_parse(content, username))
+            shared = comparable(default_parser.parse(content, username))
+            if legacy != shared:
+                print(f"❌ Mismatch for {username}: {legacy} != {shared}")
+                return 1
+        
+        start = time.perf_counter()
+        for username, content in pages:
+            legacy_parse(content, username)
+        legacy_ms = (time.perf_counter() - start) * 1000 / len(pages)
+        
+        start = time.perf_counter()
+        for username, content in pages:
+            default_parser.parse(content, username)
+        shared_ms = (time.perf_counter() - start) * 1000 / len(pages)
+        
+        page_kb = sum(len(content) for _, content in pages) / len(pages) / 1024
+        print(f"{filler:>8} {page_kb:>8.1f} {legacy_ms:>10.3f} {shared_ms:>10.3f} {legacy_ms / shared_ms:>7.1f}x")
+    
+    print()
+    print("✅ Both parsers extracted identical fields on every page")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
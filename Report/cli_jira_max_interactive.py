@@ -4,6 +4,7 @@ Interactive Jira Max Agent
 Asks user for project and provides intelligent analysis
 """
 
+import asyncio
 import sys
 import os
 
@@ -11,7 +12,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tpm-slack-bot'))
 
 from src.agents.jira_max_mvp import JiraMaxMVP
-from src.services.mcp_client import MCPClient
+from jira_max_async import AsyncJiraMax
+from mcp_async import AsyncMCPClient
+from mcp_session_pool import get_shared_pool
+from mcp_stdio import StdioMCPClient
 
 
 class JiraMaxInteractiveAgent:
@@ -22,6 +26,9 @@ class JiraMaxInteractiveAgent:
         self.mcp = None
         self.jira_max = None
         self.project = None
+        # Event loop and asyncio MCP client for full reports, kept between reports
+        self.loop = None
+        self.async_mcp = None
         
     def print_banner(self):
         """Print welcome banner"""
@@ -42,7 +49,15 @@ class JiraMaxInteractiveAgent:
         print("🔧 Initializing connection to Jira...")
         
         try:
-            self.mcp = MCPClient("rbks-mcp-servers")
+            # One warm server process, health-checked and replaced if it dies,
+            # lent to every caller at once: StdioMCPClient multiplexes
+            # concurrent requests, so the full-report sections overlap
+            self.mcp = get_shared_pool(
+                "rbks-mcp-servers",
+                size=1,
+                factory=lambda: StdioMCPClient.from_config("rbks-mcp-servers"),
+                multiplexed=True
+            )
             self.jira_max = JiraMaxMVP(self.mcp)
             print("✅ Connected successfully!\n")
             return True
@@ -268,64 +283,91 @@ class JiraMaxInteractiveAgent:
         if confirm and confirm != 'y':
             return
         
-        # Team workload
-        print("\n" + "=" * 80)
-        print("1/4 - Team Workload")
-        print("=" * 80)
-        try:
-            result = self.jira_max.team_workload(self.project)
-            print(result["report"])
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        # Fetch all four sections concurrently and print each as it completes
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+        if not self.loop.run_until_complete(self._full_report_sections()):
+            return
         
-        # Quality metrics
         print("\n" + "=" * 80)
-        print("2/4 - Quality Metrics (Last 60 Days)")
+        print("✅ Full Report Complete!")
         print("=" * 80)
-        try:
-            result = self.jira_max.features_vs_bugs(self.project, days=60)
-            print(result["report"])
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    
+    async def _full_report_sections(self):
+        """Run the full report's sections concurrently, printing each when done; False if MCP is unavailable"""
+        if self.async_mcp is None or self.async_mcp.closed:
+            try:
+                self.async_mcp = await AsyncMCPClient.from_config("rbks-mcp-servers")
+            except Exception as e:
+                print(f"❌ Failed to connect: {e}")
+                return False
+        jira_max = AsyncJiraMax(self.async_mcp, JiraMaxMVP)
+        project = self.project
         
-        # Releasable items
-        print("\n" + "=" * 80)
-        print("3/4 - Releasable Items")
-        print("=" * 80)
-        try:
-            result = self.jira_max.search_issues(
-                f'project = {self.project} AND status = Releasable',
-                self.project,
+        async def team_workload():
+            result = await jira_max.team_workload(project)
+            return result["report"]
+        
+        async def quality_metrics():
+            result = await jira_max.features_vs_bugs(project, days=60)
+            return result["report"]
+        
+        async def releasable_items():
+            result = await jira_max.search_issues(
+                f'project = {project} AND status = Releasable',
+                project,
                 max_results=10
             )
-            if result['total'] > 0:
-                print(f"\n🚀 {result['total']} issues ready to deploy!")
-                for item in result['results'][:5]:
-                    print(f"  • {item['key']}: {item['summary'][:60]}...")
-            else:
-                print("\n📋 No releasable items found")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+            if result['total'] == 0:
+                return "\n📋 No releasable items found"
+            lines = [f"\n🚀 {result['total']} issues ready to deploy!"]
+            for item in result['results'][:5]:
+                lines.append(f"  • {item['key']}: {item['summary'][:60]}...")
+            return "\n".join(lines)
         
-        # In progress
-        print("\n" + "=" * 80)
-        print("4/4 - In Progress Work")
-        print("=" * 80)
-        try:
-            result = self.jira_max.search_issues(
-                f'project = {self.project} AND status = "In Progress"',
-                self.project,
+        async def in_progress():
+            result = await jira_max.search_issues(
+                f'project = {project} AND status = "In Progress"',
+                project,
                 max_results=10
             )
-            print(f"\n🔄 {result['total']} issues in progress")
+            lines = [f"\n🔄 {result['total']} issues in progress"]
             for item in result['results'][:5]:
-                print(f"  • {item['key']}: {item['summary'][:60]}... ({item['assignee']})")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+                lines.append(f"  • {item['key']}: {item['summary'][:60]}... ({item['assignee']})")
+            return "\n".join(lines)
         
-        print("\n" + "=" * 80)
-        print("✅ Full Report Complete!")
-        print("=" * 80)
+        sections = [
+            ("Team Workload", team_workload),
+            ("Quality Metrics (Last 60 Days)", quality_metrics),
+            ("Releasable Items", releasable_items),
+            ("In Progress Work", in_progress),
+        ]
+        
+        async def run_section(number, title, section):
+            try:
+                body = await section()
+            except Exception as e:
+                body = f"❌ Error: {e}"
+            return number, title, body
+        
+        tasks = [run_section(number, title, section)
+                 for number, (title, section) in enumerate(sections, 1)]
+        for finished in asyncio.as_completed(tasks):
+            number, title, body = await finished
+            print("\n" + "=" * 80)
+            print(f"{number}/{len(sections)} - {title}")
+            print("=" * 80)
+            print(body)
+        return True
+    
+    def close(self):
+        """Stop the MCP servers started for this session"""
+        if self.mcp:
+            self.mcp.close()
+        if self.loop:
+            if self.async_mcp:
+                self.loop.run_until_complete(self.async_mcp.close())
+            self.loop.close()
     
     def run(self):
         """Main agent loop"""
@@ -373,7 +415,10 @@ class JiraMaxInteractiveAgent:
 def main():
     """Entry point"""
     agent = JiraMaxInteractiveAgent()
-    return agent.run()
+    try:
+        return agent.run()
+    finally:
+        agent.close()
 
 
 if __name__ == "__main__":
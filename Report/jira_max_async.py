@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Async versions of the Jira Max operations.
+
+Runs JiraMaxMVP's analyses against an AsyncMCPClient so they can be awaited
+and run concurrently. All MCP traffic goes through the asyncio client on
+the event loop: the analyses get a blocking facade whose call_tool submits
+the call to the loop and waits for it. JiraMaxMVP itself (in tpm-slack-bot)
+is synchronous, so each analysis runs in a worker thread that only waits
+on the loop; the requests themselves overlap on the one server process.
+
+Usage:
+    mcp = await AsyncMCPClient.from_config("rbks-mcp-servers")
+    jira_max = AsyncJiraMax(mcp, JiraMaxMVP)
+    workload, quality = await asyncio.gather(
+        jira_max.team_workload("RCIT"),
+        jira_max.features_vs_bugs("RCIT", days=60),
+    )
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _BlockingMCP:
+    """MCPClient-shaped facade that runs each call on the asyncio client's loop."""
+    
+    def __init__(self, mcp: Any, loop: asyncio.AbstractEventLoop):
+        self.mcp = mcp
+        self.loop = loop
+    
+    def call_tool(self, tool: str, params: Dict) -> Any:
+        return asyncio.run_coroutine_threadsafe(self.mcp.call_tool(tool, params), self.loop).result()
+    
+    def list_tools(self) -> List[Dict]:
+        return asyncio.run_coroutine_threadsafe(self.mcp.list_tools(), self.loop).result()
+
+
+class AsyncJiraMax:
+    """Awaitable team_workload, features_vs_bugs and search_issues."""
+    
+    def __init__(self, mcp: Any, jira_max_factory: Callable[[Any], Any]):
+        """
+        Args:
+            mcp: An AsyncMCPClient
+            jira_max_factory: JiraMaxMVP, or anything that builds an object
+                with the same methods from an MCP client
+        """
+        self.mcp = mcp
+        self.jira_max_factory = jira_max_factory
+        self._jira_max: Optional[Any] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _run(self, operation: str, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The facade is tied to the loop the asyncio client runs on
+            self._jira_max = self.jira_max_factory(_BlockingMCP(self.mcp, loop))
+            self._loop = loop
+        return await asyncio.to_thread(getattr(self._jira_max, operation), *args, **kwargs)
+    
+    async def team_workload(self, project: str) -> Dict:
+        return await self._run("team_workload", project)
+    
+    async def features_vs_bugs(self, project: str, days: int = 30) -> Dict:
+        return await self._run("features_vs_bugs", project, days=days)
+    
+    async def search_issues(self, query: str, project: str, max_results: int = 10) -> Dict:
+        return await self._run("search_issues", query, project, max_results=max_results)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+asyncio-native MCP client over stdio.
+
+Runs one MCP server process on asyncio subprocess streams, so coroutines
+can issue any number of requests on it and await them with asyncio.gather
+or asyncio.as_completed without a thread per call:
+
+    - every request gets a unique JSON-RPC id and an asyncio Future in a
+      pending map
+    - a reader task reads the server's stdout line by line and resolves the
+      Future whose id matches each response, in whatever order they arrive
+    - each request has its own timeout; on timeout or cancellation the
+      server is sent notifications/cancelled and the id is dropped from the
+      pending map
+    - if the server exits, every pending request fails with ConnectionError
+
+Tool results are decoded the same way as StdioMCPClient.call_tool.
+
+Usage:
+    from mcp_async import AsyncMCPClient
+    
+    async def main():
+        async with await AsyncMCPClient.from_config("rbks-mcp-servers") as mcp:
+            bugs, wiki = await asyncio.gather(
+                mcp.call_tool("jira_search_issues", {"jql": "project = RCIT AND issuetype = Bug"}),
+                mcp.call_tool("confluence_search_pages", {"query": "RCIT launch plan"}),
+            )
+"""
+
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from mcp_stdio import DEFAULT_CONFIG, PROTOCOL_VERSION, MCPError, StdioMCPClient
+
+# Jira search results arrive as one JSON line; asyncio's default 64 KiB
+# line limit is far too small for them
+LINE_LIMIT = 64 * 1024 * 1024
+
+
+class AsyncMCPClient:
+    """One MCP server process shared by many concurrent coroutines."""
+    
+    def __init__(self, process: asyncio.subprocess.Process, request_timeout: float = 60.0):
+        """
+        Wrap a started server process; use start() or from_config() instead.
+        
+        Args:
+            process: Server process with stdin/stdout pipes
+            request_timeout: Default seconds to wait for each response
+        """
+        self.process = process
+        self.request_timeout = request_timeout
+        self.server_info: Optional[Dict] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._closed = False
+        self._reader = asyncio.get_running_loop().create_task(self._read_loop())
+    
+    @classmethod
+    async def start(cls, command: str, args: Optional[List[str]] = None,
+                    env: Optional[Dict[str, str]] = None, request_timeout: float = 60.0,
+                    client_name: str = "tpm-report") -> "AsyncMCPClient":
+        """
+        Start the server and complete the MCP initialize handshake.
+        
+        Args:
+            command: Server executable
+            args: Server arguments
+            env: Extra environment variables for the server
+            request_timeout: Default seconds to wait for each response
+            client_name: Name reported to the server in clientInfo
+        """
+        process = await asyncio.create_subprocess_exec(
+            command, *(args or []),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={**os.environ, **(env or {})},
+            limit=LINE_LIMIT
+        )
+        client = cls(process, request_timeout=request_timeout)
+        try:
+            client.server_info = await client.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": client_name, "version": "1.0"}
+            })
+            await client.notify("notifications/initialized")
+        except BaseException:
+            await client.close()
+            raise
+        return client
+    
+    @classmethod
+    async def from_config(cls, server: str = "rbks-mcp-servers", config_path: str = DEFAULT_CONFIG,
+                          **kwargs) -> "AsyncMCPClient":
+        """Start a server defined in a Kiro-style mcp.json (timeout there is in ms)."""
+        with open(config_path, "r") as f:
+            config = json.load(f)["mcpServers"][server]
+        if "timeout" in config:
+            kwargs.setdefault("request_timeout", config["timeout"] / 1000)
+        return await cls.start(config["command"], config.get("args"), config.get("env"), **kwargs)
+    
+    @property
+    def closed(self) -> bool:
+        """True once the server has exited or close() was called."""
+        return self._closed
+    
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+    
+    def _write(self, message: Dict):
+        if self._closed or self.process.stdin.is_closing():
+            raise ConnectionError("MCP connection is closed")
+        # One write() call per message, so concurrent senders never interleave
+        self.process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    
+    async def _send(self, message: Dict):
+        async with self._write_lock:
+            self._write(message)
+            try:
+                await self.process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise ConnectionError(f"MCP server stdin closed: {e}") from e
+    
+    async def _read_loop(self):
+        """Resolve pending requests as responses arrive, in any order."""
+        reason = "MCP server exited"
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    # Servers sometimes log to stdout; skip anything that isn't JSON-RPC
+                    continue
+                if not isinstance(message, dict) or "id" not in message or "method" in message:
+                    # Notifications and server-to-client requests are not used here
+                    continue
+                
+                future = self._pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue  # Timed out or cancelled already
+                
+                if "error" in message:
+                    error = message["error"] or {}
+                    future.set_exception(MCPError(error.get("message", "MCP error"),
+                                                  error.get("code"), error.get("data")))
+                else:
+                    future.set_result(message.get("result"))
+        except ValueError as e:
+            # A line over LINE_LIMIT leaves the stream unusable
+            reason = f"MCP server response unreadable: {e}"
+        finally:
+            # The server is gone, so nothing pending will ever be answered
+            self._closed = True
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(reason))
+    
+    def _abandon(self, request_id: int, reason: str):
+        """Stop waiting for a request and tell the server to abandon it."""
+        self._pending.pop(request_id, None)
+        try:
+            # Written without draining, so this also works while being cancelled
+            self._write({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                         "params": {"requestId": request_id, "reason": reason}})
+        except ConnectionError:
+            pass
+    
+    async def request(self, method: str, params: Optional[Dict] = None,
+                      timeout: Optional[float] = None) -> Any:
+        """
+        Send a request and await its result, raising TimeoutError after timeout seconds.
+        
+        A timed-out or cancelled request is cancelled on the server and its
+        late response, if any, is ignored.
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._send(message)
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+        
+        timeout = self.request_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._abandon(request_id, "timeout")
+            raise TimeoutError(f"MCP request {request_id} timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            self._abandon(request_id, "cancelled")
+            raise
+    
+    async def notify(self, method: str, params: Optional[Dict] = None):
+        """Send a notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+    
+    async def list_tools(self) -> List[Dict]:
+        """All tools the server offers, following pagination cursors."""
+        tools, cursor = [], None
+        while True:
+            result = await self.request("tools/list", {"cursor": cursor} if cursor else {})
+            tools.extend(result.get("tools", []))
+            cursor = result.get("nextCursor")
+            if not cursor:
+                return tools
+    
+    async def call_tool(self, tool: str, arguments: Dict, timeout: Optional[float] = None) -> Any:
+        """Call a tool and return its decoded result (same shape as MCPClient.call_tool)."""
+        result = await self.request("tools/call", {"name": tool, "arguments": arguments}, timeout)
+        return StdioMCPClient._tool_result(result)
+    
+    async def close(self):
+        """Stop the server; pending requests fail with ConnectionError."""
+        async with self._write_lock:
+            self._closed = True
+            if not self.process.stdin.is_closing():
+                self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        await self._reader
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
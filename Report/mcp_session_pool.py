@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Warm pool of MCP sessions shared across agents in a long-lived process.
+
+Creating an MCPClient("rbks-mcp-servers") spawns a stdio server process and
+runs the MCP handshake, which takes seconds. The pool does that once per
+session, up front, and hands the same initialized sessions to every caller:
+
+    - `size` sessions are started in parallel when the pool is created
+    - callers borrow a session with `with pool.session() as client:` or just
+      call pool.call_tool(...) / pool.list_tools(), so the pool can be passed
+      anywhere an MCPClient is expected
+    - sessions idle for longer than `health_check_interval` are pinged with
+      list_tools() before being handed out, and a background keepalive does
+      the same for idle sessions; dead sessions are closed and replaced
+    - with multiplexed=True (for StdioMCPClient sessions, which take
+      concurrent requests) a session is lent to many callers at once, the
+      least busy one first, instead of one caller at a time
+    - get_shared_pool() returns one pool per server for the whole process
+
+Used by long-lived processes: the interactive Jira Max CLI and the
+status monitor's --adaptive polling loop. One-shot scripts gain nothing
+from it and create their client directly.
+
+Usage:
+    from mcp_session_pool import get_shared_pool
+    
+    mcp = get_shared_pool("rbks-mcp-servers")
+    result = mcp.call_tool("jira_search_issues", {"jql": "project = RCIT", "maxResults": 5})
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+def default_client_factory(server: str) -> Callable[[], Any]:
+    """
+    Factory for tpm-slack-bot's MCPClient, imported on first use.
+    
+    The client is imported as src.services.mcp_client, the same path the
+    Jira Max agents use, so the process holds one copy of that module.
+    """
+    def create():
+        # Add tpm-slack-bot to path
+        bot_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tpm-slack-bot')
+        if bot_dir not in sys.path:
+            sys.path.insert(0, bot_dir)
+        from src.services.mcp_client import MCPClient
+        return MCPClient(server)
+    return create
+
+
+class _Session:
+    """One pooled client and when it was last known to be healthy."""
+    
+    def __init__(self, client: Any):
+        self.client = client
+        self.checked_at = time.monotonic()
+        # Callers currently using the session (multiplexed pools only)
+        self.borrowers = 0
+        self.discarded = False
+
+
+class MCPSessionPool:
+    """Fixed-size pool of initialized MCP client sessions."""
+    
+    def __init__(
+        self,
+        server: str = "rbks-mcp-servers",
+        size: int = 2,
+        factory: Optional[Callable[[], Any]] = None,
+        health_check_interval: float = 60.0,
+        acquire_timeout: float = 60.0,
+        keepalive: bool = True,
+        multiplexed: bool = False
+    ):
+        """
+        Args:
+            server: MCP server name passed to the default factory
+            size: Sessions kept warm
+            factory: Creates one initialized client (default: MCPClient(server))
+            health_check_interval: Ping sessions idle for longer than this
+                many seconds before reuse
+            acquire_timeout: Seconds to wait for a free session
+            keepalive: Ping idle sessions in the background so they stay warm
+            multiplexed: Lend each session to several callers at once; only
+                for clients that take concurrent requests, e.g. StdioMCPClient
+        """
+        self.server = server
+        self.size = size
+        self.factory = factory or default_client_factory(server)
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.multiplexed = multiplexed
+        self.stats = {"created": 0, "reused": 0, "health_checks": 0, "replaced": 0}
+        
+        self._idle: List[_Session] = []
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        
+        self.warm()
+        
+        self._keepalive = None
+        if keepalive and health_check_interval > 0:
+            self._keepalive = threading.Thread(target=self._keepalive_loop, daemon=True,
+                                               name=f"mcp-pool-{server}")
+            self._keepalive.start()
+    
+    def _create(self) -> _Session:
+        session = _Session(self.factory())
+        with self._cond:
+            self.stats["created"] += 1
+        return session
+    
+    def warm(self):
+        """Start sessions in parallel until `size` are open."""
+        with self._cond:
+            missing = self.size - self._open
+            self._open += max(0, missing)
+        if missing <= 0:
+            return
+        
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            futures = [pool.submit(self._create) for _ in range(missing)]
+        
+        errors = []
+        with self._cond:
+            for future in futures:
+                if future.exception() is not None:
+                    self._open -= 1
+                    errors.append(future.exception())
+                else:
+                    self._idle.append(future.result())
+            self._cond.notify_all()
+        if errors and not self._idle:
+            raise errors[0]
+    
+    def _healthy(self, session: _Session) -> bool:
+        with self._cond:
+            self.stats["health_checks"] += 1
+        try:
+            session.client.list_tools()
+        except Exception:
+            return False
+        session.checked_at = time.monotonic()
+        return True
+    
+    @staticmethod
+    def _close_client(client: Any):
+        close = getattr(client, "close", None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+    
+    def acquire(self, timeout: Optional[float] = None) -> _Session:
+        """Borrow a healthy session, replacing dead ones; raises TimeoutError."""
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("MCP session pool is closed")
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No free {self.server} session after waiting")
+                    self._cond.wait(remaining)
+                
+                if self._idle and self.multiplexed:
+                    session = min(self._idle, key=lambda s: s.borrowers)
+                    if session.borrowers or time.monotonic() - session.checked_at < self.health_check_interval:
+                        # In use or recently checked: share it without a ping
+                        session.borrowers += 1
+                        self.stats["reused"] += 1
+                        return session
+                    # Check it alone; other callers wait for the outcome
+                    self._idle.remove(session)
+                elif self._idle:
+                    session = self._idle.pop()
+                else:
+                    # A dead session was dropped; open a replacement outside the lock
+                    session = None
+                    self._open += 1
+            
+            if session is None:
+                try:
+                    session = self._create()
+                except Exception:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+                self._lend(session)
+                return session
+            
+            if time.monotonic() - session.checked_at < self.health_check_interval or self._healthy(session):
+                with self._cond:
+                    self.stats["reused"] += 1
+                self._lend(session)
+                return session
+            self._discard(session)
+    
+    def _lend(self, session: _Session):
+        """Hand out a session that no one else holds."""
+        if self.multiplexed:
+            with self._cond:
+                session.borrowers += 1
+                self._idle.append(session)
+                self._cond.notify_all()
+    
+    def release(self, session: _Session, broken: bool = False):
+        """Return a borrowed session; broken sessions are closed instead."""
+        if self.multiplexed:
+            with self._cond:
+                session.borrowers -= 1
+        if broken:
+            self._discard(session)
+            return
+        if self.multiplexed:
+            return
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+                self._close_client(session.client)
+                return
+            self._idle.append(session)
+            self._cond.notify()
+    
+    def _discard(self, session: _Session):
+        with self._cond:
+            # Several borrowers of a multiplexed session may report it broken
+            if session.discarded:
+                return
+            session.discarded = True
+            if session in self._idle:
+                self._idle.remove(session)
+        self._close_client(session.client)
+        with self._cond:
+            self._open -= 1
+            self.stats["replaced"] += 1
+            self._cond.notify()
+    
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Borrow a client for the duration of a with block."""
+        session = self.acquire(timeout)
+        broken = False
+        try:
+            yield session.client
+        except Exception:
+            # The error may be the tool's or the session's; keep the session only if it still answers
+            broken = not self._healthy(session)
+            raise
+        finally:
+            self.release(session, broken=broken)
+    
+    def call_tool(self, tool: str, params: Dict) -> Any:
+        """MCPClient.call_tool on a pooled session."""
+        with self.session() as client:
+            return client.call_tool(tool, params)
+    
+    def list_tools(self) -> List[Dict]:
+        """MCPClient.list_tools on a pooled session."""
+        with self.session() as client:
+            return client.list_tools()
+    
+    def _keepalive_loop(self):
+        while True:
+            time.sleep(self.health_check_interval / 2)
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = [s for s in self._idle
+                       if not s.borrowers and now - s.checked_at >= self.health_check_interval]
+                for session in due:
+                    self._idle.remove(session)
+            
+            for session in due:
+                if not self._healthy(session):
+                    self._discard(session)
+                    continue
+                with self._cond:
+                    if self._closed:
+                        self._open -= 1
+                        self._close_client(session.client)
+                        continue
+                    self._idle.append(session)
+                    self._cond.notify()
+            try:
+                self.warm()
+            except Exception:
+                pass
+    
+    def close(self):
+        """
+        Close idle sessions; borrowed ones are closed when returned.
+        
+        A multiplexed pool keeps lent sessions in the idle list, so close()
+        closes them even if calls are still running on them.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for session in idle:
+                session.discarded = True
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._close_client(session.client)
+
+
+_shared_pools: Dict[str, MCPSessionPool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(server: str = "rbks-mcp-servers", size: int = 2,
+                    factory: Optional[Callable[[], Any]] = None,
+                    multiplexed: bool = False) -> MCPSessionPool:
+    """
+    The process-wide pool for a server, created on first use.
+    
+    Later calls return the same pool regardless of the other arguments, so
+    every agent in the process shares the same warm sessions.
+    """
+    with _shared_lock:
+        pool = _shared_pools.get(server)
+        if pool is None or pool._closed:
+            pool = MCPSessionPool(server, size=size, factory=factory, multiplexed=multiplexed)
+            _shared_pools[server] = pool
+        return pool
+
+
+@atexit.register
+def _close_shared_pools():
+    for pool in list(_shared_pools.values()):
+        pool.close()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+MCP client that multiplexes concurrent requests over one stdio connection.
+
+A plain MCP client writes a request and blocks until the server's reply
+arrives, so one server process serves one call at a time. This client keeps
+a single server process and lets any number of threads have requests in
+flight on it:
+
+    - every request gets a unique JSON-RPC id and a Future in a pending map
+    - writes to the server's stdin are serialized with a lock; nothing waits
+      for a reply while holding it
+    - a dedicated reader thread reads stdout line by line and resolves the
+      Future whose id matches each response, in whatever order they arrive
+    - each request has its own timeout; on timeout the server is sent
+      notifications/cancelled and the id is dropped from the pending map
+    - if the server exits, every pending request fails with ConnectionError
+
+Usage:
+    from mcp_stdio import StdioMCPClient
+    
+    client = StdioMCPClient.from_config("rbks-mcp-servers")
+    jira = client.call_tool_async("jira_search_issues", {"jql": "project = RCIT", "maxResults": 5})
+    wiki = client.call_tool_async("confluence_search_pages", {"query": "launch plan"})
+    print(jira.result(30), wiki.result(30))
+"""
+
+import itertools
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+
+PROTOCOL_VERSION = "2024-11-05"
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".kiro", "settings", "mcp.json")
+
+
+class MCPError(Exception):
+    """A JSON-RPC error response, or a tool result flagged isError."""
+    
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class StdioMCPClient:
+    """One MCP server process shared by many concurrent requests."""
+    
+    def __init__(self, command: str, args: Optional[List[str]] = None,
+                 env: Optional[Dict[str, str]] = None, request_timeout: float = 60.0,
+                 client_name: str = "tpm-report"):
+        """
+        Start the server and complete the MCP initialize handshake.
+        
+        Args:
+            command: Server executable
+            args: Server arguments
+            env: Extra environment variables for the server
+            request_timeout: Default seconds to wait for each response
+            client_name: Name reported to the server in clientInfo
+        """
+        self.request_timeout = request_timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        
+        self.process = subprocess.Popen(
+            [command] + list(args or []),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, **(env or {})},
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True,
+                                        name=f"mcp-reader-{command}")
+        self._reader.start()
+        
+        try:
+            self.server_info = self.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": client_name, "version": "1.0"}
+            })
+            self.notify("notifications/initialized")
+        except Exception:
+            self.close()
+            raise
+    
+    @classmethod
+    def from_config(cls, server: str = "rbks-mcp-servers", config_path: str = DEFAULT_CONFIG,
+                    **kwargs) -> "StdioMCPClient":
+        """Start a server defined in a Kiro-style mcp.json (timeout there is in ms)."""
+        with open(config_path, "r") as f:
+            config = json.load(f)["mcpServers"][server]
+        if "timeout" in config:
+            kwargs.setdefault("request_timeout", config["timeout"] / 1000)
+        return cls(config["command"], config.get("args"), config.get("env"), **kwargs)
+    
+    def _send(self, message: Dict):
+        line = json.dumps(message) + "\n"
+        with self._write_lock:
+            if self._closed:
+                raise ConnectionError("MCP connection is closed")
+            try:
+                self.process.stdin.write(line)
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                raise ConnectionError(f"MCP server stdin closed: {e}") from e
+    
+    def _read_loop(self):
+        """Resolve pending requests as responses arrive, in any order."""
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                # Servers sometimes log to stdout; skip anything that isn't JSON-RPC
+                continue
+            if not isinstance(message, dict) or "id" not in message or "method" in message:
+                # Notifications and server-to-client requests are not used here
+                continue
+            
+            with self._pending_lock:
+                future = self._pending.pop(message["id"], None)
+            if future is None:
+                continue  # Timed out or cancelled already
+            
+            if "error" in message:
+                error = message["error"] or {}
+                self._resolve(future, error=MCPError(error.get("message", "MCP error"),
+                                                     error.get("code"), error.get("data")))
+            else:
+                self._resolve(future, result=message.get("result"))
+        
+        # EOF: the server is gone, so nothing pending will ever be answered
+        self._closed = True
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            self._resolve(future, error=ConnectionError("MCP server exited"))
+    
+    @staticmethod
+    def _resolve(future: Future, result: Any = None, error: Optional[Exception] = None):
+        """Complete a request Future unless the caller already cancelled it."""
+        # The waiter can time out or cancel at any moment, even after the
+        # future left the pending map; that must not kill the reader thread
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+    
+    def request_async(self, method: str, params: Optional[Dict] = None) -> Future:
+        """Send a request without waiting; the Future resolves to its result."""
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        future.request_id = request_id
+        
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            self._send(message)
+        except ConnectionError as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            future.set_exception(e)
+        return future
+    
+    def wait(self, future: Future, timeout: Optional[float] = None) -> Any:
+        """
+        Result of a request Future, raising TimeoutError after timeout seconds.
+        
+        A timed-out request is cancelled on the server and its late response,
+        if any, is ignored.
+        """
+        timeout = self.request_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.cancel(future)
+            raise TimeoutError(f"MCP request {future.request_id} timed out after {timeout}s") from None
+    
+    def cancel(self, future: Future, reason: str = "timeout"):
+        """Stop waiting for a request and tell the server to abandon it."""
+        request_id = getattr(future, "request_id", None)
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+        future.cancel()
+        try:
+            self.notify("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except ConnectionError:
+            pass
+    
+    def request(self, method: str, params: Optional[Dict] = None,
+                timeout: Optional[float] = None) -> Any:
+        """Send a request and wait for its result."""
+        return self.wait(self.request_async(method, params), timeout)
+    
+    def notify(self, method: str, params: Optional[Dict] = None):
+        """Send a notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+    
+    def list_tools(self) -> List[Dict]:
+        """All tools the server offers, following pagination cursors."""
+        tools, cursor = [], None
+        while True:
+            result = self.request("tools/list", {"cursor": cursor} if cursor else {})
+            tools.extend(result.get("tools", []))
+            cursor = result.get("nextCursor")
+            if not cursor:
+                return tools
+    
+    @staticmethod
+    def _tool_result(result: Dict) -> Any:
+        """Decode a tools/call result; a single JSON text block is parsed."""
+        content = result.get("content") or []
+        texts = [block.get("text", "") for block in content if block.get("type") == "text"]
+        if result.get("isError"):
+            raise MCPError("\n".join(texts) or "Tool call failed", data=result)
+        if "structuredContent" in result:
+            return result["structuredContent"]
+        if len(texts) == 1:
+            try:
+                return json.loads(texts[0])
+            except json.JSONDecodeError:
+                return texts[0]
+        return texts if texts else result
+    
+    def call_tool_async(self, tool: str, arguments: Dict) -> Future:
+        """Start a tool call; the returned Future resolves to the decoded result."""
+        raw = self.request_async("tools/call", {"name": tool, "arguments": arguments})
+        decoded: Future = Future()
+        decoded.request_id = raw.request_id
+        
+        def finish(done: Future):
+            if done.cancelled():
+                decoded.cancel()
+                return
+            try:
+                result = self._tool_result(done.result())
+            except Exception as e:
+                self._resolve(decoded, error=e)
+            else:
+                self._resolve(decoded, result=result)
+        
+        raw.add_done_callback(finish)
+        return decoded
+    
+    def call_tool(self, tool: str, arguments: Dict, timeout: Optional[float] = None) -> Any:
+        """Call a tool and wait for its decoded result (same shape as MCPClient.call_tool)."""
+        return self.wait(self.call_tool_async(tool, arguments), timeout)
+    
+    @property
+    def in_flight(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+    
+    def close(self):
+        """Stop the server; pending requests fail with ConnectionError."""
+        with self._write_lock:
+            self._closed = True
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._reader.join(timeout=5)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Crash-safe checkpoints for long org crawls.
+
+A checkpoint directory holds two files:
+
+    nodes.ndjson   Append-only journal, one line per processed user: the
+                   parsed info, crawl depth, the reports queued under them,
+                   and whether the fetch failed
+    state.json     The crawl frontier and the number of journal lines it
+                   covers, replaced atomically after each batch
+
+The journal is fsynced before state.json is swapped in. A crash at any point
+therefore leaves a state that matches a prefix of the journal; journal lines
+past that prefix are discarded on resume and their users fetched again.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class CrawlCheckpoint:
+    """Journal plus frontier snapshot for resuming an interrupted crawl."""
+    
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.state_path = self.directory / "state.json"
+        self.journal_path = self.directory / "nodes.ndjson"
+        self._journal = None
+        self._records = 0
+    
+    def start(self, root, depth: int, max_depth: int,
+              level: Optional[List[Tuple[str, int]]] = None):
+        """
+        Begin a fresh crawl, discarding any previous checkpoint.
+        
+        Args:
+            root: Root username, or list of roots for a multi-root crawl
+            depth: Depth of the roots
+            max_depth: Maximum crawl depth
+            level: Initial frontier (default: just the root)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._records = 0
+        self._root = {"root": root, "depth": depth, "max_depth": max_depth}
+        self.save([], level if level is not None else [(root, depth)], [])
+    
+    def load(self) -> Optional[Dict]:
+        """
+        Read the last consistent checkpoint and reopen the journal for appending.
+        
+        Returns:
+            {"root", "depth", "max_depth", "level", "next_level", "records"},
+            or None if there is no checkpoint
+        """
+        if not self.state_path.exists():
+            return None
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        
+        # Keep only the journal lines the state covers; later ones are from
+        # a batch whose state never made it to disk
+        records = []
+        with open(self.journal_path, "rb") as f:
+            for _ in range(state["records"]):
+                records.append(json.loads(f.readline()))
+            valid_bytes = f.tell()
+        
+        self.close()
+        os.truncate(self.journal_path, valid_bytes)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._records = state["records"]
+        self._root = {key: state[key] for key in ("root", "depth", "max_depth")}
+        
+        return {
+            **self._root,
+            "level": [tuple(item) for item in state["level"]],
+            "next_level": [tuple(item) for item in state["next_level"]],
+            "records": records
+        }
+    
+    def save(self, processed: List[Dict], level: List[Tuple[str, int]],
+             next_level: List[Tuple[str, int]]):
+        """Append a batch of processed users, then atomically record the frontier."""
+        for record in processed:
+            self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._records += len(processed)
+        
+        state = {**self._root, "records": self._records, "level": level, "next_level": next_level}
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+    
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def clear(self):
+        """Remove the checkpoint after a crawl completes."""
+        self.close()
+        for path in (self.state_path, self.journal_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
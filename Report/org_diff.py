@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Diff two crawled org snapshots.
+
+Compares an older and a newer crawl (saved .json trees or .ndjson exports)
+and lists who joined, who left, who moved to a different manager and whose
+title or level changed. Both snapshots are loaded as CompactOrgGraphs and
+joined on username through their hash indexes, so the diff is a single O(n)
+pass over each side.
+
+Usage:
+    python org_diff.py org_hierarchy_jamie_old.json org_hierarchy_jamie.json
+    python org_diff.py old.ndjson new.ndjson --json org_changes.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from org_graph import CompactOrgGraph
+
+
+CHANGE_KINDS = ("joined", "left", "manager_changed", "title_changed", "level_changed")
+
+
+@dataclass
+class OrgChange:
+    """One person-level change between two snapshots."""
+    kind: str
+    username: str
+    name: str
+    before: Optional[str] = None
+    after: Optional[str] = None
+
+
+@dataclass
+class OrgDiff:
+    """All changes between two snapshots plus headline numbers."""
+    changes: List[OrgChange] = field(default_factory=list)
+    headcount_before: int = 0
+    headcount_after: int = 0
+    
+    def by_kind(self, kind: str) -> List[OrgChange]:
+        return [change for change in self.changes if change.kind == kind]
+    
+    def summary(self, top: int = 5) -> Dict:
+        """Counts per change kind, churn rate and the managers with the most churn."""
+        counts = Counter(change.kind for change in self.changes)
+        # Joins count against the new manager, departures against the old one, moves against both
+        churn_by_manager = Counter()
+        for change in self.changes:
+            if change.kind == "joined" and change.after:
+                churn_by_manager[change.after] += 1
+            elif change.kind == "left" and change.before:
+                churn_by_manager[change.before] += 1
+            elif change.kind == "manager_changed":
+                churn_by_manager[change.before] += 1
+                churn_by_manager[change.after] += 1
+        
+        turnover = counts["joined"] + counts["left"]
+        return {
+            "headcount_before": self.headcount_before,
+            "headcount_after": self.headcount_after,
+            "net_change": self.headcount_after - self.headcount_before,
+            **{kind: counts[kind] for kind in CHANGE_KINDS},
+            "churn_rate": round(turnover / max(1, self.headcount_before), 4),
+            "most_churn_by_manager": dict(churn_by_manager.most_common(top))
+        }
+    
+    def to_dict(self) -> Dict:
+        return {"summary": self.summary(), "changes": [asdict(change) for change in self.changes]}
+
+
+def diff_orgs(old: CompactOrgGraph, new: CompactOrgGraph) -> OrgDiff:
+    """
+    Compare two snapshots with a hash join on username.
+    
+    Manager changes compare each person's manager in the crawled tree, so a
+    move between two managers inside the org is reported once, as a
+    manager_changed entry. Joins and departures report the manager in the
+    snapshot where the person is present.
+    """
+    diff = OrgDiff(headcount_before=len(old), headcount_after=len(new))
+    changes = diff.changes
+    
+    def manager_name(graph: CompactOrgGraph, node_id: int) -> Optional[str]:
+        parent_id = graph.parent[node_id]
+        return graph.usernames[parent_id] if parent_id >= 0 else None
+    
+    # Probe the old snapshot's index with every person in the new one
+    for new_id, username in enumerate(new.usernames):
+        name = new.names[new_id] or username
+        old_id = old.find_id(username)
+        if old_id is None:
+            changes.append(OrgChange("joined", username, name, after=manager_name(new, new_id)))
+            continue
+        
+        old_manager = manager_name(old, old_id)
+        new_manager = manager_name(new, new_id)
+        if old_manager != new_manager:
+            changes.append(OrgChange("manager_changed", username, name, old_manager, new_manager))
+        if old.titles[old_id] != new.titles[new_id]:
+            changes.append(OrgChange("title_changed", username, name, old.titles[old_id], new.titles[new_id]))
+        if old.levels[old_id] != new.levels[new_id]:
+            changes.append(OrgChange("level_changed", username, name, old.levels[old_id], new.levels[new_id]))
+    
+    for old_id, username in enumerate(old.usernames):
+        if username not in new:
+            changes.append(OrgChange("left", username, old.names[old_id] or username,
+                                     before=manager_name(old, old_id)))
+    
+    return diff
+
+
+def format_org_diff(diff: OrgDiff, limit: int = 50) -> str:
+    """Render a diff as a text churn report."""
+    summary = diff.summary()
+    lines = [
+        "📊 ORG CHANGES",
+        f"  Headcount: {summary['headcount_before']} → {summary['headcount_after']} "
+        f"({summary['net_change']:+d})",
+        f"  Joined: {summary['joined']}  Left: {summary['left']}  "
+        f"Moved: {summary['manager_changed']}  Title: {summary['title_changed']}  "
+        f"Level: {summary['level_changed']}",
+        f"  Churn rate: {summary['churn_rate']:.1%}",
+    ]
+    if summary["most_churn_by_manager"]:
+        lines.append("  Most churn under: " + ", ".join(
+            f"@{manager} ({count})" for manager, count in summary["most_churn_by_manager"].items()))
+    
+    labels = {
+        "joined": ("🟢 Joined", lambda c: f"under @{c.after}" if c.after else ""),
+        "left": ("🔴 Left", lambda c: f"from @{c.before}" if c.before else ""),
+        "manager_changed": ("🔀 Changed manager", lambda c: f"@{c.before} → @{c.after}"),
+        "title_changed": ("💼 Changed title", lambda c: f"{c.before} → {c.after}"),
+        "level_changed": ("📊 Changed level", lambda c: f"{c.before} → {c.after}"),
+    }
+    for kind in CHANGE_KINDS:
+        changes = diff.by_kind(kind)
+        if not changes:
+            continue
+        label, describe = labels[kind]
+        lines.append("")
+        lines.append(f"{label} ({len(changes)})")
+        for change in changes[:limit]:
+            lines.append(f"  • {change.name} (@{change.username}) {describe(change)}".rstrip())
+        if len(changes) > limit:
+            lines.append(f"  … and {len(changes) - limit} more")
+    
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two org hierarchy snapshots")
+    parser.add_argument("old", help="Older snapshot (.json or .ndjson)")
+    parser.add_argument("new", help="Newer snapshot (.json or .ndjson)")
+    parser.add_argument("--json", metavar="FILE", help="Also write the change list as JSON")
+    parser.add_argument("--limit", type=int, default=50, help="People listed per change kind")
+    args = parser.parse_args()
+    
+    diff = diff_orgs(CompactOrgGraph.load(args.old), CompactOrgGraph.load(args.new))
+    print(format_org_diff(diff, limit=args.limit))
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(diff.to_dict(), f, indent=2)
+        print()
+        print(f"💾 Change list saved to: {args.json}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
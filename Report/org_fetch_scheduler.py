@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Rate-limited, adaptive fetch scheduler for org crawls.
+
+Sits between the crawl and the Phonetool fetches so a parallel crawl cannot
+hammer the upstream. Only real page fetches are limited; cache hits are not:
+
+    - a token bucket caps the request rate (with a small burst allowance)
+    - an AIMD limiter adapts concurrency: it grows slowly while latency stays
+      near the best observed latency, and halves on errors or when latency
+      climbs (a sign the upstream is throttling or saturated)
+    - failed calls are retried with full-jitter exponential backoff
+    - items that still fail are re-queued behind the rest of the batch and
+      retried again later instead of being dropped
+    - imap_prioritized() keeps every worker busy from a priority queue that
+      the caller grows as results arrive, instead of running fixed batches
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, up to `burst` saved."""
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit driven by observed latency and errors."""
+    
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 latency_tolerance: float = 2.0):
+        """
+        Args:
+            initial: Starting number of concurrent calls
+            minimum: Lower bound on the limit
+            maximum: Upper bound on the limit
+            latency_tolerance: Back off when latency exceeds this multiple of
+                the best latency seen recently
+        """
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self._baseline: Optional[float] = None
+        self._in_flight = 0
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Wait for a free slot under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+    
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+    
+    def on_success(self, latency: float):
+        """Additive increase while latency is healthy, multiplicative decrease otherwise."""
+        with self._cond:
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            else:
+                # Let the baseline drift up slowly so one lucky call doesn't pin it
+                self._baseline += (latency - self._baseline) * 0.01
+            
+            if latency > self._baseline * self.latency_tolerance:
+                self.limit = max(self.minimum, self.limit * 0.9)
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+    
+    def on_error(self):
+        with self._cond:
+            self.limit = max(self.minimum, self.limit * 0.5)
+
+
+class PriorityWorkQueue:
+    """Highest-priority-first work queue that also tracks items in flight."""
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._order = itertools.count()
+        self.in_flight: Dict[Any, float] = {}
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def push(self, item: Any, priority: float = 0.0):
+        """Queue an item; equal priorities are served first in, first out."""
+        heapq.heappush(self._heap, (-priority, next(self._order), item))
+    
+    def pop(self) -> Any:
+        """Take the highest-priority item and mark it in flight."""
+        priority, _, item = heapq.heappop(self._heap)
+        self.in_flight[item] = -priority
+        return item
+    
+    def done(self, item: Any):
+        self.in_flight.pop(item, None)
+    
+    def snapshot(self) -> List[Any]:
+        """Every unfinished item, in flight first, then queued in priority order."""
+        return list(self.in_flight) + [item for _, _, item in sorted(self._heap)]
+
+
+class FetchScheduler:
+    """Runs fetches under a rate limit, adaptive concurrency and retries."""
+    
+    def __init__(
+        self,
+        requests_per_second: float = 0.0,
+        burst: Optional[float] = None,
+        max_concurrency: int = 8,
+        initial_concurrency: Optional[int] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        requeue_limit: int = 2,
+        latency_tolerance: float = 2.0
+    ):
+        """
+        Args:
+            requests_per_second: Token bucket rate; 0 disables rate limiting
+            burst: Tokens that can be saved up for bursts (default: one second's worth)
+            max_concurrency: Upper bound on simultaneous fetches
+            initial_concurrency: Starting concurrency (default: half the maximum)
+            max_retries: Retries per attempt round before the item is re-queued
+            base_delay: First backoff ceiling in seconds; doubles per retry
+            max_delay: Largest backoff ceiling in seconds
+            requeue_limit: Times a failing item goes back on the queue
+            latency_tolerance: Latency multiple that triggers backing off
+        """
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.concurrency = AdaptiveConcurrency(
+            initial=initial_concurrency or max(1, max_concurrency // 2),
+            maximum=max_concurrency,
+            latency_tolerance=latency_tolerance
+        )
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.requeue_limit = requeue_limit
+        self.stats = {"calls": 0, "retries": 0, "requeued": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+    
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+    
+    def throttled(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Make one upstream request under the rate and concurrency limits.
+        
+        Its latency and errors feed the adaptive concurrency limit. Work that
+        does not reach the upstream (e.g. cache hits) should bypass this.
+        """
+        self.concurrency.acquire()
+        try:
+            self.bucket.acquire()
+            self._count("calls")
+            start = time.monotonic()
+            try:
+                result = fn(*args)
+            except Exception:
+                self.concurrency.on_error()
+                raise
+            self.concurrency.on_success(time.monotonic() - start)
+            return result
+        finally:
+            self.concurrency.release()
+    
+    def call(self, fn: Callable[[Any], Any], item: Any) -> Tuple[bool, Any]:
+        """
+        Call fn(item), retrying with backoff on any exception.
+        
+        Returns:
+            (True, result) on success, or (False, last exception)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return True, fn(item)
+            except Exception as e:
+                error = e
+            
+            if attempt < self.max_retries:
+                self._count("retries")
+                time.sleep(self.backoff(attempt))
+        
+        return False, error
+    
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any],
+            on_requeue: Optional[Callable[[Any, Exception], None]] = None) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Run fn over items and return (result, error) pairs in input order.
+        
+        fn should send its upstream requests through throttled(); map itself
+        only adds the worker pool, retries and re-queueing.
+        
+        Items whose retries are exhausted are put back at the end of the
+        queue, up to requeue_limit times, before being reported as failed
+        with error set.
+        """
+        outcomes: List[Tuple[Any, Optional[Exception]]] = [(None, None)] * len(items)
+        queue = deque((index, 0) for index in range(len(items)))
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while queue or pending:
+                while queue and len(pending) < self.max_concurrency:
+                    index, requeues = queue.popleft()
+                    pending[pool.submit(self.call, fn, items[index])] = (index, requeues)
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, requeues = pending.pop(future)
+                    ok, value = future.result()
+                    if ok:
+                        outcomes[index] = (value, None)
+                    elif requeues < self.requeue_limit:
+                        self._count("requeued")
+                        if on_requeue:
+                            on_requeue(items[index], value)
+                        queue.append((index, requeues + 1))
+                    else:
+                        self._count("failed")
+                        outcomes[index] = (None, value)
+        
+        return outcomes
+    
+    def imap_prioritized(self, fn: Callable[[Any], Any], queue: PriorityWorkQueue,
+                         on_requeue: Optional[Callable[[Any, Exception], None]] = None
+                         ) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Run fn over a growing priority queue, yielding (item, result, error)
+        as each item finishes.
+        
+        Free workers always take the highest-priority queued item, so there
+        is no idle tail at the end of a batch. The caller may push more items
+        onto the queue while handling a result; they are picked up as soon as
+        a worker frees up. Stops when the queue is empty and nothing is in
+        flight.
+        
+        Items whose retries are exhausted go back on the queue behind
+        everything else, up to requeue_limit times, before being yielded with
+        error set.
+        """
+        pending = {}
+        requeues: Dict[Any, int] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while queue or pending:
+                while queue and len(pending) < self.max_concurrency:
+                    item = queue.pop()
+                    pending[pool.submit(self.call, fn, item)] = item
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    ok, value = future.result()
+                    queue.done(item)
+                    if ok:
+                        yield item, value, None
+                    elif requeues.get(item, 0) < self.requeue_limit:
+                        self._count("requeued")
+                        requeues[item] = requeues.get(item, 0) + 1
+                        if on_requeue:
+                            on_requeue(item, value)
+                        queue.push(item, float("-inf"))
+                    else:
+                        self._count("failed")
+                        yield item, None, value
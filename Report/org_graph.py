@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Compact, array-backed representation of an org hierarchy.
+
+The nested dict tree produced by OrgHierarchyReader copies every user's info
+into each node and has to be walked recursively for even simple questions.
+CompactOrgGraph stores the same hierarchy as flat integer arrays indexed by
+user id, with ids assigned in depth-first pre-order. Every subtree is then a
+contiguous id range [id, id + size), which turns the common queries into
+constant-time arithmetic:
+
+    subtree_size(u)      O(1)
+    depth(u)             O(1)
+    is_ancestor(a, b)    O(1)
+    everyone_under(m)    O(k) slice, no traversal
+
+Strings are not kept as one Python object per person. Usernames and names
+are packed into a UTF-8 buffer with an offset array, titles and levels are
+interned into a small table of distinct values addressed by code, and
+usernames are looked up through an open-addressing hash table of node ids.
+A 100k-person org takes about 60 bytes per person in total.
+"""
+
+import json
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+
+class PackedStrings:
+    """Append-only list of strings stored in one UTF-8 buffer."""
+    
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("I", [0])
+    
+    def append(self, text: str):
+        self._data += text.encode("utf-8")
+        self._offsets.append(len(self._data))
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def nbytes(self) -> int:
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+class InternedStrings:
+    """List of strings drawn from few distinct values, stored as codes."""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._items = array("i")
+    
+    def append(self, text: str):
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self.values)
+            self.values.append(text)
+        self._items.append(code)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.values[code] for code in self._items[index]]
+        return self.values[self._items[index]]
+    
+    def __iter__(self):
+        for code in self._items:
+            yield self.values[code]
+    
+    def nbytes(self) -> int:
+        return self._items.itemsize * len(self._items)
+
+
+def _child_arrays(parent: array) -> tuple:
+    """CSR (child_start, children) of a parent array, children in id order."""
+    n = len(parent)
+    child_start = array("i", [0]) * (n + 1)
+    for parent_id in parent:
+        if parent_id >= 0:
+            child_start[parent_id + 1] += 1
+    for node_id in range(n):
+        child_start[node_id + 1] += child_start[node_id]
+    
+    children = array("i", [0]) * child_start[n]
+    fill = child_start[:n]
+    for node_id, parent_id in enumerate(parent):
+        if parent_id >= 0:
+            children[fill[parent_id]] = node_id
+            fill[parent_id] += 1
+    return child_start, children
+
+
+def _preorder(parent: array) -> array:
+    """
+    Ids in depth-first pre-order, roots and siblings in id order.
+    
+    Nodes whose parent links form a cycle are unreachable and left out.
+    """
+    child_start, children = _child_arrays(parent)
+    order = array("i")
+    stack = array("i", (node_id for node_id in range(len(parent) - 1, -1, -1)
+                        if parent[node_id] < 0))
+    while stack:
+        node_id = stack.pop()
+        order.append(node_id)
+        stack.extend(reversed(children[child_start[node_id]:child_start[node_id + 1]]))
+    return order
+
+
+class CompactOrgGraph:
+    """Org hierarchy stored as pre-order arrays with Euler-tour intervals."""
+    
+    def __init__(self):
+        self.usernames = PackedStrings()
+        self.names = PackedStrings()
+        self.titles = InternedStrings()
+        self.levels = InternedStrings()
+        self.parent = array("i")
+        self.depths = array("i")
+        self.sizes = array("i")
+        self.child_start = array("i")
+        self.children = array("i")
+        # Open-addressing hash table of node ids keyed by username; -1 is empty
+        self._slots = array("i", [-1])
+    
+    @classmethod
+    def from_tree(cls, tree: Dict) -> "CompactOrgGraph":
+        """
+        Build a graph from a nested tree returned by build_hierarchy, or a
+        forest returned by build_forest (each root becomes its own tree).
+        
+        Walks the tree once, iteratively, so arbitrarily deep chains do not
+        hit the recursion limit.
+        """
+        graph = cls()
+        if not tree:
+            return graph
+        
+        # Pre-order walk; each stack entry is (node, parent id)
+        roots = tree["roots"] if "roots" in tree else [tree]
+        stack = [(root, -1) for root in reversed(roots)]
+        while stack:
+            node, parent_id = stack.pop()
+            node_id = graph._add(node, parent_id)
+            
+            # Push in reverse so reports keep their original order
+            for report in reversed(node.get("direct_reports_tree", [])):
+                stack.append((report, node_id))
+        
+        graph._finalize()
+        return graph
+    
+    @classmethod
+    def load(cls, path: str) -> "CompactOrgGraph":
+        """Load a saved nested tree (.json) or a streamed export (.ndjson)."""
+        if path.endswith(".ndjson"):
+            from org_ndjson import iter_records
+            return cls.from_records(iter_records(path))
+        with open(path, "r") as f:
+            return cls.from_tree(json.load(f))
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "CompactOrgGraph":
+        """
+        Build a graph from flat records with "username" and "parent" keys.
+        
+        Records are consumed one at a time straight into packed columns, so
+        a large NDJSON export is never held in memory as dicts or lists of
+        strings, and parents are linked in a second pass over ids. Records
+        whose parent is missing become roots, and the first record seen is
+        laid out first. A parents-first depth-first export, as written by
+        OrgNDJSONWriter, is already in pre-order and is used as is; any
+        other order is copied into pre-order once.
+        """
+        staged = cls()
+        parent_names = PackedStrings()
+        for record in records:
+            username = record["username"]
+            if staged.find_id(username) is not None:
+                continue
+            node_id = staged._append_columns(username, record.get("name"), record.get("title"),
+                                             record.get("level"))
+            staged._index(node_id)
+            parent_names.append(record.get("parent") or "")
+        
+        # Second pass: link each record to its parent by id
+        n = len(staged)
+        staged_parent = array("i", [-1]) * n
+        for node_id, parent in enumerate(parent_names):
+            parent_id = staged.find_id(parent) if parent else None
+            if parent_id is not None:
+                staged_parent[node_id] = parent_id
+        order = _preorder(staged_parent)
+        
+        if len(order) == n and all(node_id == staged_id for node_id, staged_id in enumerate(order)):
+            graph = staged
+            for parent_id in staged_parent:
+                graph._link(parent_id)
+        else:
+            graph = cls()
+            new_id = array("i", [-1]) * n
+            for staged_id in order:
+                new_id[staged_id] = graph._append_columns(
+                    staged.usernames[staged_id], staged.names[staged_id],
+                    staged.titles[staged_id], staged.levels[staged_id])
+                parent_id = staged_parent[staged_id]
+                graph._link(new_id[parent_id] if parent_id >= 0 else -1)
+        
+        graph._finalize()
+        return graph
+    
+    def _append_columns(self, username: str, name: Optional[str], title: Optional[str],
+                        level) -> int:
+        node_id = len(self.usernames)
+        self.usernames.append(username)
+        self.names.append(name or "")
+        self.titles.append(title or "")
+        self.levels.append(str(level or ""))
+        return node_id
+    
+    def _link(self, parent_id: int):
+        """Record the parent of the next node; parents always come first."""
+        self.parent.append(parent_id)
+        self.depths.append(self.depths[parent_id] + 1 if parent_id >= 0 else 0)
+    
+    def _add(self, node: Dict, parent_id: int) -> int:
+        node_id = self._append_columns(node["username"], node.get("name"), node.get("title"),
+                                       node.get("level"))
+        self._link(parent_id)
+        return node_id
+    
+    def _index(self, node_id: int):
+        """Add a node to the username table, doubling it to stay at most half full."""
+        if 2 * (node_id + 1) > len(self._slots):
+            self._rehash(max(8, 2 * len(self._slots)), node_id)
+        mask = len(self._slots) - 1
+        username = self.usernames[node_id]
+        slot = hash(username) & mask
+        while self._slots[slot] >= 0 and self.usernames[self._slots[slot]] != username:
+            slot = (slot + 1) & mask
+        if self._slots[slot] < 0:
+            # A repeated username keeps its first id
+            self._slots[slot] = node_id
+    
+    def _rehash(self, size: int, count: int):
+        """Rebuild the username table with size slots from the first count nodes."""
+        self._slots = array("i", [-1]) * size
+        for node_id in range(count):
+            self._index(node_id)
+    
+    def _finalize(self):
+        """Compute subtree sizes, the CSR child arrays and the username index."""
+        n = len(self.usernames)
+        self.sizes = array("i", [1]) * n
+        # Children always have larger pre-order ids than their parent
+        for node_id in range(n - 1, 0, -1):
+            parent_id = self.parent[node_id]
+            if parent_id >= 0:
+                self.sizes[parent_id] += self.sizes[node_id]
+        
+        self.child_start, self.children = _child_arrays(self.parent)
+        
+        # At most half full, so probe chains stay short; from_records
+        # indexes as it streams, so its table is already complete
+        if len(self._slots) < 2 * n:
+            self._rehash(1 << max(3, (2 * n).bit_length()), n)
+    
+    def __len__(self) -> int:
+        return len(self.usernames)
+    
+    def __contains__(self, username: str) -> bool:
+        return self.find_id(username) is not None
+    
+    def id_of(self, username: str) -> int:
+        """Numeric id of a user; raises KeyError if unknown."""
+        node_id = self.find_id(username)
+        if node_id is None:
+            raise KeyError(username)
+        return node_id
+    
+    def find_id(self, username: str) -> Optional[int]:
+        """Numeric id of a user, or None if unknown."""
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = hash(username) & mask
+        while True:
+            node_id = slots[slot]
+            if node_id < 0:
+                return None
+            if self.usernames[node_id] == username:
+                return node_id
+            slot = (slot + 1) & mask
+    
+    def subtree_size(self, username: str) -> int:
+        """Number of people in the user's org, including the user."""
+        return self.sizes[self.id_of(username)]
+    
+    def total_reports(self, username: str) -> int:
+        """Number of people reporting up to the user, directly or indirectly."""
+        return self.sizes[self.id_of(username)] - 1
+    
+    def depth(self, username: str) -> int:
+        """Distance from the root (the root is at depth 0)."""
+        return self.depths[self.id_of(username)]
+    
+    def is_ancestor(self, manager: str, username: str) -> bool:
+        """True if username is in manager's org (a user is their own ancestor)."""
+        a = self.id_of(manager)
+        b = self.id_of(username)
+        return a <= b < a + self.sizes[a]
+    
+    def manager(self, username: str) -> Optional[str]:
+        """Manager of the user within this graph, or None for the root."""
+        parent_id = self.parent[self.id_of(username)]
+        return self.usernames[parent_id] if parent_id >= 0 else None
+    
+    def direct_reports(self, username: str) -> List[str]:
+        """Usernames of the user's direct reports."""
+        node_id = self.id_of(username)
+        ids = self.children[self.child_start[node_id]:self.child_start[node_id + 1]]
+        return [self.usernames[i] for i in ids]
+    
+    def everyone_under(self, username: str) -> List[str]:
+        """Everyone in the user's org in pre-order, excluding the user."""
+        node_id = self.id_of(username)
+        return self.usernames[node_id + 1:node_id + self.sizes[node_id]]
+    
+    def chain_of_command(self, username: str) -> List[str]:
+        """Managers from the user's manager up to the root."""
+        chain = []
+        node_id = self.parent[self.id_of(username)]
+        while node_id >= 0:
+            chain.append(self.usernames[node_id])
+            node_id = self.parent[node_id]
+        return chain
+    
+    def max_depth(self) -> int:
+        """Depth of the deepest user."""
+        return max(self.depths, default=0)
+    
+    def nbytes(self) -> int:
+        """Approximate size of the arrays and string buffers in bytes."""
+        arrays = (self.parent, self.depths, self.sizes, self.child_start, self.children,
+                  self._slots)
+        columns = (self.usernames, self.names, self.titles, self.levels)
+        return sum(a.itemsize * len(a) for a in arrays) + sum(c.nbytes() for c in columns)
+    
+    def to_tree(self, username: Optional[str] = None) -> Optional[Dict]:
+        """
+        Rebuild a nested tree (name, title, level and reports only).
+        
+        Args:
+            username: Root of the subtree to rebuild; defaults to the graph root
+        """
+        if not self.usernames:
+            return None
+        
+        root_id = self.id_of(username) if username else 0
+        end = root_id + self.sizes[root_id]
+        nodes = {}
+        for node_id in range(root_id, end):
+            nodes[node_id] = {
+                "username": self.usernames[node_id],
+                "name": self.names[node_id],
+                "title": self.titles[node_id],
+                "level": self.levels[node_id],
+                "direct_reports_tree": [],
+                "depth": self.depths[node_id]
+            }
+            if node_id != root_id:
+                nodes[self.parent[node_id]]["direct_reports_tree"].append(nodes[node_id])
+        
+        return nodes[root_id]
@@ -3,25 +3,57 @@
 Automated Organizational Hierarchy Reader for Amazon Phonetool
 
 This script reads the complete reporting structure starting from a given user.
-It recursively traverses all direct reports and builds a comprehensive org tree.
+It crawls all direct reports level by level, fetching each level's pages
+concurrently, and builds a comprehensive org tree.
+
+With --refresh, a previously saved hierarchy is updated incrementally: only
+users due for revalidation are re-fetched, and only new reports' subtrees
+are crawled from scratch.
 
 Usage:
     Run this through Kiro which has MCP access to internal Amazon tools.
 """
 
+import argparse
+import hashlib
 import json
-import re
-from typing import Dict, List, Set
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
 from collections import defaultdict
 
+from org_checkpoint import CrawlCheckpoint
+from org_fetch_scheduler import FetchScheduler, PriorityWorkQueue
+from org_ndjson import OrgNDJSONWriter
+from org_page_cache import OrgPageCache
+from phonetool_parser import PARSER_VERSION, default_parser
+
 
 class OrgHierarchyReader:
     """Reads and processes organizational hierarchy from Phonetool."""
     
-    def __init__(self):
+    # Cached parses from an older parser are redone
+    PARSER_VERSION = PARSER_VERSION
+    
+    def __init__(self, cache: Optional[OrgPageCache] = None,
+                 scheduler: Optional[FetchScheduler] = None):
+        """
+        Args:
+            cache: Optional persistent page cache shared across runs
+            scheduler: Rate limit, concurrency and retry policy for fetches;
+                defaults to retries only, at max_workers concurrency
+        """
         self.visited = set()
         self.org_data = {}
         self.errors = []
+        self.cross_references = []
+        self.progress = {}
+        self.cache = cache
+        self.scheduler = scheduler
+        self.refresh_stats = {}
+        self._lock = threading.Lock()
     
     def fetch_user_page(self, username: str) -> str:
         """
@@ -34,193 +66,703 @@ class OrgHierarchyReader:
     
     def parse_user_info(self, content: str, username: str) -> Dict:
         """Extract user information from phonetool HTML content."""
-        info = {
-            "username": username,
-            "name": "",
-            "title": "",
-            "level": "",
-            "manager": "",
-            "building": "",
-            "direct_reports": [],
-            "total_reports": 0
-        }
+        return default_parser.parse(content, username)
+    
+    def load_user(self, username: str, revalidate: bool = False) -> Optional[Dict]:
+        """
+        Get parsed user info, using the page cache when one is configured.
         
-        # Extract name (usually in page title or header)
-        name_patterns = [
-            r'<title>([^<]+?)\s*-\s*PhoneTool',
-            r'<h1[^>]*>([^<]+)</h1>',
-            r'"name"\s*:\s*"([^"]+)"'
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                info["name"] = match.group(1).strip()
-                break
-        
-        # Extract title/job title
-        title_patterns = [
-            r'(?:Job Title|Title)["\s:]+([^<"\n]+)',
-            r'"jobTitle"\s*:\s*"([^"]+)"',
-            r'<span[^>]*class="[^"]*title[^"]*"[^>]*>([^<]+)</span>'
-        ]
-        for pattern in title_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                info["title"] = match.group(1).strip()
-                break
-        
-        # Extract level
-        level_match = re.search(r'(?:Level|L)[\s:]+(\d+|[IVX]+)', content, re.IGNORECASE)
-        if level_match:
-            info["level"] = level_match.group(1).strip()
-        
-        # Extract manager
-        manager_patterns = [
-            r'Manager["\s:]+<a[^>]+href="/users/([^"]+)"',
-            r'"manager"\s*:\s*"([^"]+)"'
-        ]
-        for pattern in manager_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                info["manager"] = match.group(1).strip()
-                break
-        
-        # Extract direct reports
-        # Look for links in the direct reports section
-        direct_reports_section = re.search(
-            r'(?:Direct Reports?|Reports to|Team Members?)(.*?)(?:<h\d|<div class="section"|$)',
-            content,
-            re.IGNORECASE | re.DOTALL
-        )
+        Fresh cache entries skip the fetch entirely. Stale entries are
+        revalidated: the page is refetched, and if its content hash is
+        unchanged the cached parse is reused.
         
-        if direct_reports_section:
-            section_content = direct_reports_section.group(1)
-            # Find all user links in this section
-            user_links = re.findall(r'/users/([a-z0-9]+)', section_content, re.IGNORECASE)
-            info["direct_reports"] = list(set(user_links))  # Remove duplicates
+        Args:
+            username: User login
+            revalidate: Refetch even if the cache entry is still fresh
+        
+        Returns:
+            Parsed user info with a "fetched_at" timestamp, or None if the
+            page had no content
+        """
+        entry = self.cache.get(username) if self.cache else None
+        parsed_ok = entry is not None and entry.get("parser_version") == self.PARSER_VERSION
+        
+        if parsed_ok and not revalidate and self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            return {**entry["parsed"], "fetched_at": entry["fetched_at"]}
         
-        # Try to get total report count
-        total_match = re.search(r'(\d+)\s+(?:total\s+)?(?:direct\s+)?reports?', content, re.IGNORECASE)
-        if total_match:
-            info["total_reports"] = int(total_match.group(1))
+        if self.scheduler is not None:
+            content = self.scheduler.throttled(self.fetch_user_page, username)
         else:
-            info["total_reports"] = len(info["direct_reports"])
+            content = self.fetch_user_page(username)
+        if not content:
+            return None
+        
+        if self.cache is None:
+            return {**self.parse_user_info(content, username), "fetched_at": time.time()}
         
-        return info
+        validator = self.cache.validator_for(content)
+        if parsed_ok and entry.get("validator") == validator:
+            self.cache.record("revalidated")
+            entry = self.cache.touch(username, entry)
+            return {**entry["parsed"], "fetched_at": entry["fetched_at"]}
+        
+        self.cache.record("misses")
+        user_info = self.parse_user_info(content, username)
+        entry = self.cache.put(username, content, user_info, self.PARSER_VERSION, validator)
+        return {**user_info, "fetched_at": entry["fetched_at"]}
     
-    def build_hierarchy(self, username: str, depth: int = 0, max_depth: int = 10) -> Dict:
+    def _fetch_node(self, username: str, depth: int, revalidate: bool = False) -> Optional[Dict]:
         """
-        Recursively build organizational hierarchy.
+        Fetch and parse one user page; returns None if the page had no content.
+        
+        Exceptions propagate so the fetch scheduler can retry them.
+        """
+        indent = "  " * depth
+        print(f"{indent}📍 Fetching: {username} (depth {depth})")
+        
+        user_info = self.load_user(username, revalidate=revalidate)
+        if not user_info:
+            print(f"{indent}  ⚠️  No content retrieved for {username}")
+            return None
+        
+        print(f"{indent}  ✓ {user_info['name']} - {user_info['title']}")
+        print(f"{indent}    Direct reports: {len(user_info['direct_reports'])}")
+        return user_info
+    
+    def _get_scheduler(self, max_workers: int) -> FetchScheduler:
+        if self.scheduler is None:
+            self.scheduler = FetchScheduler(max_concurrency=max_workers,
+                                            initial_concurrency=max_workers)
+        return self.scheduler
+    
+    @staticmethod
+    def _on_requeue(item, error: Exception):
+        username, depth = item
+        print(f"{'  ' * depth}  ↻ Re-queued {username} after error: {error}")
+    
+    def _record_failure(self, username: str, depth: int, error: Exception):
+        """Log a user whose fetch failed after all retries and re-queues."""
+        error_msg = f"Error processing {username}: {str(error)}"
+        print(f"{'  ' * depth}  ❌ {error_msg}")
+        with self._lock:
+            self.errors.append(error_msg)
+    
+    def build_hierarchy(self, username: str, depth: int = 0, max_depth: int = 10,
+                        max_workers: int = 8,
+                        on_node: Optional[Callable[[Dict, Optional[str], int], None]] = None,
+                        checkpoint: Optional[CrawlCheckpoint] = None,
+                        resume: bool = False, checkpoint_every: int = 200) -> Dict:
+        """
+        Build organizational hierarchy with a prioritized, concurrent crawl.
+        
+        Users are fetched in parallel through the fetch scheduler, which
+        rate-limits, retries and re-queues failures. Workers always take the
+        queued user with the largest estimated org (from their manager's
+        total_reports), so deep branches start early and the crawl does not
+        end waiting on one long chain. Each user is fetched at most once.
+        Users are linked into the tree in depth-first order, reports in
+        listing order, so someone listed under two managers is attached
+        under the one a sequential depth-first crawl reaches first, however
+        the fetches complete.
         
         Args:
             username: User login to start from
-            depth: Current recursion depth
+            depth: Depth of the starting user
             max_depth: Maximum depth to traverse
+            max_workers: Maximum concurrent page fetches (when no scheduler
+                was given to the reader)
+            on_node: Called as on_node(user_info, parent_username, depth) as
+                each user is linked into the tree, parents before their
+                reports, e.g. to stream results to disk
+            checkpoint: Where to save progress every checkpoint_every users
+            resume: Continue from the checkpoint's last saved state instead of
+                starting over; users it already completed are not fetched,
+                but on_node is called for them again, so output written by
+                on_node should be rewritten rather than appended to
+            checkpoint_every: Users processed between checkpoints
         
         Returns:
             Dictionary with user info and nested direct reports
         """
-        # Prevent infinite loops and limit depth
-        if username in self.visited or depth >= max_depth:
-            return None
+        children, node_depth = self._crawl(
+            [username], username, depth, max_depth, max_workers,
+            on_node, checkpoint, resume, checkpoint_every
+        )
+        return self._assemble_tree(username, children, node_depth)
+    
+    def build_forest(self, usernames: List[str], max_depth: int = 10, max_workers: int = 8,
+                     on_node: Optional[Callable[[Dict, Optional[str], int], None]] = None,
+                     checkpoint: Optional[CrawlCheckpoint] = None,
+                     resume: bool = False, checkpoint_every: int = 200) -> Dict:
+        """
+        Crawl several leaders' orgs at once, fetching each person only once.
         
-        self.visited.add(username)
-        indent = "  " * depth
-        print(f"{indent}📍 Fetching: {username} (depth {depth})")
+        All roots start in the same crawl queue and share one visited set,
+        so overlapping orgs cost their union rather than their sum. Each
+        person is attached under the first root, in the order given, whose
+        org contains them.
+        Wherever a manager lists someone who belongs to another root's
+        tree (for example a root who reports into another root's org), the
+        link is kept in cross_references instead of duplicating the subtree.
         
-        # Fetch user page (via MCP in actual execution)
-        try:
-            content = self.fetch_user_page(username)
-            if not content:
-                print(f"{indent}  ⚠️  No content retrieved")
-                return None
-            
-            # Parse user information
-            user_info = self.parse_user_info(content, username)
-            print(f"{indent}  ✓ {user_info['name']} - {user_info['title']}")
-            print(f"{indent}    Direct reports: {len(user_info['direct_reports'])}")
-            
-            # Store in org data
-            self.org_data[username] = user_info
-            
-            # Recursively fetch direct reports
-            nested_reports = []
-            for report_username in user_info['direct_reports']:
-                report_tree = self.build_hierarchy(report_username, depth + 1, max_depth)
-                if report_tree:
-                    nested_reports.append(report_tree)
-            
-            # Build the tree node
-            tree_node = {
-                **user_info,
-                "direct_reports_tree": nested_reports,
-                "depth": depth
-            }
+        Args:
+            usernames: Root user logins; duplicates are ignored
+            max_depth: Maximum depth to traverse below each root
+            Other arguments are as for build_hierarchy
+        
+        Returns:
+            {"roots": [tree, ...], "cross_references": [{"username",
+            "manager", "root", "owner_root"}, ...]}
+        """
+        roots = list(dict.fromkeys(usernames))
+        first_cross_reference = len(self.cross_references)
+        children, node_depth = self._crawl(
+            roots, roots, 0, max_depth, max_workers,
+            on_node, checkpoint, resume, checkpoint_every
+        )
+        
+        trees = [self._assemble_tree(root, children, node_depth) for root in roots]
+        return {
+            "roots": [tree for tree in trees if tree],
+            "cross_references": self.cross_references[first_cross_reference:]
+        }
+    
+    def _crawl(self, roots: List[str], checkpoint_key, depth: int, max_depth: int,
+               max_workers: int, on_node, checkpoint: Optional[CrawlCheckpoint],
+               resume: bool, checkpoint_every: int) -> tuple:
+        """
+        Prioritized crawl from one or more roots; returns (children, node_depth).
+        
+        Fetching and linking are separate. Every user within max_depth of a
+        root along their shortest path is fetched once, concurrently and in
+        priority order. A _DepthFirstLinker then places the fetched users
+        exactly as a sequential depth-first crawl would, advancing after each
+        fetch as far as the fetched pages allow, so the tree does not depend
+        on the order in which fetches complete.
+        """
+        # Users placed by an earlier crawl on this reader are not crawled again
+        excluded = set(self.visited)
+        # Fetched users' info; None if the page had no content or the fetch failed
+        fetched: Dict[str, Optional[Dict]] = {}
+        state = checkpoint.load() if checkpoint and resume else None
+        
+        if state is not None and state["root"] == checkpoint_key:
+            self._restore_checkpoint(state, fetched)
+            max_depth = state["max_depth"]
+        elif checkpoint:
+            checkpoint.start(checkpoint_key, depth, max_depth,
+                             [(root, depth, 1.0) for root in roots if root not in excluded])
+        
+        # Shortest known depth of every discovered user
+        best_depth: Dict[str, int] = {}
+        # Estimated org size (the user plus everyone below) of each unfinished user
+        estimate: Dict[str, float] = {}
+        queue = PriorityWorkQueue()
+        remaining = 0.0
+        
+        def discover(user: str) -> List[str]:
+            """Give a fetched user's reports their shortest depth; returns newly queued reports."""
+            nonlocal remaining
+            queued = []
+            stack = [user]
+            while stack:
+                manager = stack.pop()
+                manager_info = fetched.get(manager)
+                manager_depth = best_depth[manager]
+                if not manager_info or manager_depth + 1 >= max_depth:
+                    continue
+                report_size = self._report_estimate(manager_info, manager_depth, max_depth)
+                for report_username in manager_info['direct_reports']:
+                    known = best_depth.get(report_username)
+                    if report_username in excluded or (known is not None and known <= manager_depth + 1):
+                        continue
+                    best_depth[report_username] = manager_depth + 1
+                    if report_username in fetched:
+                        # Reached by a shorter path: its own reports may now be in range
+                        stack.append(report_username)
+                    elif known is None:
+                        queued.append(report_username)
+                        estimate[report_username] = report_size
+                        remaining += report_size
+                        queue.push((report_username, manager_depth + 1), report_size)
+            return queued
+        
+        roots = [root for root in dict.fromkeys(roots) if root not in excluded and depth < max_depth]
+        # Every root is at the starting depth, even one listed in another root's org
+        best_depth.update((root, depth) for root in roots)
+        for root in roots:
+            if root in fetched:
+                discover(root)
+            else:
+                estimate[root] = 1.0
+                remaining += 1.0
+                queue.push((root, depth), 1.0)
+        
+        linker = _DepthFirstLinker(self, roots, depth, max_depth, fetched, on_node)
+        linker.advance()
+        if state is not None and state["root"] == checkpoint_key:
+            print(f"♻️  Resuming crawl: {len(fetched)} users done, {len(queue)} queued")
+        
+        scheduler = self._get_scheduler(max_workers)
+        started = time.time()
+        done_before = len(fetched)
+        processed = []
+        
+        results = scheduler.imap_prioritized(lambda item: self._fetch_node(*item), queue,
+                                             on_requeue=self._on_requeue)
+        for (user, user_depth), user_info, error in results:
+            if error is not None:
+                self._record_failure(user, user_depth, error)
+            fetched[user] = user_info
+            # Queue direct reports, biggest estimated orgs first
+            kept = discover(user)
+            linker.advance()
             
-            return tree_node
+            remaining -= estimate.pop(user, 0.0)
+            processed.append({"user": user, "depth": user_depth, "info": user_info,
+                              "kept": kept, "failed": error is not None})
             
-        except Exception as e:
-            error_msg = f"Error processing {username}: {str(e)}"
-            print(f"{indent}  ❌ {error_msg}")
-            self.errors.append(error_msg)
+            if len(processed) >= checkpoint_every:
+                self._update_progress(len(fetched), len(fetched) - done_before,
+                                      remaining, started)
+                if checkpoint:
+                    checkpoint.save(processed, [(u, d, estimate[u]) for u, d in queue.snapshot()], [])
+                processed = []
+        
+        self._update_progress(len(fetched), len(fetched) - done_before, remaining, started)
+        if checkpoint:
+            checkpoint.clear()
+        return linker.children, linker.node_depth
+    
+    @staticmethod
+    def _report_estimate(user_info: Dict, depth: int, max_depth: int) -> float:
+        """
+        Estimated org size of each of a user's direct reports.
+        
+        Splits the user's total_reports evenly across their direct reports;
+        reports at the depth limit will not be expanded, so count as one.
+        """
+        reports = len(user_info['direct_reports'])
+        if not reports or depth + 2 >= max_depth:
+            return 1.0
+        below = max(0, user_info.get('total_reports', 0) - reports)
+        return 1.0 + below / reports
+    
+    def _update_progress(self, done: int, done_this_run: int, remaining: float, started: float):
+        """Record and print estimated percent complete and time remaining."""
+        elapsed = time.time() - started
+        total = done + remaining
+        rate = done_this_run / elapsed if elapsed > 0 else 0
+        eta = remaining / rate if rate else None
+        self.progress = {
+            "done": done,
+            "estimated_total": round(total),
+            "percent": round(100.0 * done / total, 1) if total else 100.0,
+            "eta_seconds": round(eta) if eta is not None else None
+        }
+        eta_text = f"{int(eta // 60)}m{int(eta % 60):02d}s" if eta is not None else "unknown"
+        print(f"⏳ Progress: {done} of ~{self.progress['estimated_total']} users "
+              f"({self.progress['percent']:.1f}%), ETA {eta_text}")
+    
+    def _restore_checkpoint(self, state: Dict, fetched: Dict[str, Optional[Dict]]):
+        """
+        Restore the users a checkpoint completed into fetched.
+        
+        The crawl queue is rebuilt from the restored pages rather than read
+        from the checkpoint, and users that failed are fetched again. The
+        linker then replays on_node for the restored users, so users
+        processed after the last checkpoint are fetched and reported again.
+        """
+        # A user retried after a failure has a later record that supersedes it
+        latest = {}
+        for record in state["records"]:
+            latest[record["user"]] = record
+        
+        for user, record in latest.items():
+            if not record["failed"]:
+                fetched[user] = record["info"]
+    
+    @staticmethod
+    def _due_at(node: Dict, max_age: float, jitter: float) -> float:
+        """Time at which a node's data is old enough to be revalidated."""
+        # A stable per-user offset spreads revalidation over the max_age
+        # window, so a crawl fetched in one go is not all due on the same day
+        digest = hashlib.sha1(node["username"].encode("utf-8")).digest()
+        spread = int.from_bytes(digest[:4], "big") / 2 ** 32
+        return node.get("fetched_at", 0) + max_age * (1 - jitter * spread)
+    
+    @staticmethod
+    def _crawl_depth_limit(previous: Dict[str, Dict]) -> Optional[int]:
+        """
+        The max_depth a saved tree was crawled with, or None if it was not cut off.
+        
+        A crawl stops one level below its deepest users, so if anyone at the
+        deepest level lists reports that are nowhere in the tree, that level
+        was the limit.
+        """
+        deepest = max((node.get("depth", 0) for node in previous.values()), default=0)
+        for node in previous.values():
+            if node.get("depth", 0) == deepest and any(
+                    report not in previous for report in node.get("direct_reports", [])):
+                return deepest + 1
+        return None
+    
+    def refresh_hierarchy(self, previous_tree: Dict, max_age: float = 24 * 60 * 60,
+                          max_depth: Optional[int] = None, max_workers: int = 8,
+                          jitter: float = 0.5,
+                          on_node: Optional[Callable[[Dict, Optional[str], int], None]] = None
+                          ) -> Optional[Dict]:
+        """
+        Incrementally refresh a tree produced by build_hierarchy.
+        
+        Only users whose data is older than max_age (minus a stable per-user
+        jitter) are re-fetched, most overdue first; everyone else is reused
+        as-is without being visited by the fetch scheduler. The tree is then
+        relinked in memory from the refreshed report lists: reports that were
+        not in the previous tree are crawled from scratch, and reports that
+        disappeared are dropped along with their subtrees. Fetch cost is
+        therefore proportional to the number of due and new users, not the
+        size of the org.
+        
+        Args:
+            previous_tree: Tree returned by build_hierarchy or refresh_hierarchy
+            max_age: Seconds after which a user's data is revalidated
+            max_depth: Maximum depth to traverse (default: the depth the
+                previous tree was crawled to)
+            max_workers: Maximum concurrent page fetches
+            jitter: Fraction of max_age by which revalidation may come early
+            on_node: Called for every user kept in the refreshed tree, as in
+                build_hierarchy
+        
+        Returns:
+            Refreshed tree in the same format as build_hierarchy
+        """
+        if not previous_tree:
             return None
+        
+        # Index the previous tree by username
+        previous: Dict[str, Dict] = {}
+        stack = [previous_tree]
+        while stack:
+            node = stack.pop()
+            previous.setdefault(node["username"], node)
+            stack.extend(node.get("direct_reports_tree", []))
+        
+        if max_depth is None:
+            max_depth = self._crawl_depth_limit(previous)
+        if max_depth is None:
+            max_depth = float("inf")
+        
+        now = time.time()
+        stats = {"reused": 0, "refetched": 0, "new": 0, "removed": 0, "failed": 0}
+        scheduler = self._get_scheduler(max_workers)
+        fresh: Dict[str, Dict] = {}
+        
+        # Revalidate the users whose TTL has expired, most overdue first
+        queue = PriorityWorkQueue()
+        for user, node in previous.items():
+            due_at = self._due_at(node, max_age, jitter)
+            if due_at <= now:
+                queue.push((user, node.get("depth", 0)), now - due_at)
+        
+        fetch = lambda item: self._fetch_node(*item, revalidate=True)
+        for (user, user_depth), user_info, error in scheduler.imap_prioritized(
+                fetch, queue, on_requeue=self._on_requeue):
+            if error is not None:
+                self._record_failure(user, user_depth, error)
+            if user_info is None:
+                # Keep last known data rather than dropping a whole subtree
+                stats["failed"] += 1
+                continue
+            stats["refetched"] += 1
+            fresh[user] = user_info
+        
+        def previous_info(user):
+            return {k: v for k, v in previous[user].items() if k not in ("direct_reports_tree", "depth")}
+        
+        root = previous_tree["username"]
+        children: Dict[str, List[str]] = {}
+        node_depth: Dict[str, int] = {}
+        parent_of: Dict[str, Optional[str]] = {root: None}
+        self.visited.add(root)
+        
+        def link(user: str, user_depth: int, user_info: Dict):
+            """Attach a user, then relink known reports below them in memory."""
+            level = [(user, user_depth, user_info)]
+            while level:
+                next_level = []
+                for user, user_depth, user_info in level:
+                    self.org_data[user] = user_info
+                    node_depth[user] = user_depth
+                    if on_node:
+                        on_node(user_info, parent_of[user], user_depth)
+                    
+                    kept = []
+                    for report_username in user_info['direct_reports']:
+                        if report_username in self.visited or user_depth + 1 >= max_depth:
+                            continue
+                        self.visited.add(report_username)
+                        parent_of[report_username] = user
+                        kept.append(report_username)
+                        if report_username in fresh:
+                            next_level.append((report_username, user_depth + 1, fresh[report_username]))
+                        elif report_username in previous:
+                            stats["reused"] += 1
+                            next_level.append((report_username, user_depth + 1, previous_info(report_username)))
+                        else:
+                            queue.push((report_username, user_depth + 1))
+                    children[user] = kept
+                level = next_level
+        
+        if root not in fresh:
+            stats["reused"] += 1
+        link(root, previous_tree.get("depth", 0), fresh.get(root) or previous_info(root))
+        
+        # Crawl reports that were not in the previous tree, and their subtrees
+        for (user, user_depth), user_info, error in scheduler.imap_prioritized(
+                fetch, queue, on_requeue=self._on_requeue):
+            if error is not None:
+                self._record_failure(user, user_depth, error)
+                stats["failed"] += 1
+            elif user_info is not None:
+                stats["new"] += 1
+                link(user, user_depth, user_info)
+        
+        stats["removed"] = sum(1 for user in previous if user not in node_depth)
+        self.refresh_stats = stats
+        return self._assemble_tree(root, children, node_depth)
     
-    def print_tree(self, node: Dict, indent: int = 0, is_last: bool = True):
-        """Pretty print the organizational tree."""
-        if not node:
-            return
+    def _assemble_tree(self, root: str, children: Dict[str, List[str]],
+                       node_depth: Dict[str, int]) -> Optional[Dict]:
+        """Link fetched users into the nested tree structure (no recursion)."""
+        if root not in node_depth:
+            return None
         
-        prefix = "  " * indent
-        connector = "└─" if is_last else "├─"
+        nodes = {
+            user: {
+                **self.org_data[user],
+                "direct_reports_tree": [],
+                "depth": user_depth
+            }
+            for user, user_depth in node_depth.items()
+        }
         
-        name = node.get("name") or node["username"]
-        title = node.get("title", "")
-        level = node.get("level", "")
-        report_count = len(node.get("direct_reports_tree", []))
+        for user, reports in children.items():
+            tree = nodes[user]["direct_reports_tree"]
+            for report_username in reports:
+                if report_username in nodes:
+                    tree.append(nodes[report_username])
         
-        # Main line
-        print(f"{prefix}{connector} {name} (@{node['username']})")
+        return nodes[root]
+    
+    def print_tree(self, node: Dict, indent: int = 0, is_last: bool = True,
+                   collapse_depth: Optional[int] = None, file=None):
+        """
+        Pretty print the organizational tree.
         
-        # Details
-        detail_prefix = prefix + ("   " if is_last else "│  ")
-        if title:
-            print(f"{detail_prefix}💼 {title}")
-        if level:
-            print(f"{detail_prefix}📊 Level {level}")
-        if report_count > 0:
-            print(f"{detail_prefix}👥 {report_count} direct report(s)")
+        Walks the tree with an explicit stack, so deep chains cannot hit the
+        recursion limit, and writes the output in large buffered chunks.
         
-        # Recursively print direct reports
-        reports = node.get("direct_reports_tree", [])
-        for i, report in enumerate(reports):
-            is_last_report = (i == len(reports) - 1)
-            self.print_tree(report, indent + 1, is_last_report)
+        Args:
+            node: Tree to print
+            indent: Indentation level of the starting node
+            is_last: Whether the starting node is its manager's last report
+            collapse_depth: Indent level below which subtrees are summarized
+                as a single line instead of printed
+            file: Stream to write to (default: stdout)
+        """
+        if not node:
+            return
+        
+        out = file or sys.stdout
+        lines = []
+        stack = [(node, indent, is_last)]
+        
+        while stack:
+            node, indent, is_last = stack.pop()
+            
+            prefix = "  " * indent
+            connector = "└─" if is_last else "├─"
+            
+            name = node.get("name") or node["username"]
+            title = node.get("title", "")
+            level = node.get("level", "")
+            reports = node.get("direct_reports_tree", [])
+            report_count = len(reports)
+            
+            # Main line
+            lines.append(f"{prefix}{connector} {name} (@{node['username']})")
+            
+            # Details
+            detail_prefix = prefix + ("   " if is_last else "│  ")
+            if title:
+                lines.append(f"{detail_prefix}💼 {title}")
+            if level:
+                lines.append(f"{detail_prefix}📊 Level {level}")
+            if report_count > 0:
+                lines.append(f"{detail_prefix}👥 {report_count} direct report(s)")
+            
+            if len(lines) >= 10000:
+                out.write("\n".join(lines) + "\n")
+                lines = []
+            
+            if report_count and collapse_depth is not None and indent >= collapse_depth:
+                org_size = self._count_nodes(node) - 1
+                lines.append(f"{detail_prefix}⋯ {org_size} people below (collapsed)")
+                continue
+            
+            # Push direct reports in reverse so they pop in order
+            for i in range(report_count - 1, -1, -1):
+                stack.append((reports[i], indent + 1, i == report_count - 1))
+        
+        if lines:
+            out.write("\n".join(lines) + "\n")
+    
+    @staticmethod
+    def _count_nodes(tree: Dict) -> int:
+        """Count people in a tree without recursion."""
+        count = 0
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.get("direct_reports_tree", []))
+        return count
     
     def generate_summary(self, tree: Dict) -> Dict:
-        """Generate summary statistics from the org tree."""
-        def count_nodes(node):
-            if not node:
-                return 0
-            count = 1
-            for report in node.get("direct_reports_tree", []):
-                count += count_nodes(report)
-            return count
-        
-        def max_depth(node, current_depth=0):
-            if not node or not node.get("direct_reports_tree"):
-                return current_depth
-            depths = [max_depth(r, current_depth + 1) for r in node["direct_reports_tree"]]
-            return max(depths) if depths else current_depth
+        """
+        Generate summary statistics from the org tree in a single pass.
+        
+        Besides headcount and depth, reports the span of control (direct
+        reports per manager) and how many managers sit at each depth.
+        """
+        total_people = 0
+        deepest = 0
+        span_distribution: Dict[int, int] = defaultdict(int)
+        managers_by_depth: Dict[int, int] = defaultdict(int)
+        
+        stack = [(tree, 0)] if tree else []
+        while stack:
+            node, depth = stack.pop()
+            total_people += 1
+            deepest = max(deepest, depth)
+            
+            reports = node.get("direct_reports_tree", [])
+            if reports:
+                span_distribution[len(reports)] += 1
+                managers_by_depth[depth] += 1
+                stack.extend((report, depth + 1) for report in reports)
+        
+        managers = sum(span_distribution.values())
+        spans = sum(span * count for span, count in span_distribution.items())
         
         return {
-            "total_people": count_nodes(tree),
-            "max_depth": max_depth(tree),
+            "total_people": total_people,
+            "max_depth": deepest,
             "direct_reports": len(tree.get("direct_reports_tree", [])),
             "root_user": tree.get("username"),
-            "root_name": tree.get("name")
+            "root_name": tree.get("name"),
+            "managers": managers,
+            "individual_contributors": total_people - managers,
+            "avg_span_of_control": round(spans / managers, 1) if managers else 0,
+            "max_span_of_control": max(span_distribution, default=0),
+            "span_of_control_distribution": dict(sorted(span_distribution.items())),
+            "managers_by_depth": dict(sorted(managers_by_depth.items()))
         }
 
 
+class _DepthFirstLinker:
+    """
+    Places fetched users into trees in sequential depth-first order.
+    
+    The walk visits roots in order and each user's reports in listing
+    order, attaching everyone under the first manager it reaches them
+    from, just like a recursive crawl. It pauses at the first user whose
+    page has not been fetched yet and resumes there on the next advance().
+    """
+    
+    def __init__(self, reader: "OrgHierarchyReader", roots: List[str], depth: int,
+                 max_depth: int, fetched: Dict[str, Optional[Dict]], on_node=None):
+        self.reader = reader
+        self.depth = depth
+        self.max_depth = max_depth
+        self.fetched = fetched
+        self.on_node = on_node
+        self.children: Dict[str, List[str]] = {}
+        self.node_depth: Dict[str, int] = {}
+        # Roots are claimed up front, so a root listed in another root's org
+        # stays a root of its own and is recorded as a cross reference
+        visited = reader.visited
+        self.roots = [root for root in dict.fromkeys(roots)
+                      if root not in visited and depth < max_depth]
+        visited.update(self.roots)
+        self.parent_of: Dict[str, Optional[str]] = {root: None for root in self.roots}
+        self._next_root = 0
+        # [user, depth, index of the next report to visit] down the current path
+        self._path: List[list] = []
+    
+    def _root_of(self, user: str) -> Optional[str]:
+        if user not in self.parent_of:
+            return None
+        while self.parent_of[user] is not None:
+            user = self.parent_of[user]
+        return user
+    
+    def _place(self, user: str, parent: Optional[str], user_depth: int):
+        self.parent_of[user] = parent
+        user_info = self.fetched[user]
+        if user_info is None:
+            return
+        if parent is not None:
+            self.children[parent].append(user)
+        self.reader.org_data[user] = user_info
+        self.node_depth[user] = user_depth
+        self.children[user] = []
+        if self.on_node:
+            self.on_node(user_info, parent, user_depth)
+        self._path.append([user, user_depth, 0])
+    
+    def advance(self) -> bool:
+        """Walk as far as the fetched pages allow; returns True once every tree is complete."""
+        visited = self.reader.visited
+        while True:
+            if not self._path:
+                if self._next_root == len(self.roots):
+                    return True
+                root = self.roots[self._next_root]
+                if root not in self.fetched:
+                    return False
+                self._next_root += 1
+                self._place(root, None, self.depth)
+                continue
+            
+            frame = self._path[-1]
+            user, user_depth, index = frame
+            reports = self.fetched[user]['direct_reports']
+            if index == len(reports) or user_depth + 1 >= self.max_depth:
+                self._path.pop()
+                continue
+            
+            report_username = reports[index]
+            if report_username in visited:
+                owner_root = self._root_of(report_username)
+                if owner_root is not None and owner_root != self._root_of(user):
+                    self.reader.cross_references.append({
+                        "username": report_username,
+                        "manager": user,
+                        "root": self._root_of(user),
+                        "owner_root": owner_root
+                    })
+                frame[2] += 1
+                continue
+            if report_username not in self.fetched:
+                return False
+            frame[2] += 1
+            visited.add(report_username)
+            self._place(report_username, user, user_depth + 1)
+
+
 def main():
     """Main execution function."""
     print("=" * 80)
@@ -228,12 +770,34 @@ def main():
     print("=" * 80)
     print()
     
+    parser = argparse.ArgumentParser(description="Read an org hierarchy from Phonetool")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Incrementally refresh the previously saved hierarchy")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted crawl from its last checkpoint")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Also stream one record per person to org_hierarchy_<user>.ndjson during the crawl")
+    parser.add_argument("--root", action="append", dest="roots", metavar="USER",
+                        help="Root user to crawl; repeat to crawl several orgs in one pass")
+    args = parser.parse_args()
+    
     # Configuration
-    start_username = "jamie"
+    roots = list(dict.fromkeys(args.roots or ["jamie"]))
+    start_username = "_".join(roots)
     max_depth = 5  # Adjust based on how deep you want to go
+    max_workers = 8  # Upper bound on concurrent page fetches
+    requests_per_second = 5.0  # Phonetool request budget
+    max_retries = 3  # Retries per fetch before the user is re-queued
+    cache_dir = ".org_cache"  # Persistent page cache shared across runs
+    cache_ttl_days = 7
+    collapse_depth = None  # Set to summarize subtrees below this depth when printing
+    refresh_max_age_days = 7  # Each user is revalidated about once per window
+    output_file = f"org_hierarchy_{start_username}.json"
+    checkpoint_dir = f".org_checkpoint_{start_username}"  # Crawl progress for --resume
     
-    print(f"Starting user: {start_username}")
+    print(f"Starting user{'s' if len(roots) > 1 else ''}: {', '.join(roots)}")
     print(f"Maximum depth: {max_depth}")
+    print(f"Concurrent fetches: up to {max_workers}, {requests_per_second:g} requests/s")
     print()
     print("⚠️  NOTE: This requires MCP access through Kiro")
     print()
@@ -241,36 +805,102 @@ def main():
     print()
     
     # Create reader and build hierarchy
-    reader = OrgHierarchyReader()
+    cache = OrgPageCache(cache_dir, ttl=cache_ttl_days * 24 * 60 * 60)
+    scheduler = FetchScheduler(
+        requests_per_second=requests_per_second,
+        max_concurrency=max_workers,
+        max_retries=max_retries
+    )
+    reader = OrgHierarchyReader(cache=cache, scheduler=scheduler)
+    ndjson_file = f"org_hierarchy_{start_username}.ndjson"
+    # A resumed crawl replays the users it restores, so the stream is rewritten
+    writer = OrgNDJSONWriter(ndjson_file) if args.ndjson else None
     
-    print("🔍 Building organizational hierarchy...")
-    print()
+    if args.refresh and len(roots) > 1:
+        print("⚠️  --refresh supports a single root; doing a full multi-root crawl instead")
+        print()
     
-    org_tree = reader.build_hierarchy(start_username, max_depth=max_depth)
+    if args.refresh and len(roots) == 1 and os.path.exists(output_file):
+        with open(output_file, "r") as f:
+            previous_tree = json.load(f)
+        
+        print(f"🔄 Refreshing hierarchy from {output_file}...")
+        print()
+        
+        org_tree = reader.refresh_hierarchy(
+            previous_tree,
+            max_age=refresh_max_age_days * 24 * 60 * 60,
+            max_workers=max_workers,
+            on_node=writer
+        )
+    else:
+        print("🔍 Building organizational hierarchy...")
+        print()
+        
+        checkpoint = CrawlCheckpoint(checkpoint_dir)
+        if len(roots) == 1:
+            org_tree = reader.build_hierarchy(roots[0], max_depth=max_depth, max_workers=max_workers,
+                                              on_node=writer, checkpoint=checkpoint, resume=args.resume)
+        else:
+            org_tree = reader.build_forest(roots, max_depth=max_depth, max_workers=max_workers,
+                                           on_node=writer, checkpoint=checkpoint, resume=args.resume)
+            if not org_tree["roots"]:
+                org_tree = {}
+    
+    if writer:
+        writer.close()
     
     if org_tree:
+        trees = org_tree["roots"] if "roots" in org_tree else [org_tree]
         print()
         print("=" * 80)
         print("📊 ORGANIZATIONAL STRUCTURE")
         print("=" * 80)
-        print()
-        reader.print_tree(org_tree)
+        for tree in trees:
+            print()
+            reader.print_tree(tree, collapse_depth=collapse_depth)
         
         # Generate summary
         print()
         print("=" * 80)
         print("📈 SUMMARY STATISTICS")
         print("=" * 80)
-        summary = reader.generate_summary(org_tree)
-        for key, value in summary.items():
-            print(f"  {key.replace('_', ' ').title()}: {value}")
+        for tree in trees:
+            if len(trees) > 1:
+                print(f"  [{tree['name'] or tree['username']} (@{tree['username']})]")
+            summary = reader.generate_summary(tree)
+            for key, value in summary.items():
+                label = key.replace('_', ' ').title()
+                if isinstance(value, dict):
+                    print(f"  {label}:")
+                    for bucket, count in value.items():
+                        print(f"    {bucket}: {count}")
+                else:
+                    print(f"  {label}: {value}")
+        if "cross_references" in org_tree:
+            print(f"  Cross-Org References: {len(org_tree['cross_references'])}")
+            for ref in org_tree["cross_references"]:
+                print(f"    @{ref['manager']} ({ref['root']}) → @{ref['username']} "
+                      f"(shown under {ref['owner_root']})")
         
         # Save to file
-        output_file = f"org_hierarchy_{start_username}.json"
         with open(output_file, "w") as f:
             json.dump(org_tree, f, indent=2)
         print()
         print(f"💾 Full hierarchy saved to: {output_file}")
+        if writer:
+            print(f"💾 Streamed {writer.count} records to: {ndjson_file}")
+        stats = cache.stats
+        print(f"🗄️  Page cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+              f"{stats['misses']} fetched and parsed")
+        fetch_stats = scheduler.stats
+        print(f"🌐 Fetches: {fetch_stats['calls']} calls, {fetch_stats['retries']} retries, "
+              f"{fetch_stats['requeued']} re-queued, {fetch_stats['failed']} failed "
+              f"(final concurrency {int(scheduler.concurrency.limit)})")
+        if reader.refresh_stats:
+            rs = reader.refresh_stats
+            print(f"🔄 Refresh: {rs['reused']} reused, {rs['refetched']} revalidated, "
+                  f"{rs['new']} new, {rs['removed']} removed, {rs['failed']} failed")
         
         # Show errors if any
         if reader.errors:
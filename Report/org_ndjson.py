@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Streaming NDJSON export and import of org hierarchies.
+
+Each line is one flat JSON record per person, with a "parent" pointer to the
+manager they were attached under in the crawl (null for the root):
+
+    {"username": "alice", "parent": "jamie", "depth": 1, "name": ..., ...}
+
+OrgNDJSONWriter plugs into OrgHierarchyReader.build_hierarchy as its on_node
+callback, so records are written and flushed as each person is placed in
+the tree and consumers can tail the file while the crawl is still running.
+Parents are always written before their reports.
+"""
+
+import json
+import threading
+from typing import Dict, Iterator, Optional
+
+from org_graph import CompactOrgGraph
+
+
+# Tree-only keys that are not written to records
+_TREE_KEYS = ("direct_reports_tree", "depth")
+
+
+class OrgNDJSONWriter:
+    """Appends one record per person to an NDJSON file as the crawl proceeds."""
+    
+    def __init__(self, path: str, append: bool = False):
+        """
+        Args:
+            path: Output file
+            append: Add to an existing file instead of truncating it
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+    
+    def write(self, user_info: Dict, parent: Optional[str], depth: int):
+        """Write one person's record and flush it (usable as on_node)."""
+        record = {"username": user_info["username"], "parent": parent, "depth": depth}
+        record.update((k, v) for k, v in user_info.items()
+                      if k not in _TREE_KEYS and k not in record)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+    
+    __call__ = write
+    
+    def close(self):
+        """Close the output file."""
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_tree(tree: Dict, path: str) -> int:
+    """
+    Export an existing nested tree as NDJSON, parents before reports.
+    
+    Returns:
+        Number of records written
+    """
+    with OrgNDJSONWriter(path) as writer:
+        stack = [(tree, None)] if tree else []
+        while stack:
+            node, parent = stack.pop()
+            writer.write(node, parent, node.get("depth", 0))
+            for report in reversed(node.get("direct_reports_tree", [])):
+                stack.append((report, node["username"]))
+        return writer.count
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """
+    Yield records one at a time without loading the whole file.
+    
+    A trailing partial line (a crawl still writing) is skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_graph(path: str) -> CompactOrgGraph:
+    """Build a CompactOrgGraph from an NDJSON export, streaming the records."""
+    return CompactOrgGraph.from_records(iter_records(path))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for Phonetool user pages.
+
+Stores each fetched page next to its parsed `parse_user_info` result, keyed
+by username, so repeated org crawls can skip both the network fetch and the
+regex parsing. Entries expire after a TTL; expired entries are revalidated
+by comparing a content hash of the refetched page, so unchanged pages are
+not parsed again.
+
+The cache is a directory of small JSON files written atomically, which makes
+it safe to share across runs and between concurrent processes.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 1 week
+
+
+class OrgPageCache:
+    """On-disk TTL cache of raw and parsed Phonetool pages."""
+    
+    def __init__(self, cache_dir: str = ".org_cache", ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            cache_dir: Directory holding cache entries
+            ttl: Seconds before an entry must be revalidated
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+    
+    def record(self, outcome: str):
+        """Count a lookup outcome (hits, revalidated, misses)."""
+        with self._stats_lock:
+            self.stats[outcome] += 1
+    
+    @staticmethod
+    def validator_for(raw: str) -> str:
+        """Content hash used to detect unchanged pages on revalidation."""
+        return hashlib.sha256(raw.encode("utf-8", "surrogatepass")).hexdigest()
+    
+    def _path(self, username: str) -> Path:
+        # Shard by hash prefix so large orgs don't put 100k files in one directory
+        shard = hashlib.sha1(username.encode("utf-8")).hexdigest()[:2]
+        return self.cache_dir / shard / f"{username}.json"
+    
+    def get(self, username: str) -> Optional[Dict]:
+        """Return the cache entry for a user, fresh or stale, or None."""
+        path = self._path(username)
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+    
+    def is_fresh(self, entry: Dict, now: Optional[float] = None) -> bool:
+        """True if the entry is younger than the TTL."""
+        now = time.time() if now is None else now
+        return now - entry.get("fetched_at", 0) < self.ttl
+    
+    @staticmethod
+    def raw_content(entry: Dict) -> str:
+        """Decompress the raw page stored in an entry."""
+        return zlib.decompress(base64.b64decode(entry["raw_z"])).decode("utf-8", "surrogatepass")
+    
+    def put(self, username: str, raw: str, parsed: Dict, parser_version: int = 0,
+            validator: Optional[str] = None) -> Dict:
+        """Store a freshly fetched page and its parsed info."""
+        entry = {
+            "username": username,
+            "fetched_at": time.time(),
+            "validator": validator or self.validator_for(raw),
+            "parser_version": parser_version,
+            "parsed": parsed,
+            "raw_z": base64.b64encode(zlib.compress(raw.encode("utf-8", "surrogatepass"))).decode("ascii"),
+        }
+        self._write(username, entry)
+        return entry
+    
+    def touch(self, username: str, entry: Dict) -> Dict:
+        """Mark an entry as revalidated now without changing its content."""
+        entry = {**entry, "fetched_at": time.time()}
+        self._write(username, entry)
+        return entry
+    
+    def invalidate(self, username: str):
+        """Drop a user's entry."""
+        try:
+            self._path(username).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _write(self, username: str, entry: Dict):
+        path = self._path(username)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+In-memory query index over a crawled org hierarchy.
+
+Answers the questions people ask about an org without re-crawling Phonetool:
+
+    - prefix and fuzzy search over names and usernames
+    - filtering by title and level, optionally within one manager's org
+    - the chain of command above anyone
+    - the lowest common manager of two people, in O(log n) via binary lifting
+
+Built on CompactOrgGraph, so it loads from either a saved nested tree
+(org_hierarchy_<user>.json) or a streamed export (.ndjson).
+
+Usage:
+    python org_query.py org_hierarchy_jamie.json search ali
+    python org_query.py org_hierarchy_jamie.json common alice bob
+    python org_query.py org_hierarchy_jamie.json chain alice
+    python org_query.py org_hierarchy_jamie.json filter --title engineer --level 6
+"""
+
+import argparse
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from org_graph import CompactOrgGraph
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class OrgQueryIndex:
+    """Search, filter and common-manager queries over a CompactOrgGraph."""
+    
+    def __init__(self, graph: CompactOrgGraph):
+        self.graph = graph
+        n = len(graph)
+        
+        # Sorted (key, id) pairs for prefix search on names and usernames
+        keys = []
+        for node_id in range(n):
+            keys.append((graph.usernames[node_id].lower(), node_id))
+            name = graph.names[node_id].lower()
+            if name:
+                keys.append((name, node_id))
+                # Also match on last name, first name, ...
+                for part in name.split()[1:]:
+                    keys.append((part, node_id))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_ids = array("i", (node_id for _, node_id in keys))
+        
+        # Trigram postings narrow fuzzy search to a few candidates
+        self._trigram_ids: Dict[str, List[int]] = defaultdict(list)
+        for node_id in range(n):
+            label = (graph.names[node_id] or graph.usernames[node_id]).lower()
+            for gram in _trigrams(label):
+                self._trigram_ids[gram].append(node_id)
+        
+        self._title_ids: Dict[str, List[int]] = defaultdict(list)
+        self._level_ids: Dict[str, List[int]] = defaultdict(list)
+        for node_id in range(n):
+            self._title_ids[graph.titles[node_id]].append(node_id)
+            self._level_ids[graph.levels[node_id].lower()].append(node_id)
+        
+        # Binary lifting table: up[k][v] is v's 2^k-th manager (roots point to themselves)
+        self._up = [array("i", (p if p >= 0 else v for v, p in enumerate(graph.parent)))]
+        for _ in range(1, max(1, graph.max_depth().bit_length())):
+            prev = self._up[-1]
+            self._up.append(array("i", (prev[prev[v]] for v in range(n))))
+    
+    @classmethod
+    def load(cls, path: str) -> "OrgQueryIndex":
+        """Build an index from a saved .json tree or a streamed .ndjson export."""
+        return cls(CompactOrgGraph.load(path))
+    
+    def _person(self, node_id: int) -> Dict:
+        graph = self.graph
+        return {
+            "username": graph.usernames[node_id],
+            "name": graph.names[node_id],
+            "title": graph.titles[node_id],
+            "level": graph.levels[node_id],
+            "manager": graph.manager(graph.usernames[node_id]),
+            "depth": graph.depths[node_id]
+        }
+    
+    def get(self, username: str) -> Optional[Dict]:
+        """Details for one username, or None if not in the index."""
+        if username not in self.graph:
+            return None
+        return self._person(self.graph.id_of(username))
+    
+    def search_prefix(self, prefix: str, limit: int = 20) -> List[Dict]:
+        """People whose username, full name or any later name part starts with prefix."""
+        prefix = prefix.lower()
+        seen = []
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and self._keys[i].startswith(prefix) and len(seen) < limit:
+            node_id = self._key_ids[i]
+            if node_id not in seen:
+                seen.append(node_id)
+            i += 1
+        return [self._person(node_id) for node_id in seen]
+    
+    def search_fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.6) -> List[Tuple[float, Dict]]:
+        """
+        Closest names to a possibly misspelled query, best first.
+        
+        Candidates sharing the most trigrams with the query are scored with
+        difflib; everyone else is never compared.
+        """
+        query = query.lower()
+        overlap: Dict[int, int] = defaultdict(int)
+        for gram in _trigrams(query):
+            for node_id in self._trigram_ids.get(gram, ()):
+                overlap[node_id] += 1
+        
+        candidates = sorted(overlap, key=overlap.get, reverse=True)[:limit * 10]
+        scored = []
+        for node_id in candidates:
+            label = (self.graph.names[node_id] or self.graph.usernames[node_id]).lower()
+            score = max(SequenceMatcher(None, query, label).ratio(),
+                        SequenceMatcher(None, query, self.graph.usernames[node_id].lower()).ratio())
+            if score >= cutoff:
+                scored.append((score, node_id))
+        
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(round(score, 3), self._person(node_id)) for score, node_id in scored[:limit]]
+    
+    def find(self, query: str) -> Optional[str]:
+        """Resolve a username, name or unique prefix to a username."""
+        if query in self.graph:
+            return query
+        matches = self.search_prefix(query, limit=2)
+        if len(matches) == 1:
+            return matches[0]["username"]
+        if not matches:
+            fuzzy = self.search_fuzzy(query, limit=1, cutoff=0.8)
+            if fuzzy:
+                return fuzzy[0][1]["username"]
+        return None
+    
+    def filter(self, title: Optional[str] = None, level: Optional[str] = None,
+               under: Optional[str] = None) -> List[Dict]:
+        """
+        People matching every given criterion, in org order.
+        
+        Args:
+            title: Case-insensitive substring of the job title
+            level: Exact level, e.g. "6"
+            under: Only people in this manager's org
+        """
+        ids = None
+        if title is not None:
+            needle = title.lower()
+            ids = {node_id for t, members in self._title_ids.items() if needle in t.lower()
+                   for node_id in members}
+        if level is not None:
+            level_ids = set(self._level_ids.get(str(level).lower(), ()))
+            ids = level_ids if ids is None else ids & level_ids
+        if under is not None:
+            # A manager's org is a contiguous range of pre-order ids
+            start = self.graph.id_of(under)
+            org = range(start + 1, start + self.graph.sizes[start])
+            ids = set(org) if ids is None else {node_id for node_id in ids if node_id in org}
+        if ids is None:
+            ids = range(len(self.graph))
+        
+        return [self._person(node_id) for node_id in sorted(ids)]
+    
+    def chain_of_command(self, username: str) -> List[Dict]:
+        """Managers from the person's manager up to the root."""
+        return [self._person(self.graph.id_of(u)) for u in self.graph.chain_of_command(username)]
+    
+    def _lca(self, a: int, b: int) -> Optional[int]:
+        depths = self.graph.depths
+        if depths[a] < depths[b]:
+            a, b = b, a
+        
+        # Lift a to b's depth, then lift both until just below the meeting point
+        diff = depths[a] - depths[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = self._up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        
+        for level in reversed(self._up):
+            if level[a] != level[b]:
+                a, b = level[a], level[b]
+        a, b = self._up[0][a], self._up[0][b]
+        return a if a == b else None
+    
+    def common_manager(self, first: str, second: str) -> Optional[Dict]:
+        """
+        Lowest manager both people report up to, in O(log n).
+        
+        If one person is in the other's org, that person is returned. Returns
+        None when the two are in different trees of a forest.
+        """
+        node_id = self._lca(self.graph.id_of(first), self.graph.id_of(second))
+        return self._person(node_id) if node_id is not None else None
+
+
+def _print_people(people: List[Dict]):
+    if not people:
+        print("  (no matches)")
+    for person in people:
+        name = person["name"] or person["username"]
+        details = ", ".join(x for x in (person["title"], f"L{person['level']}" if person["level"] else "") if x)
+        print(f"  • {name} (@{person['username']})" + (f" - {details}" if details else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a crawled org hierarchy")
+    parser.add_argument("org_file", help="org_hierarchy_<user>.json or .ndjson")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    search = commands.add_parser("search", help="Prefix and fuzzy search by name or username")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    
+    common = commands.add_parser("common", help="Lowest common manager of two people")
+    common.add_argument("first")
+    common.add_argument("second")
+    
+    chain = commands.add_parser("chain", help="Chain of command above a person")
+    chain.add_argument("person")
+    
+    filt = commands.add_parser("filter", help="Filter by title and/or level")
+    filt.add_argument("--title")
+    filt.add_argument("--level")
+    filt.add_argument("--under", help="Only people in this manager's org")
+    
+    args = parser.parse_args()
+    index = OrgQueryIndex.load(args.org_file)
+    
+    def resolve(query: str) -> str:
+        username = index.find(query)
+        if username is None:
+            print(f"❌ No unique match for '{query}'")
+            sys.exit(1)
+        return username
+    
+    if args.command == "search":
+        matches = index.search_prefix(args.query, limit=args.limit)
+        if matches:
+            print(f"🔍 Prefix matches for '{args.query}':")
+            _print_people(matches)
+        else:
+            print(f"🔍 Closest matches for '{args.query}':")
+            _print_people([person for _, person in index.search_fuzzy(args.query, limit=args.limit)])
+    
+    elif args.command == "common":
+        first, second = resolve(args.first), resolve(args.second)
+        manager = index.common_manager(first, second)
+        if manager is None:
+            print(f"❌ @{first} and @{second} have no common manager in this org")
+            return 1
+        print(f"👥 Common manager of @{first} and @{second}:")
+        _print_people([manager])
+    
+    elif args.command == "chain":
+        username = resolve(args.person)
+        print(f"🔗 Chain of command for @{username}:")
+        _print_people(index.chain_of_command(username))
+    
+    elif args.command == "filter":
+        under = resolve(args.under) if args.under else None
+        people = index.filter(title=args.title, level=args.level, under=under)
+        print(f"📋 {len(people)} match(es):")
+        _print_people(people)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Jira workload rolled up by management chain.
+
+Collects every open, assigned issue in a Jira scope in one paginated
+jira_search_issues query, counts active issues, bugs and overdue items per
+assignee (the same data Jira Max team_workload groups by), and rolls the
+counts up the org hierarchy.
+
+CompactOrgGraph numbers people in pre-order, which is an Euler tour of the
+org: each manager's org is the contiguous id range [id, id + size). With a
+prefix sum over each per-person count, the totals for any manager's whole
+org are one subtraction, so every manager's rollup together costs a single
+O(n) pass instead of one JQL query per manager.
+
+Usage:
+    python org_workload.py org_hierarchy_jamie.json --jql "project in (RCIT, PODFLAN)"
+    python org_workload.py org_hierarchy_jamie.json --issues saved_issues.json --top 20
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+
+from org_graph import CompactOrgGraph
+
+
+METRICS = ("active", "bugs", "overdue")
+
+SEARCH_FIELDS = ["assignee", "issuetype", "duedate", "status"]
+
+
+def _field(issue: Dict, flat_key: str, rest_key: str):
+    # Search results come back either flattened ({"assignee": ..., "type": ...})
+    # or in the REST shape ({"fields": {"assignee": {...}, "issuetype": {...}}})
+    if flat_key in issue:
+        return issue[flat_key]
+    return (issue.get("fields") or {}).get(rest_key)
+
+
+def _name(value) -> str:
+    """Display value of a Jira field that may be a string or an object."""
+    if isinstance(value, dict):
+        return value.get("name") or value.get("displayName") or value.get("value") or ""
+    return value or ""
+
+
+def assignee_keys(issue: Dict) -> List[str]:
+    """Ways the issue's assignee may be identified: login first, then display name."""
+    assignee = _field(issue, "assignee", "assignee")
+    if not assignee:
+        return []
+    if not isinstance(assignee, dict):
+        return [str(assignee)]
+    
+    keys = [assignee.get("name"), assignee.get("key")]
+    email = assignee.get("emailAddress") or ""
+    if "@" in email:
+        keys.append(email.split("@", 1)[0])
+    keys.append(assignee.get("displayName"))
+    return [key for key in keys if key]
+
+
+def issue_metrics(issue: Dict, today: str) -> Dict[str, int]:
+    """
+    One issue's contribution to each metric.
+    
+    Every issue is counted as active, so the search should already exclude
+    finished work. today is an ISO date; ISO dates compare correctly as
+    strings.
+    """
+    due = _field(issue, "duedate", "duedate")
+    return {
+        "active": 1,
+        "bugs": int(_name(_field(issue, "type", "issuetype")).lower() == "bug"),
+        "overdue": int(bool(due) and str(due)[:10] < today)
+    }
+
+
+def fetch_open_issues(call_tool: Callable[[str, Dict], Dict], scope_jql: str,
+                      page_size: int = 100, max_issues: Optional[int] = None) -> List[Dict]:
+    """
+    All open, assigned issues in a JQL scope, one page at a time.
+    
+    "Open" is any status outside the Done category, so Closed, Resolved,
+    Won't Do and other finishing statuses are excluded along with Done.
+    
+    Args:
+        call_tool: MCP call, e.g. MCPClient("rbks-mcp-servers").call_tool
+        scope_jql: Which issues to consider, e.g. "project in (RCIT, PODFLAN)"
+        page_size: Issues per request
+        max_issues: Stop after this many issues (default: all)
+    """
+    jql = f"({scope_jql}) AND assignee is not EMPTY AND statusCategory != Done"
+    issues: List[Dict] = []
+    start_at = 0
+    
+    while True:
+        result = call_tool("jira_search_issues", {
+            "jql": jql,
+            "fields": SEARCH_FIELDS,
+            "startAt": start_at,
+            "maxResults": page_size
+        })
+        if isinstance(result, str):
+            result = json.loads(result)
+        page = (result.get("issues") or result.get("results") or []) if isinstance(result, dict) else result
+        issues.extend(page)
+        start_at += len(page)
+        
+        # Without a total, a short page is the last one
+        total = result.get("total") if isinstance(result, dict) else None
+        last = start_at >= total if total is not None else len(page) < page_size
+        if not page or last or (max_issues and start_at >= max_issues):
+            break
+    
+    return issues[:max_issues] if max_issues else issues
+
+
+class OrgWorkloadRollup:
+    """Per-person and whole-org workload totals over a CompactOrgGraph."""
+    
+    def __init__(self, graph: CompactOrgGraph, issues: Iterable[Dict],
+                 today: Optional[date] = None):
+        """
+        Args:
+            graph: The org hierarchy
+            issues: Open issues, e.g. from fetch_open_issues
+            today: Date used to decide what is overdue (default: today)
+        """
+        self.graph = graph
+        n = len(graph)
+        self.own = {metric: array("l", [0]) * n for metric in METRICS}
+        self.unmatched: Dict[str, Dict[str, int]] = {}
+        today_text = (today or date.today()).isoformat()
+        
+        # Resolve assignees to org members by login, then by full name
+        by_name = {}
+        for node_id, name in enumerate(graph.names):
+            if name:
+                by_name.setdefault(name.lower(), node_id)
+        resolved: Dict[str, Optional[int]] = {}
+        
+        for issue in issues:
+            keys = assignee_keys(issue)
+            if not keys:
+                continue
+            if keys[0] not in resolved:
+                node_id = None
+                for key in keys:
+                    node_id = graph.find_id(key)
+                    if node_id is None:
+                        node_id = by_name.get(key.lower())
+                    if node_id is not None:
+                        break
+                resolved[keys[0]] = node_id
+            
+            node_id = resolved[keys[0]]
+            metrics = issue_metrics(issue, today_text)
+            if node_id is None:
+                person = self.unmatched.setdefault(keys[0], {metric: 0 for metric in METRICS})
+                for metric in METRICS:
+                    person[metric] += metrics[metric]
+            else:
+                for metric in METRICS:
+                    self.own[metric][node_id] += metrics[metric]
+        
+        # prefix[metric][i] is the sum of own counts for ids below i
+        self.prefix = {}
+        for metric in METRICS:
+            prefix = array("l", [0]) * (n + 1)
+            running = 0
+            own = self.own[metric]
+            for node_id in range(n):
+                running += own[node_id]
+                prefix[node_id + 1] = running
+            self.prefix[metric] = prefix
+    
+    def totals(self, node_id: int) -> Dict[str, int]:
+        """Counts across a person's whole org (including them), in O(1)."""
+        end = node_id + self.graph.sizes[node_id]
+        return {metric: self.prefix[metric][end] - self.prefix[metric][node_id] for metric in METRICS}
+    
+    def person(self, username: str) -> Dict[str, int]:
+        """Counts assigned to this person alone."""
+        node_id = self.graph.id_of(username)
+        return {metric: self.own[metric][node_id] for metric in METRICS}
+    
+    def org(self, username: str) -> Dict[str, int]:
+        """Counts across this person's whole org, including them."""
+        return self.totals(self.graph.id_of(username))
+    
+    def managers(self, sort_by: str = "active", top: Optional[int] = None) -> List[Dict]:
+        """
+        Rollup row for every manager, busiest org first.
+        
+        Each row has username, name, depth, headcount, the org totals and
+        active_per_person.
+        """
+        graph = self.graph
+        rows = []
+        for node_id in range(len(graph)):
+            headcount = graph.sizes[node_id]
+            if headcount == 1:
+                continue
+            totals = self.totals(node_id)
+            rows.append({
+                "username": graph.usernames[node_id],
+                "name": graph.names[node_id],
+                "depth": graph.depths[node_id],
+                "headcount": headcount,
+                **totals,
+                "active_per_person": round(totals["active"] / headcount, 2)
+            })
+        rows.sort(key=lambda row: (-row[sort_by], row["depth"]))
+        return rows[:top] if top else rows
+
+
+def format_workload_report(rollup: OrgWorkloadRollup, sort_by: str = "active", top: int = 25) -> str:
+    """Text table of the busiest managers' orgs."""
+    rows = rollup.managers(sort_by=sort_by, top=top)
+    lines = [
+        "👥 WORKLOAD BY MANAGEMENT CHAIN",
+        f"  {'Manager':<32} {'People':>6} {'Active':>7} {'Bugs':>6} {'Overdue':>8} {'Per person':>11}",
+    ]
+    for row in rows:
+        label = f"{'  ' * row['depth']}{row['name'] or row['username']} (@{row['username']})"
+        lines.append(f"  {label[:32]:<32} {row['headcount']:>6} {row['active']:>7} {row['bugs']:>6} "
+                     f"{row['overdue']:>8} {row['active_per_person']:>11.2f}")
+    
+    if rollup.unmatched:
+        issues = sum(person["active"] for person in rollup.unmatched.values())
+        lines.append("")
+        lines.append(f"  ⚠️  {issues} issues assigned to {len(rollup.unmatched)} people outside this org")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll Jira workload up the org hierarchy")
+    parser.add_argument("org_file", help="org_hierarchy_<user>.json or .ndjson")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jql", help="Issue scope, e.g. \"project in (RCIT, PODFLAN)\"")
+    source.add_argument("--issues", metavar="FILE", help="Saved jira_search_issues results (JSON list)")
+    parser.add_argument("--sort", choices=METRICS, default="active")
+    parser.add_argument("--top", type=int, default=25, help="Managers to list")
+    parser.add_argument("--json", metavar="FILE", help="Also write every manager's rollup as JSON")
+    args = parser.parse_args()
+    
+    graph = CompactOrgGraph.load(args.org_file)
+    
+    if args.issues:
+        with open(args.issues, "r") as f:
+            issues = json.load(f)
+        if isinstance(issues, dict):
+            issues = issues.get("issues") or issues.get("results") or []
+    else:
+        # Add tpm-slack-bot to path
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tpm-slack-bot'))
+        from src.services.mcp_client import MCPClient
+        
+        print(f"🔍 Fetching open issues for: {args.jql}")
+        issues = fetch_open_issues(MCPClient("rbks-mcp-servers").call_tool, args.jql)
+    
+    rollup = OrgWorkloadRollup(graph, issues)
+    print(f"📋 {len(issues)} open issues, {len(graph)} people in org")
+    print()
+    print(format_workload_report(rollup, sort_by=args.sort, top=args.top))
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rollup.managers(sort_by=args.sort), f, indent=2)
+        print()
+        print(f"💾 Rollup saved to: {args.json}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
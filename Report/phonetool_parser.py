@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared parser for Phonetool user pages.
+
+Used by org_hierarchy_reader.py and read_org_hierarchy.py. All patterns are
+compiled once at import. Each page is lowercased once and scanned with
+case-sensitive patterns, which lets the regex engine skip ahead on each
+pattern's literal prefix instead of trying every position the way an
+IGNORECASE pattern must. Captured values are sliced from the original text,
+so their case is preserved.
+
+Direct reports are only read from the "Direct Reports" section: its start
+and end are located once, and user links are matched inside those bounds
+rather than with a DOTALL scan that can run over the whole page.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+# Bump when parse() output changes so cached parses are redone
+PARSER_VERSION = 2
+
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile a lowercase pattern for lowered text, plus an IGNORECASE fallback."""
+    return re.compile(pattern, flags), re.compile(pattern, flags | re.IGNORECASE)
+
+
+# Field patterns in priority order; the first one that matches wins
+_NAME_PATTERNS = [
+    _compile(r'<title>([^<]+?)\s*-\s*phonetool'),
+    _compile(r'<h1[^>]*>([^<]+)</h1>'),
+    _compile(r'"name"\s*:\s*"([^"]+)"'),
+]
+_TITLE_PATTERNS = [
+    _compile(r'title["\s:]+([^<"\n]+)'),
+    _compile(r'"jobtitle"\s*:\s*"([^"]+)"'),
+    _compile(r'<span[^>]*class="[^"]*title[^"]*"[^>]*>([^<]+)</span>'),
+]
+_LEVEL_PATTERN = _compile(r'(?:level|l)[\s:]+(\d+|[ivx]+)')
+_MANAGER_PATTERNS = [
+    _compile(r'manager["\s:]+<a[^>]+href="/users/([^"]+)"'),
+    _compile(r'"manager"\s*:\s*"([^"]+)"'),
+]
+_TOTAL_PATTERN = _compile(r'(\d+)\s+(?:total\s+)?(?:direct\s+)?reports?')
+
+# Direct reports section: starts at its heading, ends at the next heading or section
+_SECTION_HEADINGS = ("direct report", "reports to", "team member")
+_SECTION_START = _compile(r'direct reports?|reports to|team members?')
+_SECTION_END = _compile(r'<h\d|<div class="section"')
+_USER_LINK = _compile(r'/users/([a-z0-9]+)')
+
+
+class PhonetoolParser:
+    """Precompiled, section-bounded parser for Phonetool user pages."""
+    
+    def _scan(self, content: str):
+        """Text to scan and which pattern variant to use for it."""
+        lowered = content.lower()
+        # Lowercasing can change the length of some non-ASCII text; offsets
+        # into the lowered copy are then invalid, so scan case-insensitively
+        if len(lowered) == len(content):
+            return lowered, 0
+        return content, 1
+    
+    @staticmethod
+    def _first(patterns, content: str, text: str, variant: int) -> Optional[str]:
+        for pair in patterns:
+            match = pair[variant].search(text)
+            if match:
+                return content[match.start(1):match.end(1)].strip()
+        return None
+    
+    def section_bounds(self, text: str, variant: int = 0) -> Optional[tuple]:
+        """(start, end) of the direct reports section in scanned text, or None."""
+        if variant == 0:
+            # The headings share no literal prefix, so str.find beats one
+            # alternation regex by a wide margin
+            found = [(text.find(heading), heading) for heading in _SECTION_HEADINGS]
+            found = [(pos, heading) for pos, heading in found if pos >= 0]
+            if not found:
+                return None
+            pos, heading = min(found)
+            start = pos + len(heading)
+            if heading != "reports to" and text.startswith("s", start):
+                start += 1
+        else:
+            match = _SECTION_START[variant].search(text)
+            if not match:
+                return None
+            start = match.end()
+        
+        end = _SECTION_END[variant].search(text, start)
+        return start, end.start() if end else len(text)
+    
+    @staticmethod
+    def _total_reports(text: str, variant: int) -> Optional[int]:
+        """First "<n> [total] [direct] report(s)" count on the page."""
+        if variant == 1:
+            match = _TOTAL_PATTERN[variant].search(text)
+            return int(match.group(1)) if match else None
+        
+        # Scanning for the digits visits every number on the page; instead,
+        # find each "report" and read the count backwards from it
+        pos = text.find("report")
+        while pos >= 0:
+            i = pos
+            for word in ("direct", "total"):
+                j = i
+                while j > 0 and text[j - 1].isspace():
+                    j -= 1
+                if j < i and text.endswith(word, 0, j):
+                    i = j - len(word)
+            
+            j = i
+            while j > 0 and text[j - 1].isspace():
+                j -= 1
+            k = j
+            while k > 0 and text[k - 1].isdecimal():
+                k -= 1
+            if j < i and k < j:
+                return int(text[k:j])
+            
+            pos = text.find("report", pos + 1)
+        return None
+    
+    def _section_reports(self, content: str, text: str, variant: int) -> Optional[List[str]]:
+        bounds = self.section_bounds(text, variant)
+        if bounds is None:
+            return None
+        links = _USER_LINK[variant].finditer(text, *bounds)
+        # Deduplicate, keeping page order
+        return list(dict.fromkeys(content[m.start(1):m.end(1)] for m in links))
+    
+    def direct_reports(self, content: str) -> Optional[List[str]]:
+        """
+        Usernames linked from the direct reports section, in page order.
+        
+        Returns:
+            List of usernames, or None if the page has no such section
+        """
+        text, variant = self._scan(content)
+        return self._section_reports(content, text, variant)
+    
+    def user_links(self, content: str) -> List[str]:
+        """Every /users/ link on the page, deduplicated in page order."""
+        text, variant = self._scan(content)
+        links = _USER_LINK[variant].finditer(text)
+        return list(dict.fromkeys(content[m.start(1):m.end(1)] for m in links))
+    
+    def parse(self, content: str, username: str) -> Dict:
+        """Extract user information from phonetool HTML content."""
+        text, variant = self._scan(content)
+        
+        info = {
+            "username": username,
+            "name": self._first(_NAME_PATTERNS, content, text, variant) or "",
+            "title": self._first(_TITLE_PATTERNS, content, text, variant) or "",
+            "level": self._first([_LEVEL_PATTERN], content, text, variant) or "",
+            "manager": self._first(_MANAGER_PATTERNS, content, text, variant) or "",
+            "building": "",
+            "direct_reports": self._section_reports(content, text, variant) or [],
+            "total_reports": 0
+        }
+        
+        total = self._total_reports(text, variant)
+        info["total_reports"] = total if total is not None else len(info["direct_reports"])
+        
+        return info
+
+
+default_parser = PhonetoolParser()
@@ -5,9 +5,10 @@ Recursively traverses reporting lines starting from a given user.
 """
 
 import json
-import re
 from typing import Dict, List, Set, Optional
 
+from phonetool_parser import default_parser
+
 
 def get_user_info(username: str) -> Optional[str]:
     """Fetch user information from Phonetool - returns raw content."""
@@ -19,55 +20,27 @@ def get_user_info(username: str) -> Optional[str]:
 
 def extract_direct_reports(content: str) -> List[str]:
     """Extract list of direct report usernames from phonetool content."""
-    direct_reports = []
-    
-    # Look for patterns like /users/username or phonetool links
-    # Common patterns in phonetool HTML:
-    # - <a href="/users/username">
-    # - phonetool.amazon.com/users/username
-    
-    patterns = [
-        r'/users/([a-z0-9]+)',
-        r'phonetool\.amazon\.com/users/([a-z0-9]+)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        direct_reports.extend(matches)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_reports = []
-    for report in direct_reports:
-        if report not in seen:
-            seen.add(report)
-            unique_reports.append(report)
+    # Prefer links in the Direct Reports section; fall back to every
+    # /users/ link (including phonetool.amazon.com/users/...) on the page
+    direct_reports = default_parser.direct_reports(content)
+    if direct_reports is None:
+        direct_reports = default_parser.user_links(content)
     
-    return unique_reports
+    return direct_reports
 
 
 def extract_user_details(content: str, username: str) -> Dict:
     """Extract user details from phonetool content."""
-    details = {
+    info = default_parser.parse(content, username)
+    
+    return {
         "username": username,
-        "name": None,
-        "title": None,
-        "manager": None,
-        "level": None,
-        "building": None,
+        "name": info["name"] or None,
+        "title": info["title"] or None,
+        "manager": info["manager"] or None,
+        "level": info["level"] or None,
+        "building": info["building"] or None,
     }
-    
-    # Try to extract name (usually in title or h1)
-    name_match = re.search(r'<h1[^>]*>([^<]+)</h1>', content)
-    if name_match:
-        details["name"] = name_match.group(1).strip()
-    
-    # Try to extract title
-    title_match = re.search(r'(?:title|position)["\s:]+([^<"\n]+)', content, re.IGNORECASE)
-    if title_match:
-        details["title"] = title_match.group(1).strip()
-    
-    return details
 
 
 def print_org_tree(node: Dict, indent: int = 0):
@@ -0,0 +1,4 @@
+"""Make the Report modules importable by bare name, as the scripts do."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
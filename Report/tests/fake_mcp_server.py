@@ -0,0 +1,58 @@
+"""
+Minimal stdio MCP server for the StdioMCPClient tests.
+
+Each request is handled on its own thread, so a tools/call with a "delay"
+argument answers after later requests do. Arguments understood by
+tools/call: delay (seconds to sleep), fail (answer with isError) and
+exit (terminate without answering).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+_out_lock = threading.Lock()
+
+
+def send(message):
+    with _out_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def handle(message):
+    method, request_id = message["method"], message["id"]
+    params = message.get("params") or {}
+    if method == "initialize":
+        # Real servers sometimes log to stdout before answering
+        print("fake server starting", flush=True)
+        send({"jsonrpc": "2.0", "id": request_id,
+              "result": {"protocolVersion": params.get("protocolVersion"),
+                         "serverInfo": {"name": "fake"}}})
+    elif method == "tools/list":
+        if params.get("cursor"):
+            send({"jsonrpc": "2.0", "id": request_id, "result": {"tools": [{"name": "b"}]}})
+        else:
+            send({"jsonrpc": "2.0", "id": request_id,
+                  "result": {"tools": [{"name": "a"}], "nextCursor": "page-2"}})
+    elif method == "tools/call":
+        arguments = params["arguments"]
+        if arguments.get("exit"):
+            os._exit(0)
+        time.sleep(arguments.get("delay", 0))
+        if arguments.get("fail"):
+            result = {"isError": True, "content": [{"type": "text", "text": "bad jql"}]}
+        else:
+            result = {"content": [{"type": "text", "text": json.dumps({"echo": arguments})}]}
+        send({"jsonrpc": "2.0", "id": request_id, "result": result})
+    else:
+        send({"jsonrpc": "2.0", "id": request_id,
+              "error": {"code": -32601, "message": f"Unknown method {method}"}})
+
+
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" in message:
+        threading.Thread(target=handle, args=(message,), daemon=True).start()
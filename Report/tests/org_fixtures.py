@@ -0,0 +1,68 @@
+"""Synthetic Phonetool orgs for the org crawler tests."""
+
+import contextlib
+import io
+from typing import Dict, List
+
+from org_hierarchy_reader import OrgHierarchyReader
+
+
+def chain_org(depth: int, fanout: int = 2) -> Dict[str, List[str]]:
+    """Direct reports of every user in a complete tree rooted at "u0"."""
+    reports: Dict[str, List[str]] = {}
+    level = ["u0"]
+    count = 1
+    for _ in range(depth - 1):
+        next_level = []
+        for user in level:
+            reports[user] = [f"u{count + i}" for i in range(fanout)]
+            next_level.extend(reports[user])
+            count += fanout
+        level = next_level
+    for user in level:
+        reports[user] = []
+    return reports
+
+
+def page(user: str, reports: List[str]) -> str:
+    links = "".join(f'<li><a href="/users/{report}">{report}</a></li>' for report in reports)
+    return (f"<html><head><title>Person {user} - PhoneTool</title></head><body>"
+            f"<div>Job Title: Engineer</div><div>Level: 6</div>"
+            f"<div>{len(reports)} direct reports</div>"
+            f"<div>Direct Reports<ul>{links}</ul></div><div class=\"section\">footer</div></body></html>")
+
+
+class FakeReader(OrgHierarchyReader):
+    """Reader that serves pages from a dict of direct reports and counts fetches."""
+    
+    def __init__(self, reports: Dict[str, List[str]], **kwargs):
+        super().__init__(**kwargs)
+        self.reports = reports
+        self.fetched: List[str] = []
+    
+    def fetch_user_page(self, username: str) -> str:
+        self.fetched.append(username)
+        if username not in self.reports:
+            return ""
+        return page(username, self.reports[username])
+
+
+def quietly(fn, *args, **kwargs):
+    """Call fn with the crawler's progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def shape(tree: Dict) -> Dict:
+    """Usernames, depths and nesting of a tree, ignoring fetched data."""
+    return {"username": tree["username"], "depth": tree["depth"],
+            "reports": [shape(report) for report in tree["direct_reports_tree"]]}
+
+
+def nodes(tree: Dict) -> List[Dict]:
+    found, stack = [], [tree]
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        stack.extend(node["direct_reports_tree"])
+    return found
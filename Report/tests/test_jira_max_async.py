@@ -0,0 +1,69 @@
+"""Tests for the awaitable Jira Max operations over the asyncio MCP client."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from jira_max_async import AsyncJiraMax
+from mcp_async import AsyncMCPClient
+
+FAKE_SERVER = str(Path(__file__).resolve().parent / "fake_mcp_server.py")
+
+
+class SlowJiraMax:
+    """JiraMaxMVP stand-in whose analyses are blocking MCP calls."""
+    
+    def __init__(self, mcp):
+        self.mcp = mcp
+    
+    def _search(self, **arguments):
+        return self.mcp.call_tool("jira_search_issues", {**arguments, "delay": 0.4})["echo"]
+    
+    def team_workload(self, project):
+        return self._search(report="workload", project=project)
+    
+    def features_vs_bugs(self, project, days=30):
+        return self._search(report="quality", project=project, days=days)
+    
+    def search_issues(self, query, project, max_results=10):
+        if query == "bad":
+            raise ValueError("bad query")
+        return self._search(report="search", query=query, max_results=max_results)
+
+
+def with_jira_max(body):
+    """Run body(jira_max) on a fresh event loop and server process."""
+    async def main():
+        async with await AsyncMCPClient.start(sys.executable, [FAKE_SERVER], request_timeout=10) as client:
+            return await body(AsyncJiraMax(client, SlowJiraMax))
+    return asyncio.run(main())
+
+
+def test_sections_overlap_on_one_server():
+    async def full_report(jira_max):
+        return await asyncio.gather(
+            jira_max.team_workload("RCIT"),
+            jira_max.features_vs_bugs("RCIT", days=60),
+            jira_max.search_issues("status = Releasable", "RCIT", max_results=5),
+            jira_max.search_issues('status = "In Progress"', "RCIT"),
+        )
+    
+    started = time.monotonic()
+    workload, quality, releasable, in_progress = with_jira_max(full_report)
+    
+    # Four 0.4s calls finish together rather than one after another
+    assert time.monotonic() - started < 1.2
+    assert workload["report"] == "workload"
+    assert quality["days"] == 60
+    assert releasable["max_results"] == 5
+    assert in_progress["max_results"] == 10
+
+
+def test_errors_reach_the_awaiting_coroutine():
+    async def search(jira_max):
+        return await jira_max.search_issues("bad", "RCIT")
+    with pytest.raises(ValueError, match="bad query"):
+        with_jira_max(search)
@@ -0,0 +1,101 @@
+"""Tests for the asyncio-native MCP client, against a real server process."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from mcp_async import AsyncMCPClient
+from mcp_stdio import MCPError
+
+FAKE_SERVER = str(Path(__file__).resolve().parent / "fake_mcp_server.py")
+
+
+def with_client(body):
+    """Run body(client) on a fresh event loop and server process."""
+    async def main():
+        async with await AsyncMCPClient.start(sys.executable, [FAKE_SERVER], request_timeout=10) as client:
+            return await body(client)
+    return asyncio.run(main())
+
+
+def test_handshake_and_list_tools():
+    async def body(client):
+        assert client.server_info["serverInfo"] == {"name": "fake"}
+        assert [tool["name"] for tool in await client.list_tools()] == ["a", "b"]
+    with_client(body)
+
+
+def test_responses_resolve_out_of_order():
+    async def body(client):
+        finished = []
+        
+        async def call(n, delay):
+            result = await client.call_tool("search", {"n": n, "delay": delay})
+            finished.append(result["echo"]["n"])
+        
+        await asyncio.gather(call(1, 0.4), call(2, 0))
+        assert finished == [2, 1]
+        assert client.in_flight == 0
+    with_client(body)
+
+
+def test_concurrent_calls_overlap_on_one_process():
+    async def body(client):
+        started = time.monotonic()
+        results = await asyncio.gather(*(client.call_tool("search", {"n": n, "delay": 0.3})
+                                         for n in range(8)))
+        assert time.monotonic() - started < 1.5
+        assert [result["echo"]["n"] for result in results] == list(range(8))
+    with_client(body)
+
+
+def test_long_response_lines_are_read():
+    async def body(client):
+        text = "x" * 200_000
+        assert (await client.call_tool("search", {"text": text}))["echo"]["text"] == text
+    with_client(body)
+
+
+def test_timed_out_and_cancelled_requests_are_dropped():
+    async def body(client):
+        with pytest.raises(TimeoutError):
+            await client.call_tool("search", {"n": 1, "delay": 0.4}, timeout=0.05)
+        
+        task = asyncio.ensure_future(client.call_tool("search", {"n": 2, "delay": 0.4}))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert client.in_flight == 0
+        
+        await asyncio.sleep(0.6)  # the late responses arrive and must be dropped quietly
+        assert not client.closed
+        assert (await client.call_tool("search", {"n": 3}))["echo"]["n"] == 3
+    with_client(body)
+
+
+def test_errors():
+    async def body(client):
+        with pytest.raises(MCPError, match="bad jql"):
+            await client.call_tool("search", {"fail": True})
+        with pytest.raises(MCPError) as raised:
+            await client.request("no/such/method")
+        assert raised.value.code == -32601
+    with_client(body)
+
+
+def test_server_exit_fails_pending_requests():
+    async def body(client):
+        pending = asyncio.ensure_future(client.call_tool("search", {"delay": 5}))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ConnectionError):
+            await client.call_tool("search", {"exit": True})
+        with pytest.raises(ConnectionError):
+            await pending
+        assert client.closed
+        with pytest.raises(ConnectionError):
+            await client.call_tool("search", {"n": 1})
+    with_client(body)
@@ -0,0 +1,167 @@
+"""Tests for the shared MCP session pool."""
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+import mcp_session_pool
+from mcp_session_pool import MCPSessionPool, default_client_factory, get_shared_pool
+
+
+class FakeClient:
+    """MCP client stand-in that counts calls and can be made to die."""
+    
+    created = 0
+    
+    def __init__(self):
+        FakeClient.created += 1
+        self.id = FakeClient.created
+        self.alive = True
+        self.closed = False
+        self.pings = 0
+    
+    def list_tools(self):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("server exited")
+        return [{"name": "jira_search_issues"}]
+    
+    def call_tool(self, tool, params):
+        if not self.alive:
+            raise ConnectionError("server exited")
+        return {"session": self.id, "tool": tool, "params": params}
+    
+    def close(self):
+        self.closed = True
+
+
+def pool(**kwargs):
+    kwargs.setdefault("keepalive", False)
+    return MCPSessionPool("fake", factory=FakeClient, **kwargs)
+
+
+def test_sessions_are_warmed_and_reused():
+    sessions = pool(size=2)
+    assert sessions.stats["created"] == 2
+    
+    for _ in range(5):
+        assert sessions.call_tool("jira_search_issues", {"jql": "project = RCIT"})["tool"] == "jira_search_issues"
+    assert sessions.stats["created"] == 2
+    assert sessions.stats["reused"] == 5
+
+
+def test_dead_idle_session_is_replaced_before_reuse():
+    sessions = pool(size=1, health_check_interval=0.01)
+    with sessions.session() as client:
+        first = client
+    first.alive = False
+    time.sleep(0.02)
+    
+    with sessions.session() as client:
+        assert client is not first and client.alive
+    assert first.closed
+    assert sessions.stats["replaced"] == 1
+
+
+def test_session_broken_by_a_call_is_not_returned():
+    sessions = pool(size=1)
+    with pytest.raises(ConnectionError):
+        with sessions.session() as client:
+            client.alive = False
+            client.call_tool("jira_search_issues", {})
+    
+    assert client.closed
+    assert sessions.call_tool("jira_search_issues", {})["session"] != client.id
+
+
+def test_tool_error_keeps_a_healthy_session():
+    sessions = pool(size=1)
+    with pytest.raises(ValueError):
+        with sessions.session() as client:
+            raise ValueError("bad JQL")
+    
+    with sessions.session() as again:
+        assert again is client
+
+
+def test_acquire_times_out_when_every_session_is_borrowed():
+    sessions = pool(size=1)
+    held = sessions.acquire()
+    with pytest.raises(TimeoutError):
+        sessions.acquire(timeout=0.05)
+    
+    released = threading.Timer(0.05, sessions.release, args=(held,))
+    released.start()
+    assert sessions.acquire(timeout=2) is held
+
+
+def test_shared_pool_is_one_per_server(monkeypatch):
+    monkeypatch.setattr(mcp_session_pool, "_shared_pools", {})
+    first = get_shared_pool("fake", size=1, factory=FakeClient)
+    assert get_shared_pool("fake", size=4) is first
+    
+    first.close()
+    assert get_shared_pool("fake", size=1, factory=FakeClient) is not first
+
+
+def test_default_factory_imports_the_client_as_the_agents_do(monkeypatch):
+    module = types.ModuleType("src.services.mcp_client")
+    module.MCPClient = lambda server: ("client", server)
+    monkeypatch.setitem(sys.modules, "src.services.mcp_client", module)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    
+    assert default_client_factory("rbks-mcp-servers")() == ("client", "rbks-mcp-servers")
+    assert "services.mcp_client" not in sys.modules
+
+
+def test_multiplexed_pool_lends_one_session_to_concurrent_callers():
+    sessions = pool(size=2, multiplexed=True)
+    first = sessions.acquire(timeout=0)
+    second = sessions.acquire(timeout=0)
+    third = sessions.acquire(timeout=0)
+    
+    # Least busy first, then shared rather than blocking
+    assert first is not second
+    assert third in (first, second)
+    assert sorted(s.borrowers for s in (first, second)) == [1, 2]
+    assert sessions.stats["created"] == 2
+    
+    for session in (first, second, third):
+        sessions.release(session)
+    assert [s.borrowers for s in sessions._idle] == [0, 0]
+
+
+def test_multiplexed_session_broken_under_several_borrowers_is_replaced_once():
+    sessions = pool(size=1, multiplexed=True)
+    first = sessions.acquire()
+    second = sessions.acquire()
+    assert first is second
+    
+    first.client.alive = False
+    sessions.release(first, broken=True)
+    sessions.release(second, broken=True)
+    
+    assert first.client.closed
+    assert sessions.stats["replaced"] == 1
+    assert sessions._open == 0
+    assert sessions.call_tool("jira_search_issues", {})["session"] != first.client.id
+
+
+def test_multiplexed_pool_health_checks_only_unborrowed_stale_sessions():
+    sessions = pool(size=1, multiplexed=True, health_check_interval=0.01)
+    held = sessions.acquire()
+    time.sleep(0.02)
+    
+    # Still borrowed, so shared as is
+    assert sessions.acquire() is held
+    assert held.client.pings == 0
+    sessions.release(held)
+    sessions.release(held)
+    
+    held.client.alive = False
+    with sessions.session() as client:
+        assert client is not held.client and client.alive
+    assert held.client.closed
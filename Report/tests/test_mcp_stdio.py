@@ -0,0 +1,98 @@
+"""Tests for the multiplexed stdio MCP client, against a real server process."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mcp_stdio import MCPError, StdioMCPClient
+
+FAKE_SERVER = str(Path(__file__).resolve().parent / "fake_mcp_server.py")
+
+
+@pytest.fixture
+def client():
+    client = StdioMCPClient(sys.executable, [FAKE_SERVER], request_timeout=10)
+    yield client
+    client.close()
+
+
+def test_handshake_skips_non_json_output(client):
+    assert client.server_info["serverInfo"] == {"name": "fake"}
+
+
+def test_list_tools_follows_cursor(client):
+    assert [tool["name"] for tool in client.list_tools()] == ["a", "b"]
+
+
+def test_responses_resolve_out_of_order(client):
+    finished = []
+    slow = client.call_tool_async("search", {"n": 1, "delay": 0.5})
+    fast = client.call_tool_async("search", {"n": 2})
+    slow.add_done_callback(lambda _: finished.append("slow"))
+    fast.add_done_callback(lambda _: finished.append("fast"))
+    
+    assert client.wait(fast)["echo"]["n"] == 2
+    assert client.wait(slow)["echo"]["n"] == 1
+    assert finished == ["fast", "slow"]
+    assert client.in_flight == 0
+
+
+def test_concurrent_calls_overlap_on_one_process(client):
+    results = {}
+    
+    def call(n):
+        results[n] = client.call_tool("search", {"n": n, "delay": 0.3})
+    
+    started = time.monotonic()
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert time.monotonic() - started < 1.5
+    assert {n: result["echo"]["n"] for n, result in results.items()} == {n: n for n in range(8)}
+
+
+def test_timed_out_request_is_cancelled_and_late_reply_ignored(client):
+    with pytest.raises(TimeoutError):
+        client.call_tool("search", {"n": 1, "delay": 0.4}, timeout=0.05)
+    assert client.in_flight == 0
+    
+    time.sleep(0.6)  # the late response arrives and must be dropped quietly
+    assert client._reader.is_alive()
+    assert client.call_tool("search", {"n": 2})["echo"]["n"] == 2
+
+
+def test_cancel_racing_the_response_keeps_reader_alive(client):
+    # The caller cancels after the reader has looked the future up but before
+    # it sets the result; leaving the future in the pending map reproduces that
+    future = client.request_async("tools/call", {"name": "search",
+                                                 "arguments": {"n": 1, "delay": 0.2}})
+    future.cancel()
+    time.sleep(0.4)
+    
+    assert client._reader.is_alive()
+    assert client.in_flight == 0
+    assert client.call_tool("search", {"n": 2})["echo"]["n"] == 2
+
+
+def test_errors(client):
+    with pytest.raises(MCPError, match="bad jql"):
+        client.call_tool("search", {"fail": True})
+    with pytest.raises(MCPError) as raised:
+        client.request("no/such/method")
+    assert raised.value.code == -32601
+
+
+def test_server_exit_fails_pending_requests(client):
+    pending = client.call_tool_async("search", {"delay": 5})
+    client.call_tool_async("search", {"exit": True})
+    
+    with pytest.raises(ConnectionError):
+        pending.result(5)
+    with pytest.raises(ConnectionError):
+        client.call_tool("search", {"n": 1})
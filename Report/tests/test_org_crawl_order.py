@@ -0,0 +1,104 @@
+"""Tests that the concurrent crawl places shared reports deterministically."""
+
+import random
+import time
+
+from org_fetch_scheduler import FetchScheduler
+from org_fixtures import FakeReader, quietly, shape
+
+
+class DelayedReader(FakeReader):
+    """Reader whose page fetches take per-user times, so they finish out of order."""
+    
+    def __init__(self, reports, delays, **kwargs):
+        super().__init__(reports, **kwargs)
+        self.delays = delays
+    
+    def fetch_user_page(self, username):
+        time.sleep(self.delays.get(username, 0.0))
+        return super().fetch_user_page(username)
+
+
+def scheduler():
+    return FetchScheduler(max_retries=0, requeue_limit=0, max_concurrency=8, initial_concurrency=8)
+
+
+def sequential_shape(reports, username, depth, max_depth, visited):
+    """The tree a recursive depth-first crawl builds."""
+    if depth >= max_depth or username in visited:
+        return None
+    visited.add(username)
+    if username not in reports:
+        return None
+    children = [sequential_shape(reports, report, depth + 1, max_depth, visited)
+                for report in reports[username]]
+    return {"username": username, "depth": depth,
+            "reports": [child for child in children if child]}
+
+
+def test_shared_report_stays_under_first_manager_when_second_finishes_first():
+    reports = {"u0": ["a", "b"], "a": ["s"], "b": ["s"], "s": []}
+    reader = DelayedReader(reports, {"a": 0.05}, scheduler=scheduler())
+    tree = quietly(reader.build_hierarchy, "u0")
+    
+    a, b = tree["direct_reports_tree"]
+    assert [node["username"] for node in a["direct_reports_tree"]] == ["s"]
+    assert b["direct_reports_tree"] == []
+    assert reader.fetched.count("s") == 1
+
+
+def test_shared_report_follows_depth_first_order_not_depth():
+    # A sequential crawl reaches s through a's subtree before it looks at b
+    reports = {"u0": ["a", "b"], "a": ["c"], "b": ["s"], "c": ["s"], "s": ["t"], "t": []}
+    reader = DelayedReader(reports, {"c": 0.05}, scheduler=scheduler())
+    tree = quietly(reader.build_hierarchy, "u0")
+    assert shape(tree) == sequential_shape(reports, "u0", 0, 10, set())
+
+
+def test_shared_report_reached_too_deep_first_keeps_its_depth_limit():
+    reports = {"u0": ["a", "b"], "a": ["c"], "b": ["s"], "c": ["s"], "s": ["t"], "t": []}
+    reader = DelayedReader(reports, {"a": 0.02, "c": 0.02}, scheduler=scheduler())
+    tree = quietly(reader.build_hierarchy, "u0", max_depth=4)
+    # s is placed under c at depth 3, so t is beyond the limit
+    assert shape(tree) == sequential_shape(reports, "u0", 0, 4, set())
+
+
+def test_shuffled_completion_order_matches_sequential_crawl():
+    rng = random.Random(34)
+    for _ in range(5):
+        users = [f"u{i}" for i in range(30)]
+        # Mostly downward links, with a few shared reports and cycles
+        reports = {user: rng.sample(users, rng.randint(0, 3)) for user in users}
+        delays = {user: rng.uniform(0, 0.004) for user in users}
+        max_depth = rng.randint(3, 8)
+        
+        tree = quietly(DelayedReader(reports, delays, scheduler=scheduler()).build_hierarchy,
+                       "u0", max_depth=max_depth)
+        assert shape(tree) == sequential_shape(reports, "u0", 0, max_depth, set())
+
+
+def test_forest_attaches_shared_report_under_first_root():
+    reports = {"r1": ["a"], "r2": ["s"], "a": ["s"], "s": []}
+    reader = DelayedReader(reports, {"a": 0.05}, scheduler=scheduler())
+    forest = quietly(reader.build_forest, ["r1", "r2"])
+    
+    r1, r2 = forest["roots"]
+    assert [node["username"] for node in r1["direct_reports_tree"][0]["direct_reports_tree"]] == ["s"]
+    assert r2["direct_reports_tree"] == []
+    assert forest["cross_references"] == [
+        {"username": "s", "manager": "r2", "root": "r2", "owner_root": "r1"}
+    ]
+
+
+def test_root_listed_in_another_roots_org_stays_a_root():
+    reports = {"r1": ["a", "r2"], "r2": ["x"], "a": [], "x": []}
+    reader = DelayedReader(reports, {"r1": 0.05}, scheduler=scheduler())
+    forest = quietly(reader.build_forest, ["r1", "r2"])
+    
+    assert [shape(tree) for tree in forest["roots"]] == [
+        {"username": "r1", "depth": 0, "reports": [{"username": "a", "depth": 1, "reports": []}]},
+        {"username": "r2", "depth": 0, "reports": [{"username": "x", "depth": 1, "reports": []}]},
+    ]
+    assert forest["cross_references"] == [
+        {"username": "r2", "manager": "r1", "root": "r1", "owner_root": "r2"}
+    ]
@@ -0,0 +1,60 @@
+"""Tests for diffing org snapshots."""
+
+from org_diff import diff_orgs, format_org_diff
+from org_graph import CompactOrgGraph
+
+
+def person(username, title="Engineer", level=6, reports=()):
+    return {"username": username, "name": username.title(), "title": title, "level": level,
+            "direct_reports_tree": list(reports)}
+
+
+def snapshots():
+    old = CompactOrgGraph.from_tree(person("ana", "Director", 8, [
+        person("bo", "Manager", 7, [person("cy"), person("di")]),
+        person("ed", "Manager", 7, [person("fay"), person("gus")]),
+    ]))
+    new = CompactOrgGraph.from_tree(person("ana", "Director", 8, [
+        person("bo", "Manager", 7, [person("cy", "Senior Engineer", 7), person("gus")]),
+        person("ed", "Manager", 7, [person("fay"), person("hal")]),
+    ]))
+    return old, new
+
+
+def test_moves_joins_departures_and_field_changes():
+    diff = diff_orgs(*snapshots())
+    
+    assert [(c.kind, c.username, c.before, c.after) for c in diff.changes] == [
+        ("title_changed", "cy", "Engineer", "Senior Engineer"),
+        ("level_changed", "cy", "6", "7"),
+        ("manager_changed", "gus", "ed", "bo"),
+        ("joined", "hal", None, "ed"),
+        ("left", "di", "bo", None),
+    ]
+
+
+def test_summary_counts_and_churn():
+    summary = diff_orgs(*snapshots()).summary()
+    
+    assert summary["headcount_before"] == summary["headcount_after"] == 7
+    assert summary["net_change"] == 0
+    assert (summary["joined"], summary["left"], summary["manager_changed"]) == (1, 1, 1)
+    assert summary["churn_rate"] == round(2 / 7, 4)
+    assert summary["most_churn_by_manager"] == {"ed": 2, "bo": 2}
+
+
+def test_identical_snapshots_have_no_changes():
+    old, _ = snapshots()
+    diff = diff_orgs(old, CompactOrgGraph.from_tree(old.to_tree()))
+    
+    assert diff.changes == []
+    assert "Joined: 0  Left: 0" in format_org_diff(diff)
+
+
+def test_report_lists_each_kind():
+    report = format_org_diff(diff_orgs(*snapshots()))
+    
+    assert "Headcount: 7 → 7 (+0)" in report
+    assert "• Gus (@gus) @ed → @bo" in report
+    assert "• Hal (@hal) under @ed" in report
+    assert "• Di (@di) from @bo" in report
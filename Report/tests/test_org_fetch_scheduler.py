@@ -0,0 +1,189 @@
+"""Tests for the rate-limited, adaptive fetch scheduler."""
+
+import threading
+import types
+
+import pytest
+
+import org_fetch_scheduler
+from org_fetch_scheduler import AdaptiveConcurrency, FetchScheduler, PriorityWorkQueue, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when someone sleeps or advances it."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+    
+    def monotonic(self):
+        with self._lock:
+            return self.now
+    
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+    
+    advance = sleep
+
+
+class Throttled(Exception):
+    """HTTP 429 from the upstream."""
+
+
+class FakeFetcher:
+    """Fails each item a set number of times, then returns it upper-cased."""
+    
+    def __init__(self, failures=None, latency=0.0, clock=None):
+        self.failures = dict(failures or {})
+        self.latency = latency
+        self.clock = clock
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def __call__(self, item):
+        with self._lock:
+            self.calls.append(item)
+            failing = self.failures.get(item, 0) > 0
+            if failing:
+                self.failures[item] -= 1
+        if self.clock and self.latency:
+            self.clock.advance(self.latency)
+        if failing:
+            raise Throttled(f"429 for {item}")
+        return item.upper()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(org_fetch_scheduler, "time",
+                        types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    return clock
+
+
+def drain(scheduler, fetcher, items, **kwargs):
+    queue = PriorityWorkQueue()
+    for priority, item in enumerate(items):
+        queue.push(item, -priority)
+    return list(scheduler.imap_prioritized(lambda item: scheduler.throttled(fetcher, item),
+                                           queue, **kwargs))
+
+
+def test_token_bucket_paces_requests_after_the_burst(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+    for _ in range(6):
+        bucket.acquire()
+    
+    # Two from the burst, then one every half second
+    assert clock.now == pytest.approx(2.0)
+    assert all(wait == pytest.approx(0.5) for wait in clock.sleeps)
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1.0, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    clock.advance(10)
+    for _ in range(3):
+        bucket.acquire()
+    
+    assert clock.sleeps == [10]
+
+
+def test_unlimited_bucket_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    for _ in range(100):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+
+def test_backoff_is_full_jitter_up_to_a_capped_ceiling(monkeypatch):
+    scheduler = FetchScheduler(base_delay=0.5, max_delay=3.0)
+    bounds = []
+    monkeypatch.setattr(org_fetch_scheduler.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+    
+    for attempt in range(5):
+        scheduler.backoff(attempt)
+    assert bounds == [(0, 0.5), (0, 1.0), (0, 2.0), (0, 3.0), (0, 3.0)]
+
+
+def test_concurrency_halves_on_429_down_to_the_minimum(clock):
+    scheduler = FetchScheduler(max_concurrency=8, initial_concurrency=8)
+    fetcher = FakeFetcher({"a": 5})
+    
+    limits = []
+    for _ in range(5):
+        with pytest.raises(Throttled):
+            scheduler.throttled(fetcher, "a")
+        limits.append(scheduler.concurrency.limit)
+    assert limits == [4, 2, 1, 1, 1]
+
+
+def test_concurrency_grows_on_fast_responses_and_backs_off_on_slow_ones(clock):
+    limiter = AdaptiveConcurrency(initial=2, maximum=4, latency_tolerance=2.0)
+    for _ in range(20):
+        limiter.on_success(0.1)
+    assert limiter.limit == 4
+    
+    limiter.on_success(1.0)
+    assert limiter.limit == pytest.approx(3.6)
+
+
+def test_failed_pages_are_requeued_behind_the_rest(clock):
+    scheduler = FetchScheduler(max_concurrency=1, initial_concurrency=1, max_retries=1, requeue_limit=2)
+    fetcher = FakeFetcher({"a": 3})
+    requeued = []
+    
+    results = drain(scheduler, fetcher, ["a", "b", "c"], on_requeue=lambda item, e: requeued.append(item))
+    
+    # Two attempts per round: a fails its first round, is requeued and then succeeds
+    assert [(item, value, error) for item, value, error in results] == [
+        ("b", "B", None), ("c", "C", None), ("a", "A", None)
+    ]
+    assert fetcher.calls == ["a", "a", "b", "c", "a", "a"]
+    assert requeued == ["a"]
+    assert scheduler.stats == {"calls": 6, "retries": 2, "requeued": 1, "failed": 0}
+    assert len(clock.sleeps) == 2
+
+
+def test_retries_stop_at_the_limit(clock):
+    scheduler = FetchScheduler(max_concurrency=2, max_retries=2, requeue_limit=1)
+    fetcher = FakeFetcher({"a": 100})
+    
+    results = drain(scheduler, fetcher, ["a", "b"])
+    
+    failed = [(item, error) for item, _, error in results if error is not None]
+    assert [item for item, _ in failed] == ["a"]
+    assert isinstance(failed[0][1], Throttled)
+    # (max_retries + 1) attempts in each of (requeue_limit + 1) rounds
+    assert fetcher.calls.count("a") == 6
+    assert scheduler.stats["failed"] == 1
+    assert scheduler.stats["requeued"] == 1
+
+
+def test_map_keeps_input_order_and_reports_failures(clock):
+    scheduler = FetchScheduler(max_concurrency=4, max_retries=0, requeue_limit=0)
+    fetcher = FakeFetcher({"b": 1})
+    
+    outcomes = scheduler.map(lambda item: scheduler.throttled(fetcher, item), ["a", "b", "c"])
+    
+    assert [value for value, _ in outcomes] == ["A", None, "C"]
+    assert isinstance(outcomes[1][1], Throttled)
+
+
+def test_prioritized_queue_serves_biggest_first_and_takes_new_work(clock):
+    scheduler = FetchScheduler(max_concurrency=1, initial_concurrency=1)
+    fetcher = FakeFetcher()
+    queue = PriorityWorkQueue()
+    queue.push("small", 1)
+    queue.push("big", 10)
+    
+    seen = []
+    for item, value, _ in scheduler.imap_prioritized(lambda item: scheduler.throttled(fetcher, item), queue):
+        seen.append(item)
+        if item == "big":
+            queue.push("medium", 5)
+    assert seen == ["big", "medium", "small"]
@@ -0,0 +1,73 @@
+"""Tests for crawling several overlapping org roots in one pass."""
+
+from org_fixtures import FakeReader, quietly, shape
+
+
+REPORTS = {
+    "r1": ["a", "b"],
+    "a": ["x"],
+    "b": ["s"],
+    "r2": ["s", "c"],
+    "s": ["t"],
+    "c": ["r3"],
+    "r3": ["d"],
+    "x": [], "t": [], "d": [],
+}
+
+
+def usernames(tree):
+    found = [tree["username"]]
+    for report in tree["direct_reports_tree"]:
+        found.extend(usernames(report))
+    return found
+
+
+def test_overlapping_orgs_are_fetched_once():
+    reader = FakeReader(REPORTS)
+    forest = quietly(reader.build_forest, ["r1", "r2", "r3"], max_workers=4)
+    
+    assert sorted(reader.fetched) == sorted(REPORTS)
+    assert [usernames(tree) for tree in forest["roots"]] == [
+        ["r1", "a", "x", "b", "s", "t"],
+        ["r2", "c"],
+        ["r3", "d"],
+    ]
+
+
+def test_shared_people_become_cross_references():
+    forest = quietly(FakeReader(REPORTS).build_forest, ["r1", "r2", "r3"])
+    
+    assert forest["cross_references"] == [
+        {"username": "s", "manager": "r2", "root": "r2", "owner_root": "r1"},
+        {"username": "r3", "manager": "c", "root": "r2", "owner_root": "r3"},
+    ]
+
+
+def test_root_order_decides_ownership_and_duplicates_are_ignored():
+    forest = quietly(FakeReader(REPORTS).build_forest, ["r2", "r1", "r2"])
+    
+    assert [usernames(tree) for tree in forest["roots"]] == [
+        ["r2", "s", "t", "c", "r3", "d"],
+        ["r1", "a", "x", "b"],
+    ]
+    assert forest["cross_references"] == [
+        {"username": "s", "manager": "b", "root": "r1", "owner_root": "r2"}
+    ]
+
+
+def test_depth_limit_applies_below_each_root():
+    forest = quietly(FakeReader(REPORTS).build_forest, ["r1", "r3"], max_depth=2)
+    
+    assert [shape(tree) for tree in forest["roots"]] == [
+        {"username": "r1", "depth": 0, "reports": [
+            {"username": "a", "depth": 1, "reports": []},
+            {"username": "b", "depth": 1, "reports": []},
+        ]},
+        {"username": "r3", "depth": 0, "reports": [{"username": "d", "depth": 1, "reports": []}]},
+    ]
+
+
+def test_missing_root_is_skipped():
+    forest = quietly(FakeReader(REPORTS).build_forest, ["nobody", "r3"])
+    
+    assert [tree["username"] for tree in forest["roots"]] == ["r3"]
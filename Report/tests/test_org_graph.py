@@ -0,0 +1,117 @@
+"""Tests for the array-backed org graph."""
+
+import pytest
+
+from org_graph import CompactOrgGraph
+from org_fixtures import FakeReader, chain_org, quietly
+
+
+def person(username, name, title="Engineer", level=6, reports=()):
+    return {"username": username, "name": name, "title": title, "level": level,
+            "direct_reports_tree": list(reports)}
+
+
+def sample_graph():
+    return CompactOrgGraph.from_tree(person("ana", "Ana Núñez", "Director", 8, [
+        person("bo", "Bo", reports=[person("cy", "Cy 陈"), person("di", "Di")]),
+        person("ed", "Ed", "Manager", 7),
+    ]))
+
+
+def test_queries_by_username():
+    graph = sample_graph()
+    
+    assert graph.usernames[:] == ["ana", "bo", "cy", "di", "ed"]
+    assert graph.subtree_size("ana") == 5
+    assert graph.everyone_under("bo") == ["cy", "di"]
+    assert graph.direct_reports("ana") == ["bo", "ed"]
+    assert graph.chain_of_command("di") == ["bo", "ana"]
+    assert graph.is_ancestor("bo", "cy") and not graph.is_ancestor("ed", "cy")
+    assert "ed" in graph and "zed" not in graph
+    assert graph.find_id("zed") is None
+    with pytest.raises(KeyError):
+        graph.id_of("zed")
+
+
+def test_strings_round_trip():
+    graph = sample_graph()
+    
+    assert graph.names[graph.id_of("ana")] == "Ana Núñez"
+    assert graph.names[-3] == "Cy 陈"
+    assert list(graph.titles) == ["Director", "Engineer", "Engineer", "Engineer", "Manager"]
+    assert graph.titles.values == ["Director", "Engineer", "Manager"]
+    assert graph.levels[graph.id_of("ed")] == "7"
+    assert graph.to_tree("bo")["direct_reports_tree"][0]["name"] == "Cy 陈"
+
+
+def test_repeated_username_resolves_to_first_occurrence():
+    graph = CompactOrgGraph.from_tree({"roots": [
+        person("ana", "Ana", reports=[person("bo", "Bo")]),
+        person("bo", "Bo again"),
+    ]})
+    
+    assert len(graph) == 3
+    assert graph.id_of("bo") == 1
+
+
+def test_from_records_matches_from_tree():
+    records = [
+        {"username": "ana", "parent": None, "name": "Ana", "title": "Director"},
+        {"username": "ed", "parent": "ana", "name": "Ed"},
+        {"username": "cy", "parent": "ed", "name": "Cy"},
+    ]
+    graph = CompactOrgGraph.from_records(records)
+    
+    assert graph.usernames[:] == ["ana", "ed", "cy"]
+    assert graph.depth("cy") == 2
+    assert graph.titles[0] == "Director" and graph.titles[1] == ""
+
+
+def test_footprint_per_person():
+    reports = chain_org(12)
+    tree = quietly(FakeReader(reports).build_hierarchy, "u0", max_depth=20)
+    graph = CompactOrgGraph.from_tree(tree)
+    
+    assert len(graph) == len(reports)
+    assert all(graph.find_id(username) == graph.usernames[:].index(username)
+               for username in ("u0", "u17", "u4000"))
+    assert graph.nbytes() / len(graph) < 80
+
+
+def test_from_records_in_any_order_matches_from_tree():
+    tree = quietly(FakeReader(chain_org(6, fanout=3)).build_hierarchy, "u0", max_depth=20)
+    expected = CompactOrgGraph.from_tree(tree)
+    
+    # Level order rather than pre-order
+    records, level = [], [(tree, None)]
+    while level:
+        records.extend({**node, "parent": parent} for node, parent in level)
+        level = [(report, node["username"]) for node, _ in level
+                 for report in node["direct_reports_tree"]]
+    graph = CompactOrgGraph.from_records(iter(records))
+    
+    assert graph.usernames[:] == expected.usernames[:]
+    assert list(graph.parent) == list(expected.parent)
+    assert list(graph.sizes) == list(expected.sizes)
+    assert list(graph.children) == list(expected.children)
+    assert graph.everyone_under("u2") == expected.everyone_under("u2")
+
+
+def test_from_records_skips_duplicates_and_cycles():
+    records = [
+        {"username": "di", "parent": "bo"},
+        {"username": "ana", "parent": None},
+        {"username": "bo", "parent": "ana", "name": "Bo"},
+        {"username": "bo", "parent": None, "name": "Bo again"},
+        {"username": "cy", "parent": "zed"},
+        {"username": "x", "parent": "y"},
+        {"username": "y", "parent": "x"},
+    ]
+    graph = CompactOrgGraph.from_records(iter(records))
+    
+    # Unknown parents make roots; a parent cycle never reaches a root
+    assert graph.usernames[:] == ["ana", "bo", "di", "cy"]
+    assert graph.chain_of_command("di") == ["bo", "ana"]
+    assert graph.names[1] == "Bo"
+    assert graph.manager("cy") is None
+    assert "x" not in graph
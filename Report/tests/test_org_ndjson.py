@@ -0,0 +1,55 @@
+"""Tests for streaming NDJSON org exports."""
+
+from org_fixtures import FakeReader, chain_org, quietly
+from org_graph import CompactOrgGraph
+from org_ndjson import OrgNDJSONWriter, iter_records, load_graph, write_tree
+
+
+def crawl(tmp_path):
+    path = str(tmp_path / "org.ndjson")
+    with OrgNDJSONWriter(path) as writer:
+        tree = quietly(FakeReader(chain_org(5, fanout=3)).build_hierarchy, "u0",
+                       max_depth=20, max_workers=4, on_node=writer)
+    return tree, path
+
+
+def test_streamed_crawl_loads_as_the_same_graph(tmp_path):
+    tree, path = crawl(tmp_path)
+    expected = CompactOrgGraph.from_tree(tree)
+    graph = CompactOrgGraph.load(path)
+    
+    assert len(graph) == len(expected)
+    assert graph.usernames[:] == expected.usernames[:]
+    assert list(graph.parent) == list(expected.parent)
+    assert list(graph.depths) == list(expected.depths)
+    assert graph.titles[:] == expected.titles[:]
+    assert graph.levels[:] == expected.levels[:]
+
+
+def test_records_are_flat_with_parent_pointers(tmp_path):
+    tree, path = crawl(tmp_path)
+    records = list(iter_records(path))
+    
+    assert records[0]["username"] == "u0" and records[0]["parent"] is None
+    assert records[1]["parent"] == "u0" and records[1]["depth"] == 1
+    assert all("direct_reports_tree" not in record for record in records)
+    assert [record["username"] for record in records] == CompactOrgGraph.from_tree(tree).usernames[:]
+
+
+def test_write_tree_round_trip(tmp_path):
+    tree, _ = crawl(tmp_path)
+    path = str(tmp_path / "saved.ndjson")
+    
+    assert write_tree(tree, path) == len(chain_org(5, fanout=3))
+    assert load_graph(path).to_tree()["direct_reports_tree"][1]["username"] == \
+        tree["direct_reports_tree"][1]["username"]
+
+
+def test_partial_last_line_is_skipped(tmp_path):
+    _, path = crawl(tmp_path)
+    count = len(list(iter_records(path)))
+    with open(path, "a") as f:
+        f.write('{"username": "half", "par')
+    
+    assert len(list(iter_records(path))) == count
+    assert "half" not in load_graph(path)
@@ -0,0 +1,77 @@
+"""Tests for the persistent Phonetool page cache."""
+
+from org_fixtures import FakeReader, page
+from org_page_cache import OrgPageCache
+
+
+class CountingReader(FakeReader):
+    """Reader that also counts page parses."""
+    
+    def __init__(self, reports, **kwargs):
+        super().__init__(reports, **kwargs)
+        self.parsed = 0
+    
+    def parse_user_info(self, content, username):
+        self.parsed += 1
+        return super().parse_user_info(content, username)
+
+
+def test_entries_round_trip(tmp_path):
+    cache = OrgPageCache(str(tmp_path))
+    entry = cache.put("ana", page("ana", ["bo"]), {"username": "ana"}, parser_version=2)
+    
+    assert cache.get("ana") == entry
+    assert OrgPageCache.raw_content(cache.get("ana")) == page("ana", ["bo"])
+    assert cache.get("zed") is None
+    cache.invalidate("ana")
+    assert cache.get("ana") is None
+
+
+def test_expiry(tmp_path):
+    cache = OrgPageCache(str(tmp_path), ttl=60)
+    entry = cache.put("ana", "<html></html>", {})
+    
+    assert cache.is_fresh(entry, now=entry["fetched_at"] + 59)
+    assert not cache.is_fresh(entry, now=entry["fetched_at"] + 61)
+
+
+def test_fresh_hit_skips_fetch_and_parse(tmp_path):
+    cache = OrgPageCache(str(tmp_path))
+    CountingReader({"ana": ["bo"]}, cache=cache).load_user("ana")
+    
+    reader = CountingReader({"ana": ["bo"]}, cache=cache)
+    info = reader.load_user("ana")
+    assert info["direct_reports"] == ["bo"]
+    assert reader.fetched == [] and reader.parsed == 0
+    assert cache.stats == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+def test_expired_unchanged_page_is_revalidated_without_parsing(tmp_path):
+    cache = OrgPageCache(str(tmp_path), ttl=0)
+    CountingReader({"ana": ["bo"]}, cache=cache).load_user("ana")
+    
+    reader = CountingReader({"ana": ["bo"]}, cache=cache)
+    reader.load_user("ana")
+    assert reader.fetched == ["ana"] and reader.parsed == 0
+    assert cache.stats["revalidated"] == 1
+
+
+def test_expired_changed_page_is_parsed_again(tmp_path):
+    cache = OrgPageCache(str(tmp_path), ttl=0)
+    CountingReader({"ana": ["bo"]}, cache=cache).load_user("ana")
+    
+    reader = CountingReader({"ana": ["bo", "cy"]}, cache=cache)
+    assert reader.load_user("ana")["direct_reports"] == ["bo", "cy"]
+    assert reader.parsed == 1
+    assert cache.stats["misses"] == 2
+    assert cache.get("ana")["parsed"]["direct_reports"] == ["bo", "cy"]
+
+
+def test_parses_from_an_older_parser_are_redone(tmp_path):
+    cache = OrgPageCache(str(tmp_path))
+    cache.put("ana", page("ana", ["bo"]), {"username": "ana", "direct_reports": []},
+              parser_version=CountingReader.PARSER_VERSION - 1)
+    
+    reader = CountingReader({"ana": ["bo"]}, cache=cache)
+    assert reader.load_user("ana")["direct_reports"] == ["bo"]
+    assert reader.parsed == 1
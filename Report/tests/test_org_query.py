@@ -0,0 +1,96 @@
+"""Tests for the org query index."""
+
+import pytest
+
+from org_graph import CompactOrgGraph
+from org_query import OrgQueryIndex
+
+
+def person(username, name, title="Engineer", level=6, reports=()):
+    return {"username": username, "name": name, "title": title, "level": level,
+            "direct_reports_tree": list(reports)}
+
+
+def sample_index():
+    return OrgQueryIndex(CompactOrgGraph.from_tree(person("ana", "Ana Núñez", "Director", 8, [
+        person("bo", "Bo Chen", "Senior Manager", 7, [
+            person("cy", "Cy Alvarez"),
+            person("di", "Di Chen", "Software Engineer", 5),
+        ]),
+        person("ed", "Ed Park", "Manager", 7, [person("fay", "Fay Alvarez", "Engineer", 5)]),
+    ])))
+
+
+def chain_index(depth):
+    """u0 -> u1 -> ... -> u<depth-1>, with a side branch s<i> under every user."""
+    node = None
+    for i in reversed(range(depth)):
+        reports = [person(f"s{i}", f"Side {i}")] + ([node] if node else [])
+        node = person(f"u{i}", f"User {i}", reports=reports)
+    return OrgQueryIndex(CompactOrgGraph.from_tree(node))
+
+
+@pytest.mark.parametrize("first, second, expected", [
+    ("cy", "di", "bo"),
+    ("cy", "fay", "ana"),
+    ("bo", "di", "bo"),
+    ("di", "di", "di"),
+    ("ana", "fay", "ana"),
+])
+def test_common_manager(first, second, expected):
+    assert sample_index().common_manager(first, second)["username"] == expected
+
+
+def test_common_manager_on_a_deep_chain():
+    index = chain_index(100)
+    
+    assert index.common_manager("s99", "s37")["username"] == "u37"
+    assert index.common_manager("u64", "s63")["username"] == "u63"
+    assert index.common_manager("s0", "u99")["username"] == "u0"
+
+
+def test_common_manager_across_a_forest_is_none():
+    index = OrgQueryIndex(CompactOrgGraph.from_tree({"roots": [
+        person("ana", "Ana", reports=[person("bo", "Bo")]),
+        person("cy", "Cy", reports=[person("di", "Di")]),
+    ]}))
+    
+    assert index.common_manager("bo", "di") is None
+    assert index.common_manager("bo", "ana")["username"] == "ana"
+
+
+def test_prefix_search_matches_usernames_and_any_name_part():
+    index = sample_index()
+    
+    assert [p["username"] for p in index.search_prefix("alv")] == ["cy", "fay"]
+    assert [p["username"] for p in index.search_prefix("Chen")] == ["bo", "di"]
+    assert [p["username"] for p in index.search_prefix("ana")] == ["ana"]
+    assert [p["username"] for p in index.search_prefix("chen", limit=1)] == ["bo"]
+    assert index.search_prefix("zz") == []
+
+
+def test_fuzzy_search_and_find():
+    index = sample_index()
+    
+    score, best = index.search_fuzzy("fay alvares")[0]
+    assert best["username"] == "fay" and score > 0.8
+    assert index.search_fuzzy("qqqq") == []
+    
+    assert index.find("ed") == "ed"
+    assert index.find("Park") == "ed"
+    assert index.find("chen") is None
+    assert index.find("Ed Parc") == "ed"
+
+
+def test_filter_chain_and_get():
+    index = sample_index()
+    
+    assert [p["username"] for p in index.filter(title="engineer")] == ["cy", "di", "fay"]
+    assert [p["username"] for p in index.filter(title="engineer", level=5)] == ["di", "fay"]
+    assert [p["username"] for p in index.filter(level="7", under="ana")] == ["bo", "ed"]
+    assert [p["username"] for p in index.filter(under="bo")] == ["cy", "di"]
+    
+    assert [p["username"] for p in index.chain_of_command("di")] == ["bo", "ana"]
+    assert index.get("di") == {"username": "di", "name": "Di Chen", "title": "Software Engineer",
+                               "level": "5", "manager": "bo", "depth": 2}
+    assert index.get("zed") is None
@@ -0,0 +1,88 @@
+"""Tests for incremental refresh of a saved org tree."""
+
+import json
+
+from org_fetch_scheduler import FetchScheduler
+from org_fixtures import FakeReader, chain_org, nodes, quietly, shape
+
+
+DAY = 24 * 60 * 60
+
+
+def crawl(reports, max_depth):
+    tree = quietly(FakeReader(reports).build_hierarchy, "u0", max_depth=max_depth)
+    return json.loads(json.dumps(tree))
+
+
+def age(tree, seconds, users=None):
+    for node in nodes(tree):
+        if users is None or node["username"] in users:
+            node["fetched_at"] -= seconds
+
+
+def test_only_expired_users_are_fetched():
+    reports = chain_org(6)
+    tree = crawl(reports, max_depth=10)
+    age(tree, 2 * DAY, users={"u1", "u4"})
+    
+    reader = FakeReader(reports)
+    refreshed = quietly(reader.refresh_hierarchy, tree, max_age=DAY)
+    
+    assert sorted(reader.fetched) == ["u1", "u4"]
+    assert shape(refreshed) == shape(tree)
+    assert reader.refresh_stats["refetched"] == 2
+    assert reader.refresh_stats["reused"] == len(nodes(tree)) - 2
+
+
+def test_expired_users_are_fetched_most_overdue_first():
+    reports = chain_org(4)
+    tree = crawl(reports, max_depth=10)
+    age(tree, 3 * DAY, users={"u3"})
+    age(tree, 5 * DAY, users={"u5"})
+    age(tree, 4 * DAY, users={"u1"})
+    
+    reader = FakeReader(reports, scheduler=FetchScheduler(max_concurrency=1, initial_concurrency=1))
+    quietly(reader.refresh_hierarchy, tree, max_age=DAY, jitter=0)
+    
+    assert reader.fetched == ["u5", "u1", "u3"]
+
+
+def test_new_and_removed_reports_follow_refetched_managers():
+    reports = chain_org(4)
+    tree = crawl(reports, max_depth=10)
+    
+    reports["u1"] = reports["u1"][:1] + ["n0"]
+    reports["n0"] = ["n1"]
+    reports["n1"] = []
+    age(tree, 2 * DAY, users={"u1"})
+    
+    reader = FakeReader(reports)
+    refreshed = quietly(reader.refresh_hierarchy, tree, max_age=DAY)
+    
+    assert sorted(reader.fetched) == ["n0", "n1", "u1"]
+    assert shape(refreshed) == shape(crawl(reports, max_depth=10))
+    assert reader.refresh_stats["new"] == 2
+    assert reader.refresh_stats["removed"] == 3
+
+
+def test_refresh_inherits_the_original_crawl_depth():
+    reports = chain_org(14)
+    deep = crawl(reports, max_depth=12)
+    shallow = crawl(reports, max_depth=5)
+    
+    for tree in (deep, shallow):
+        age(tree, 2 * DAY)
+        refreshed = quietly(FakeReader(reports).refresh_hierarchy, tree, max_age=DAY)
+        assert shape(refreshed) == shape(tree)
+
+
+def test_uncut_tree_refreshes_without_a_depth_limit():
+    reports = chain_org(4)
+    tree = crawl(reports, max_depth=10)
+    reports["u7"] = ["n0"]
+    reports["n0"] = ["n1"]
+    reports["n1"] = []
+    age(tree, 2 * DAY, users={"u7"})
+    
+    refreshed = quietly(FakeReader(reports).refresh_hierarchy, tree, max_age=DAY)
+    assert max(node["depth"] for node in nodes(refreshed)) == 5
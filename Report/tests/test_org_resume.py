@@ -0,0 +1,74 @@
+"""Tests for resuming a crashed crawl from its checkpoint."""
+
+import pytest
+
+from org_checkpoint import CrawlCheckpoint
+from org_fetch_scheduler import FetchScheduler
+from org_fixtures import FakeReader, chain_org, quietly, shape
+from org_ndjson import OrgNDJSONWriter, iter_records
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-crawl."""
+
+
+class CrashingReader(FakeReader):
+    def __init__(self, reports, crash_after, **kwargs):
+        super().__init__(reports, **kwargs)
+        self.crash_after = crash_after
+    
+    def fetch_user_page(self, username):
+        if len(self.fetched) >= self.crash_after:
+            raise Crash()
+        return super().fetch_user_page(username)
+
+
+def scheduler():
+    return FetchScheduler(max_retries=0, requeue_limit=0, max_concurrency=4, initial_concurrency=4)
+
+
+def crawl(reader, tmp_path, resume=False):
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint"))
+    with OrgNDJSONWriter(str(tmp_path / "org.ndjson")) as writer:
+        return quietly(reader.build_hierarchy, "u0", max_depth=20, on_node=writer,
+                       checkpoint=checkpoint, resume=resume, checkpoint_every=50)
+
+
+def test_resume_after_crash_rebuilds_tree_and_stream(tmp_path):
+    reports = chain_org(9)
+    expected = quietly(FakeReader(reports, scheduler=scheduler()).build_hierarchy, "u0", max_depth=20)
+    
+    with pytest.raises(Crash):
+        crawl(CrashingReader(reports, crash_after=175, scheduler=scheduler()), tmp_path)
+    crashed = [record["username"] for record in iter_records(str(tmp_path / "org.ndjson"))]
+    assert 0 < len(crashed) < len(reports)
+    
+    reader = FakeReader(reports, scheduler=scheduler())
+    tree = crawl(reader, tmp_path, resume=True)
+    assert shape(tree) == shape(expected)
+    # Users completed before the last checkpoint are not fetched again
+    assert len(reader.fetched) < len(reports) - 100
+    
+    records = list(iter_records(str(tmp_path / "org.ndjson")))
+    usernames = [record["username"] for record in records]
+    assert sorted(usernames) == sorted(reports)
+    
+    # Every manager's record comes before their reports'
+    seen = set()
+    for record in records:
+        assert record["parent"] is None or record["parent"] in seen
+        seen.add(record["username"])
+    
+    assert not (tmp_path / "checkpoint" / "state.json").exists()
+
+
+def test_torn_journal_line_is_discarded(tmp_path):
+    reports = chain_org(7)
+    with pytest.raises(Crash):
+        crawl(CrashingReader(reports, crash_after=60, scheduler=scheduler()), tmp_path)
+    with open(tmp_path / "checkpoint" / "nodes.ndjson", "a") as f:
+        f.write('{"user": "u1", "dep')
+    
+    tree = crawl(FakeReader(reports, scheduler=scheduler()), tmp_path, resume=True)
+    assert len(list(iter_records(str(tmp_path / "org.ndjson")))) == len(reports)
+    assert shape(tree)["username"] == "u0"
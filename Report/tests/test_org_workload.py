@@ -0,0 +1,126 @@
+"""Tests for rolling Jira workload up the org hierarchy."""
+
+import json
+from datetime import date
+
+from org_graph import CompactOrgGraph
+from org_workload import (OrgWorkloadRollup, assignee_keys, fetch_open_issues,
+                          format_workload_report)
+
+
+def person(username, name, reports=()):
+    return {"username": username, "name": name, "title": "", "level": "",
+            "direct_reports_tree": list(reports)}
+
+
+def sample_graph():
+    return CompactOrgGraph.from_tree(person("ana", "Ana Núñez", [
+        person("bo", "Bo Chen", [person("cy", "Cy Alvarez"), person("di", "Di Park")]),
+        person("ed", "Ed Park", [person("fay", "Fay Lin")]),
+    ]))
+
+
+def issue(assignee, issue_type="Task", due=None):
+    return {"fields": {"assignee": assignee, "issuetype": {"name": issue_type}, "duedate": due}}
+
+
+class FakeJira:
+    """jira_search_issues over a fixed issue list, honouring startAt/maxResults."""
+    
+    def __init__(self, issues, as_text=False):
+        self.issues = issues
+        self.as_text = as_text
+        self.calls = []
+    
+    def __call__(self, tool, params):
+        self.calls.append((tool, params))
+        start = params["startAt"]
+        result = {"issues": self.issues[start:start + params["maxResults"]], "total": len(self.issues)}
+        if self.as_text:
+            return json.dumps(result)
+        return result
+
+
+def test_fetch_open_issues_pages_through_results():
+    jira = FakeJira([{"key": f"P-{i}"} for i in range(250)])
+    issues = fetch_open_issues(jira, "project = P", page_size=100)
+    
+    assert [i["key"] for i in issues] == [f"P-{i}" for i in range(250)]
+    assert [params["startAt"] for _, params in jira.calls] == [0, 100, 200]
+    tool, params = jira.calls[0]
+    assert tool == "jira_search_issues"
+    assert params["jql"] == "(project = P) AND assignee is not EMPTY AND statusCategory != Done"
+    assert params["fields"] == ["assignee", "issuetype", "duedate", "status"]
+
+
+def test_fetch_open_issues_stops_at_max_and_parses_text_results():
+    jira = FakeJira([{"key": f"P-{i}"} for i in range(250)], as_text=True)
+    issues = fetch_open_issues(jira, "project = P", page_size=40, max_issues=90)
+    
+    assert len(issues) == 90
+    assert len(jira.calls) == 3
+
+
+def test_fetch_open_issues_without_a_total_pages_until_a_short_page():
+    issues = [{"key": f"P-{i}"} for i in range(5)]
+    calls = []
+    
+    def call_tool(tool, params):
+        calls.append(params["startAt"])
+        return issues[params["startAt"]:params["startAt"] + params["maxResults"]]
+    
+    assert fetch_open_issues(call_tool, "project = P", page_size=2) == issues
+    assert calls == [0, 2, 4]
+
+
+def test_assignee_keys_in_match_order():
+    assert assignee_keys(issue({"name": "cy", "key": "JIRAUSER1", "emailAddress": "cyal@example.com",
+                                "displayName": "Cy Alvarez"})) == ["cy", "JIRAUSER1", "cyal", "Cy Alvarez"]
+    assert assignee_keys({"assignee": "di"}) == ["di"]
+    assert assignee_keys(issue(None)) == []
+
+
+def test_assignees_fall_back_to_email_login_and_display_name():
+    issues = [
+        issue({"name": "cy"}),
+        issue({"key": "JIRAUSER9", "emailAddress": "di@example.com"}),
+        issue({"accountId": "abc", "displayName": "fay lin"}),
+        issue({"name": "zed", "displayName": "Zed Outsider"}),
+        issue(None),
+    ]
+    rollup = OrgWorkloadRollup(sample_graph(), issues, today=date(2026, 3, 1))
+    
+    assert rollup.person("cy")["active"] == 1
+    assert rollup.person("di")["active"] == 1
+    assert rollup.person("fay")["active"] == 1
+    assert rollup.unmatched == {"zed": {"active": 1, "bugs": 0, "overdue": 0}}
+
+
+def test_org_totals_and_manager_rows():
+    issues = [
+        issue({"name": "cy"}, "Bug", "2026-02-01"),
+        issue({"name": "cy"}),
+        issue({"name": "di"}, "Bug"),
+        issue({"name": "bo"}, due="2026-03-05"),
+        issue({"name": "fay"}, due="2026-02-28T17:00:00.000+0000"),
+    ]
+    rollup = OrgWorkloadRollup(sample_graph(), issues, today=date(2026, 3, 1))
+    
+    assert rollup.person("bo") == {"active": 1, "bugs": 0, "overdue": 0}
+    assert rollup.org("bo") == {"active": 4, "bugs": 2, "overdue": 1}
+    assert rollup.org("ana") == {"active": 5, "bugs": 2, "overdue": 2}
+    assert rollup.org("cy") == rollup.person("cy")
+    
+    assert rollup.managers() == [
+        {"username": "ana", "name": "Ana Núñez", "depth": 0, "headcount": 6,
+         "active": 5, "bugs": 2, "overdue": 2, "active_per_person": 0.83},
+        {"username": "bo", "name": "Bo Chen", "depth": 1, "headcount": 3,
+         "active": 4, "bugs": 2, "overdue": 1, "active_per_person": 1.33},
+        {"username": "ed", "name": "Ed Park", "depth": 1, "headcount": 2,
+         "active": 1, "bugs": 0, "overdue": 1, "active_per_person": 0.5},
+    ]
+    assert [row["username"] for row in rollup.managers(sort_by="overdue", top=2)] == ["ana", "bo"]
+    
+    report = format_workload_report(rollup)
+    assert "Bo Chen (@bo)" in report
+    assert "outside this org" not in report
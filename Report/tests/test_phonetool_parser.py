@@ -0,0 +1,43 @@
+"""Tests that the shared Phonetool parser matches the legacy regexes."""
+
+import random
+
+import pytest
+
+from bench_phonetool_parser import comparable, legacy_parse, synthetic_page
+from phonetool_parser import default_parser
+
+
+@pytest.mark.parametrize("filler", [0, 10, 300])
+def test_matches_legacy_parse_on_synthetic_pages(filler):
+    rng = random.Random(filler)
+    for i in range(20):
+        content = synthetic_page(f"user{i}", rng.randint(0, 15), filler, rng)
+        assert comparable(default_parser.parse(content, f"user{i}")) == \
+            comparable(legacy_parse(content, f"user{i}"))
+
+
+@pytest.mark.parametrize("content", [
+    # JSON-style fields and no reports section
+    '<script>{"name": "Ana Núñez", "jobTitle": "Director", "manager": "bo"}</script> Level: VII',
+    # Mixed-case markup, "Reports to" heading, total count
+    '<TITLE>Ana - PHONETOOL</TITLE><H1>ana</H1> 42 total reports '
+    'REPORTS TO <A HREF="/USERS/Bo">Bo</A><h2>Other</h2><a href="/users/cy">cy</a>',
+    # Lowercasing "İ" changes the text length, forcing the case-insensitive path
+    '<title>İlkay Kaya - PhoneTool</title><span class="job-title">Lead</span>'
+    '<div>Team Members<a href="/users/dee">d</a><a href="/users/eve">e</a><a href="/users/dee">d</a>'
+    '<div class="section">3 direct reports</div>',
+    "",
+])
+def test_matches_legacy_parse_on_edge_cases(content):
+    assert comparable(default_parser.parse(content, "ana")) == comparable(legacy_parse(content, "ana"))
+
+
+def test_direct_reports_keep_page_order_and_stay_in_section():
+    content = ('<a href="/users/mgr">manager</a><h2>Direct Reports</h2>'
+               '<a href="/users/zed">z</a><a href="/users/amy">a</a><a href="/users/zed">z</a>'
+               '<h2>Peers</h2><a href="/users/pat">p</a>')
+    
+    assert default_parser.direct_reports(content) == ["zed", "amy"]
+    assert default_parser.user_links(content) == ["mgr", "zed", "amy", "pat"]
+    assert default_parser.direct_reports("<p>no section</p>") is None
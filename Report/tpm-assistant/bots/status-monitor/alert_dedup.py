@@ -0,0 +1,236 @@
+"""
+Alert Deduplication - Suppresses repeated and flapping status change alerts
+
+Status pages that flip between Yellow and Red, or street dates that are
+edited back and forth, produce a fresh StatusChange on every poll. The
+deduplicator keys each change on (project, field, old, new), drops repeats
+inside a per-severity suppression window and collapses rapid back-and-forth
+transitions into a single "flapping" alert. Only reversals count towards
+flapping: a field that returns to a value it held within the flap window
+(Yellow -> Red -> Yellow). A run of forward changes is never flapping.
+
+All windows are measured in change time, not wall-clock time, so replayed
+or backfilled changes are deduplicated the same way as live ones.
+"""
+
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+from status_monitor import StatusChange
+
+
+# Default suppression windows per severity (seconds)
+DEFAULT_SUPPRESSION_WINDOWS = {
+    "critical": 60 * 60,        # 1 hour
+    "warning": 6 * 60 * 60,     # 6 hours
+    "info": 24 * 60 * 60,       # 1 day
+}
+
+AlertKey = Tuple[str, str, str, str]
+
+
+class AlertDeduplicator:
+    """Filters StatusChange streams so each alert is only emitted once per window"""
+    
+    def __init__(
+        self,
+        suppression_windows: Optional[Dict[str, int]] = None,
+        flap_window: int = 6 * 60 * 60,
+        flap_threshold: int = 3,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval: int = 300
+    ):
+        """
+        Args:
+            suppression_windows: Seconds to suppress a repeated alert, per severity
+            flap_window: Seconds over which field reversals are counted
+            flap_threshold: Reversals within flap_window that mark a field as flapping
+            snapshot_path: Optional JSON file used to persist state across restarts
+            snapshot_interval: Minimum seconds between automatic snapshots
+        """
+        self.suppression_windows = dict(DEFAULT_SUPPRESSION_WINDOWS)
+        if suppression_windows:
+            self.suppression_windows.update(suppression_windows)
+        self.flap_window = flap_window
+        self.flap_threshold = flap_threshold
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        
+        # (project, field, old, new) -> [last_emitted_ts, suppressed_count]
+        self._last_emitted: Dict[AlertKey, List[float]] = {}
+        # (project, field) -> recent transitions as [ts, old, new, is_reversal]
+        self._transitions: Dict[Tuple[str, str], deque] = {}
+        # (project, field) -> timestamp of last flapping alert
+        self._flap_alerted: Dict[Tuple[str, str], float] = {}
+        # Latest change timestamp seen; the clock for pruning
+        self._latest_ts: Optional[float] = None
+        self._last_snapshot = time.monotonic()
+        
+        if self.snapshot_path and self.snapshot_path.exists():
+            self.load()
+    
+    @staticmethod
+    def make_key(change: StatusChange) -> AlertKey:
+        """Build the deduplication key for a change"""
+        return (
+            change.project_name,
+            change.field,
+            str(change.old_value),
+            str(change.new_value)
+        )
+    
+    def _window_for(self, severity: str) -> int:
+        return self.suppression_windows.get(severity, self.suppression_windows["info"])
+    
+    def _record_transition(self, change: StatusChange, ts: float) -> int:
+        """Record a transition and return how many reversals fall inside the flap window"""
+        history = self._transitions.setdefault((change.project_name, change.field), deque())
+        cutoff = ts - self.flap_window
+        while history and history[0][0] < cutoff:
+            history.popleft()
+        
+        # A reversal returns the field to a value it held earlier in the window
+        new_value = str(change.new_value)
+        reversal = any(old == new_value for _, old, _, _ in history)
+        history.append([ts, str(change.old_value), new_value, reversal])
+        return sum(1 for entry in history if entry[3])
+    
+    def is_flapping(self, project: str, field: str) -> bool:
+        """Check whether a project field is currently flapping"""
+        history = self._transitions.get((project, field)) or ()
+        return sum(1 for entry in history if entry[3]) >= self.flap_threshold
+    
+    def filter(self, changes: List[StatusChange]) -> List[StatusChange]:
+        """
+        Filter a batch of changes down to the alerts that should be emitted
+        
+        Returns:
+            Changes outside their suppression window, plus one summary change
+            per field that has started flapping
+        """
+        emitted = []
+        
+        for change in changes:
+            ts = change.timestamp.timestamp()
+            if self._latest_ts is None or ts > self._latest_ts:
+                self._latest_ts = ts
+            project_field = (change.project_name, change.field)
+            reversals = self._record_transition(change, ts)
+            
+            if reversals >= self.flap_threshold:
+                last_flap = self._flap_alerted.get(project_field)
+                if last_flap is None or ts - last_flap >= self.flap_window:
+                    self._flap_alerted[project_field] = ts
+                    emitted.append(StatusChange(
+                        project_name=change.project_name,
+                        timestamp=change.timestamp,
+                        field=change.field,
+                        old_value=change.old_value,
+                        new_value=change.new_value,
+                        severity="warning",
+                        flapping=reversals
+                    ))
+                self._suppress(change, ts)
+                continue
+            
+            key = self.make_key(change)
+            entry = self._last_emitted.get(key)
+            if entry is not None and ts - entry[0] < self._window_for(change.severity):
+                entry[1] += 1
+                continue
+            
+            self._last_emitted[key] = [ts, 0]
+            emitted.append(change)
+        
+        self._maybe_snapshot()
+        return emitted
+    
+    def _suppress(self, change: StatusChange, ts: float):
+        """Count a change as suppressed without resetting its window"""
+        key = self.make_key(change)
+        entry = self._last_emitted.get(key)
+        if entry is None:
+            self._last_emitted[key] = [ts, 1]
+        else:
+            entry[1] += 1
+    
+    def suppressed_count(self, change: StatusChange) -> int:
+        """Number of times this alert has been suppressed since it was last emitted"""
+        entry = self._last_emitted.get(self.make_key(change))
+        return entry[1] if entry else 0
+    
+    def prune(self, now: Optional[float] = None):
+        """
+        Drop state that has aged out of every window
+        
+        Args:
+            now: Reference time (default: the latest change timestamp seen)
+        """
+        if now is None:
+            now = self._latest_ts
+        if now is None:
+            return
+        horizon = max(max(self.suppression_windows.values()), self.flap_window)
+        cutoff = now - horizon
+        
+        self._last_emitted = {
+            key: entry for key, entry in self._last_emitted.items()
+            if entry[0] >= cutoff
+        }
+        for project_field in list(self._transitions):
+            history = self._transitions[project_field]
+            while history and history[0][0] < now - self.flap_window:
+                history.popleft()
+            if not history:
+                del self._transitions[project_field]
+        self._flap_alerted = {
+            key: ts for key, ts in self._flap_alerted.items()
+            if ts >= now - self.flap_window
+        }
+    
+    def _maybe_snapshot(self):
+        if not self.snapshot_path:
+            return
+        if time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+    
+    def snapshot(self):
+        """Write state to snapshot_path atomically"""
+        if not self.snapshot_path:
+            return
+        
+        self.prune()
+        data = {
+            "emitted": [list(key) + entry for key, entry in self._last_emitted.items()],
+            "transitions": [list(key) + [list(history)] for key, history in self._transitions.items()],
+            "flap_alerted": [list(key) + [ts] for key, ts in self._flap_alerted.items()],
+            "latest_ts": self._latest_ts,
+        }
+        
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(self.snapshot_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.snapshot_path)
+        self._last_snapshot = time.monotonic()
+    
+    def load(self):
+        """Restore state from snapshot_path"""
+        with open(self.snapshot_path, 'r') as f:
+            data = json.load(f)
+        
+        self._last_emitted = {
+            tuple(row[:4]): [row[4], row[5]] for row in data.get("emitted", [])
+        }
+        self._transitions = {
+            tuple(row[:2]): deque(entry for entry in row[2] if isinstance(entry, list))
+            for row in data.get("transitions", [])
+        }
+        self._flap_alerted = {
+            tuple(row[:2]): row[2] for row in data.get("flap_alerted", [])
+        }
+        self._latest_ts = data.get("latest_ts")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+History Backfill - Imports every historical version of a Confluence status page
+
+New projects start with empty history. This tool pulls each version of the
+status page through the MCP client, parses the versions in parallel with
+StatusParser and loads them into StatusStorage using the real version
+timestamps, so trend analysis works from day one.
+
+Backfills are rate-limited and resumable: completed version numbers are
+recorded in <storage-path>/.backfill/<page_id>.json after every batch.
+
+Usage:
+    python backfill.py --page-id 2814198025 --project-name Flan
+    python backfill.py --page-id 2814198025 --local-versions ./fixtures/flan
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from status_monitor import ProjectStatus, StatusParser, StatusStorage
+
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+    
+    def wait(self):
+        # Fetches run one at a time on the caller's thread, so no lock
+        now = time.monotonic()
+        delay = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class LocalVersionStore:
+    """
+    Stand-in for the MCP server that serves page versions from disk
+    
+    Layout:
+        <root>/<page_id>/versions.json   [{"number": 1, "when": "2025-06-01T09:00:00"}, ...]
+        <root>/<page_id>/<number>.md     Markdown body of each version
+    """
+    
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.calls = []
+    
+    def call_tool(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        self.calls.append((tool_name, params))
+        page_dir = self.root / str(params["pageId"])
+        
+        if tool_name == VersionBackfiller.VERSIONS_TOOL:
+            with open(page_dir / "versions.json", 'r') as f:
+                return {"results": json.load(f)}
+        
+        if tool_name == VersionBackfiller.PAGE_TOOL:
+            with open(page_dir / f"{params['version']}.md", 'r') as f:
+                return f.read()
+        
+        raise ValueError(f"Unknown tool: {tool_name}")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a Confluence ISO timestamp into a naive local datetime"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+# Parser for this worker process, built once with the configured metric rules
+_worker_parser: Optional[StatusParser] = None
+
+
+def _init_worker(metric_rules_path: Optional[str]):
+    global _worker_parser
+    _worker_parser = StatusParser(metric_rules_path)
+
+
+def _parse_version(args: tuple) -> ProjectStatus:
+    """Parse one page version (runs in a worker process)"""
+    content, page_id, project_name, timestamp = args
+    status = _worker_parser.parse(content, page_id, project_name)
+    status.timestamp = timestamp
+    return status
+
+
+class VersionBackfiller:
+    """Backfills StatusStorage from a Confluence page's version history"""
+    
+    # RBKS does not document a version-history tool; override per server
+    VERSIONS_TOOL = "confluence_get_page_versions"
+    PAGE_TOOL = "confluence_get_page"
+    
+    def __init__(
+        self,
+        client,
+        storage: StatusStorage,
+        rate_limit: float = 2.0,
+        max_workers: int = 4,
+        batch_size: int = 20,
+        versions_tool: str = None,
+        page_tool: str = None,
+        metric_rules_path: str = None
+    ):
+        """
+        Args:
+            client: MCP client exposing call_tool(tool_name, params)
+            storage: StatusStorage to load snapshots into
+            rate_limit: Maximum MCP calls per second
+            max_workers: Parser worker processes
+            batch_size: Versions fetched, parsed and saved per checkpoint
+            metric_rules_path: Metric rule config, as used by the live monitor
+                (default: metric_rules.json)
+        """
+        self.client = client
+        self.storage = storage
+        self.limiter = RateLimiter(rate_limit)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.versions_tool = versions_tool or self.VERSIONS_TOOL
+        self.page_tool = page_tool or self.PAGE_TOOL
+        self.metric_rules_path = metric_rules_path
+        self.state_dir = storage.storage_path / ".backfill"
+    
+    def _call(self, tool_name: str, params: Dict[str, Any]) -> Any:
+        self.limiter.wait()
+        return self.client.call_tool(tool_name, params)
+    
+    def list_versions(self, page_id: str) -> List[Dict[str, Any]]:
+        """List page versions as [{"number": int, "when": datetime}], oldest first"""
+        result = self._call(self.versions_tool, {"pageId": page_id})
+        items = result.get("results", []) if isinstance(result, dict) else result
+        
+        versions = []
+        for item in items or []:
+            number = item.get("number") or item.get("version", {}).get("number")
+            when = item.get("when") or item.get("createdAt") or item.get("version", {}).get("when")
+            if number is None or not when:
+                continue
+            versions.append({"number": int(number), "when": _parse_timestamp(when)})
+        
+        return sorted(versions, key=lambda v: v["number"])
+    
+    def fetch_version(self, page_id: str, number: int) -> str:
+        """Fetch the markdown body of one page version"""
+        result = self._call(self.page_tool, {
+            "pageId": page_id,
+            "version": number,
+            "format": "markdown"
+        })
+        if isinstance(result, dict):
+            return result.get("content") or result.get("body") or ""
+        return result or ""
+    
+    def _state_path(self, page_id: str) -> Path:
+        return self.state_dir / f"{page_id}.json"
+    
+    def _load_done(self, page_id: str) -> set:
+        path = self._state_path(page_id)
+        if not path.exists():
+            return set()
+        with open(path, 'r') as f:
+            return set(json.load(f).get("done", []))
+    
+    def _save_done(self, page_id: str, done: set):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self._state_path(page_id)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"page_id": page_id, "done": sorted(done)}, f)
+        os.replace(tmp_path, path)
+    
+    def backfill(self, page_id: str, project_name: Optional[str] = None) -> int:
+        """
+        Import every version of a page not already in storage
+        
+        Args:
+            page_id: Confluence page ID
+            project_name: Project name; taken from the newest version if omitted
+        
+        Returns:
+            Number of snapshots written
+        """
+        versions = self.list_versions(page_id)
+        if not versions:
+            print(f"⚠️  No versions found for page {page_id}")
+            return 0
+        
+        # Content fetched ahead of its batch, by version number
+        fetched = {}
+        if not project_name:
+            newest = versions[-1]["number"]
+            fetched[newest] = self.fetch_version(page_id, newest)
+            project_name = StatusParser.parse_project_name(fetched[newest])
+        
+        done = self._load_done(page_id)
+        pending = [
+            v for v in versions
+            if v["number"] not in done and not self.storage.has_snapshot(project_name, v["when"])
+        ]
+        print(f"📚 {project_name}: {len(versions)} versions, {len(pending)} to import")
+        
+        written = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.metric_rules_path,)) as pool:
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                jobs = [
+                    (fetched.pop(v["number"]) if v["number"] in fetched
+                     else self.fetch_version(page_id, v["number"]),
+                     page_id, project_name, v["when"])
+                    for v in batch
+                ]
+                
+                statuses = list(pool.map(_parse_version, jobs))
+                self.storage.save_many(statuses)
+                
+                done.update(v["number"] for v in batch)
+                self._save_done(page_id, done)
+                written += len(statuses)
+                print(f"  ✓ Imported versions {batch[0]['number']}-{batch[-1]['number']} ({written}/{len(pending)})")
+        
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill status history from Confluence page versions"
+    )
+    parser.add_argument("--page-id", required=True, help="Confluence page ID")
+    parser.add_argument("--project-name", help="Project name (default: from the newest version)")
+    parser.add_argument("--storage-path", default="./data/history", help="History storage path")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="Maximum MCP calls per second")
+    parser.add_argument("--workers", type=int, default=4, help="Parser worker processes")
+    parser.add_argument("--versions-tool", help=f"MCP tool listing page versions (default: {VersionBackfiller.VERSIONS_TOOL})")
+    parser.add_argument("--metric-rules", help="Metric rule config, as passed to cli.py (default: metric_rules.json)")
+    parser.add_argument("--local-versions", metavar="DIR", help="Serve versions from a local directory instead of MCP")
+    args = parser.parse_args()
+    
+    if args.local_versions:
+        client = LocalVersionStore(args.local_versions)
+    else:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'tpm-slack-bot'))
+        from src.services.mcp_client import MCPClient
+        client = MCPClient("rbks-mcp-servers")
+    
+    backfiller = VersionBackfiller(
+        client,
+        StatusStorage(args.storage_path),
+        rate_limit=args.rate_limit,
+        max_workers=args.workers,
+        versions_tool=args.versions_tool,
+        metric_rules_path=args.metric_rules
+    )
+    
+    try:
+        written = backfiller.backfill(args.page_id, args.project_name)
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        print("   Re-run the same command to resume from the last completed batch.")
+        return 1
+    
+    print(f"\n✅ Backfilled {written} snapshot(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,91 @@ This provides a command-line interface to test the bot with RBKS MCP.
 
 import argparse
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from status_monitor import StatusMonitor
+from alert_dedup import AlertDeduplicator
+
+
+def rbks_client():
+    """RBKS MCP client from tpm-slack-bot"""
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'tpm-slack-bot'))
+    from src.services.mcp_client import MCPClient
+    return MCPClient("rbks-mcp-servers")
+
+
+def shared_rbks_client():
+    """Warm RBKS MCP session for long-running loops, replaced if the server dies"""
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from mcp_session_pool import get_shared_pool
+    return get_shared_pool("rbks-mcp-servers", size=1, factory=rbks_client)
+
+
+def build_deduplicator(args) -> AlertDeduplicator:
+    """Alert deduplicator for --suppress-alerts, or None"""
+    if not args.suppress_alerts:
+        return None
+    
+    windows = None
+    if args.suppression_window:
+        seconds = args.suppression_window * 60
+        windows = {"critical": seconds, "warning": seconds, "info": seconds}
+    return AlertDeduplicator(
+        suppression_windows=windows,
+        snapshot_path=str(Path(args.storage_path) / "alert_state.json")
+    )
+
+
+def run_adaptive(args) -> int:
+    """Poll every configured page on a change-rate-adaptive schedule until interrupted"""
+    from page_fetcher import ConditionalPageFetcher
+    from poll_scheduler import PollScheduler, load_targets
+    
+    targets = load_targets(args.adaptive)
+    if not targets:
+        print(f"Error: No projects listed in {args.adaptive}")
+        return 1
+    
+    deduplicator = build_deduplicator(args)
+    monitor = StatusMonitor(
+        storage_path=args.storage_path,
+        deduplicator=deduplicator,
+        metric_rules_path=args.metric_rules
+    )
+    fetcher = ConditionalPageFetcher(
+        shared_rbks_client(),
+        state_path=str(Path(args.storage_path) / "page_versions.json")
+    )
+    # One MCP session, so polls run one at a time
+    scheduler = PollScheduler(
+        monitor.storage,
+        targets,
+        polls_per_hour=args.polls_per_hour,
+        max_concurrency=1
+    )
+    
+    def poll(target):
+        status, changes = monitor.check_remote_page(fetcher, target.page_id, target.project_name)
+        if changes:
+            print(monitor.generate_report(status, changes))
+    
+    print(f"🔄 Polling {len(targets)} page(s) adaptively, {args.polls_per_hour:g} polls/hour (Ctrl-C to stop)")
+    for target in targets:
+        interval = scheduler.plan()[target.page_id]
+        print(f"  • {target.project_name}: every {interval / 60:.0f} min")
+    
+    try:
+        scheduler.run_forever(poll)
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        if deduplicator:
+            deduplicator.snapshot()
+    return 0
 
 
 def main():
@@ -22,14 +101,12 @@ def main():
     
     parser.add_argument(
         "--content-file",
-        help="Path to file containing Confluence markdown content",
-        required=True
+        help="Path to file containing Confluence markdown content"
     )
     
     parser.add_argument(
         "--page-id",
-        help="Confluence page ID",
-        required=True
+        help="Confluence page ID"
     )
     
     parser.add_argument(
@@ -49,38 +126,143 @@ def main():
         help="Path to store historical data (default: ./data/history)"
     )
     
+    parser.add_argument(
+        "--suppress-alerts",
+        action="store_true",
+        help="Suppress repeated and flapping change alerts (state kept in <storage-path>/alert_state.json)"
+    )
+    
+    parser.add_argument(
+        "--suppression-window",
+        type=int,
+        help="Override the suppression window for all severities, in minutes"
+    )
+    
+    parser.add_argument(
+        "--export-columnar",
+        metavar="DIR",
+        help="After checking, append new snapshots to partitioned Parquet tables in DIR (requires pyarrow)"
+    )
+    
+    parser.add_argument(
+        "--metric-rules",
+        help="Metric rule config (JSON, or YAML with PyYAML) (default: metric_rules.json)"
+    )
+    
+    parser.add_argument(
+        "--as-of",
+        help="Show stored status as of an ISO date/time (e.g. 2026-01-15 or 2026-01-15T09:00) "
+             "for --project-name, or a portfolio rollup if no project is given"
+    )
+    
+    parser.add_argument(
+        "--fetch",
+        action="store_true",
+        help="Fetch --page-id from Confluence via RBKS MCP instead of --content-file; "
+             "the body is only downloaded when the page version has advanced"
+    )
+    
+    parser.add_argument(
+        "--adaptive",
+        metavar="CONFIG",
+        help="Keep polling the projects in CONFIG (JSON, or YAML with a projects list of name/page_id) "
+             "via RBKS MCP, polling pages that change often more frequently"
+    )
+    
+    parser.add_argument(
+        "--polls-per-hour",
+        type=float,
+        default=12.0,
+        help="Poll budget shared by all pages with --adaptive (default: 12)"
+    )
+    
     args = parser.parse_args()
     
-    # Read content from file
-    try:
-        with open(args.content_file, 'r') as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"Error: File not found: {args.content_file}")
-        return 1
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return 1
+    # Time-travel lookup from stored history
+    if args.as_of:
+        try:
+            as_of = datetime.fromisoformat(args.as_of)
+        except ValueError:
+            print(f"Error: Invalid --as-of value: {args.as_of}")
+            return 1
+        
+        monitor = StatusMonitor(storage_path=args.storage_path)
+        if args.project_name:
+            status = monitor.get_status_as_of(args.project_name, as_of)
+            if not status:
+                print(f"No snapshot of {args.project_name} at or before {as_of}")
+                return 1
+            print(monitor.generate_report(status))
+        else:
+            print(monitor.generate_portfolio_report(as_of))
+        return 0
+    
+    if args.adaptive:
+        return run_adaptive(args)
+    
+    if not args.page_id or not (args.content_file or args.fetch):
+        parser.error("--page-id and --content-file (or --fetch) are required unless --as-of or --adaptive is given")
+    
+    fetcher = None
+    fetch = None
+    if args.fetch:
+        # Conditional fetch via RBKS MCP
+        from page_fetcher import ConditionalPageFetcher
+        
+        fetcher = ConditionalPageFetcher(
+            rbks_client(),
+            state_path=str(Path(args.storage_path) / "page_versions.json")
+        )
+        fetch = fetcher.fetch_if_changed(args.page_id)
+        if fetch is None:
+            seen = fetcher.last_seen(args.page_id)
+            print(f"Page {args.page_id} unchanged since version {seen['version']}; showing stored status")
+            monitor = StatusMonitor(storage_path=args.storage_path)
+            status = monitor.storage.get_latest(args.project_name or seen["project_name"])
+            if status:
+                print(monitor.generate_report(status))
+            return 0
+        content = fetch.content
+    else:
+        # Read content from file
+        try:
+            with open(args.content_file, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            print(f"Error: File not found: {args.content_file}")
+            return 1
+        except Exception as e:
+            print(f"Error reading file: {e}")
+            return 1
     
     # Initialize monitor
-    monitor = StatusMonitor(storage_path=args.storage_path)
+    deduplicator = build_deduplicator(args)
+    
+    monitor = StatusMonitor(
+        storage_path=args.storage_path,
+        deduplicator=deduplicator,
+        metric_rules_path=args.metric_rules
+    )
     
     # Check page
     if args.compare:
-        status, changes = monitor.check_for_changes(
+        status, changes, content_diff = monitor.check_for_content_changes(
             content,
             args.page_id,
             args.project_name
         )
         
         # Generate report with changes
-        report = monitor.generate_report(status, changes)
+        report = monitor.generate_report(status, changes, content_diff)
         print(report)
         
         if changes:
             print("\n" + "="*60)
             print(f"Detected {len(changes)} change(s)")
             print("="*60)
+        
+        if deduplicator:
+            deduplicator.snapshot()
     else:
         status = monitor.check_page(
             content,
@@ -92,6 +274,20 @@ def main():
         report = monitor.generate_report(status)
         print(report)
     
+    if fetcher:
+        fetcher.mark_seen(args.page_id, fetch.version, status.project_name)
+    
+    if args.export_columnar:
+        from columnar_export import ColumnarExporter
+        
+        try:
+            exporter = ColumnarExporter(monitor.storage, export_root=args.export_columnar)
+        except ImportError as e:
+            print(f"Error: {e}")
+            return 1
+        exported = exporter.export()
+        print(f"\nExported {sum(exported.values())} new snapshot(s) to {args.export_columnar}")
+    
     return 0
 
 
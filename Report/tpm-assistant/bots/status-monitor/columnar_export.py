@@ -0,0 +1,338 @@
+"""
+Columnar Export - Writes status history as partitioned Parquet/Arrow tables
+
+StatusStorage keeps one JSON file per snapshot, which is slow to load for
+notebook analysis. This exporter flattens snapshots, risks, metrics and
+detected changes into four columnar tables partitioned by project:
+
+    <export_root>/<table>/project=<Project_Name>/part-<first>-<last>.parquet
+
+Exports are incremental: a manifest records which snapshots have been
+exported per project, so each run only parses and writes new snapshot files.
+If new snapshots are older than ones already exported (e.g. after a history
+backfill), the project's partitions are rebuilt so the changes table stays
+consistent with the full history.
+
+The manifest also lists the part files it covers. Parts are written before
+the manifest is saved, so a run that dies in between leaves parts the
+manifest doesn't know about; those are deleted when the exporter next
+starts, and their snapshots are exported again.
+
+Requires pyarrow (pip install pyarrow).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from status_monitor import ProjectStatus, StatusAnalyzer, StatusStorage
+
+
+TABLES = ("snapshots", "risks", "metrics", "changes")
+MANIFEST_FILE = "_manifest.json"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Columnar export requires pyarrow: pip install pyarrow")
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    ts = pa.timestamp("us")
+    return {
+        "snapshots": pa.schema([
+            ("project_name", pa.string()),
+            ("page_id", pa.string()),
+            ("timestamp", ts),
+            ("overall_status", pa.string()),
+            ("phase", pa.string()),
+            ("street_date", pa.string()),
+            ("mp_date", pa.string()),
+            ("risk_count", pa.int32()),
+            ("key_callouts", pa.list_(pa.string())),
+        ]),
+        "risks": pa.schema([
+            ("project_name", pa.string()),
+            ("timestamp", ts),
+            ("description", pa.string()),
+            ("owner", pa.string()),
+            ("eta", pa.string()),
+            ("status", pa.string()),
+            ("comment", pa.string()),
+        ]),
+        "metrics": pa.schema([
+            ("project_name", pa.string()),
+            ("timestamp", ts),
+            ("name", pa.string()),
+            ("value", pa.float64()),
+            ("value_text", pa.string()),
+        ]),
+        "changes": pa.schema([
+            ("project_name", pa.string()),
+            ("timestamp", ts),
+            ("field", pa.string()),
+            ("old_value", pa.string()),
+            ("new_value", pa.string()),
+            ("severity", pa.string()),
+        ]),
+    }
+
+
+def _as_text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _metric_value(value: Any) -> Optional[float]:
+    """Numeric view of a metric; percentages like '73%' become 73.0"""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.rstrip('%'))
+        except ValueError:
+            return None
+    return None
+
+
+class ColumnarExporter:
+    """Exports StatusStorage history into partitioned columnar tables"""
+    
+    def __init__(self, storage: StatusStorage, export_root: str = "./data/columnar", format: str = "parquet"):
+        """
+        Args:
+            storage: StatusStorage holding the JSON snapshot history
+            export_root: Directory for the partitioned tables
+            format: "parquet" or "arrow" (Feather v2 / Arrow IPC)
+        """
+        _require_pyarrow()
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported format: {format}")
+        
+        self.storage = storage
+        self.export_root = Path(export_root)
+        self.export_root.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.analyzer = StatusAnalyzer()
+        self.schemas = _schemas()
+        self.manifest_path = self.export_root / MANIFEST_FILE
+        self.manifest = self._load_manifest()
+        self._remove_orphan_parts()
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, set]]:
+        """Map of project directory -> {"snapshots": filenames, "parts": part names}"""
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, 'r') as f:
+            data = json.load(f)
+        
+        manifest = {}
+        for project, entry in data.items():
+            if isinstance(entry, dict):
+                manifest[project] = {"snapshots": set(entry["snapshots"]), "parts": set(entry["parts"])}
+                continue
+            # Older manifests kept only the newest exported filename and no
+            # part list, so every part already on disk counts as covered
+            exported = [f.name for f in self.storage.list_snapshots(project) if f.name <= entry]
+            manifest[project] = {"snapshots": set(exported), "parts": set(self._part_files(project))}
+        return manifest
+    
+    def _save_manifest(self):
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        data = {
+            project: {"snapshots": sorted(entry["snapshots"]), "parts": sorted(entry["parts"])}
+            for project, entry in self.manifest.items()
+        }
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _part_files(self, project: str) -> Dict[str, List[Path]]:
+        """Part name -> its files across all tables, for one project"""
+        parts: Dict[str, List[Path]] = {}
+        for table in TABLES:
+            partition_dir = self.export_root / table / f"project={project}"
+            if partition_dir.is_dir():
+                for path in partition_dir.glob("part-*"):
+                    parts.setdefault(path.stem, []).append(path)
+        return parts
+    
+    def _remove_orphan_parts(self):
+        """Delete part files written by a run that died before saving the manifest"""
+        projects = set(self.manifest)
+        for table in TABLES:
+            table_dir = self.export_root / table
+            if table_dir.is_dir():
+                projects.update(d.name.split("=", 1)[1] for d in table_dir.glob("project=*"))
+        
+        for project in projects:
+            covered = self.manifest.get(project, {}).get("parts", set())
+            self._delete_parts(project, lambda part_name: part_name not in covered)
+    
+    def _delete_parts(self, project: str, should_delete):
+        for part_name, paths in self._part_files(project).items():
+            if should_delete(part_name):
+                for path in paths:
+                    path.unlink()
+    
+    def export(self, projects: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Export snapshots not yet in the manifest
+        
+        Snapshots are normally newer than everything exported so far and are
+        appended as a new part file. If any is older than an exported one,
+        the project's full history is rewritten as one part that replaces
+        the existing ones.
+        
+        Args:
+            projects: Project directory names to export (default: all)
+        
+        Returns:
+            Number of new snapshots exported per project
+        """
+        exported = {}
+        
+        for project in projects or self.storage.list_projects():
+            files = self.storage.list_snapshots(project)
+            entry = self.manifest.get(project, {"snapshots": set(), "parts": set()})
+            done, parts = entry["snapshots"], entry["parts"]
+            new_files = [f for f in files if f.name not in done]
+            if not new_files:
+                exported[project] = 0
+                continue
+            
+            # Snapshot filenames are timestamps, so name order is time order
+            previous = None
+            rebuild = bool(done) and new_files[0].name < max(done)
+            if rebuild:
+                # Backfilled history lands between exported snapshots; the old
+                # parts are deleted only once the manifest no longer lists them
+                done, parts = set(), set()
+                new_files = files
+            elif done:
+                prev_path = self.storage.storage_path / project / max(done)
+                if prev_path.exists():
+                    previous = self.storage.load_snapshot(prev_path)
+            
+            rows = {table: [] for table in TABLES}
+            for path in new_files:
+                status = self.storage.load_snapshot(path)
+                self._append_rows(rows, status, previous)
+                previous = status
+            
+            part_name = f"part-{new_files[0].stem}-{new_files[-1].stem}"
+            for table in TABLES:
+                self._write_partition(table, project, part_name, rows[table])
+            
+            self.manifest[project] = {
+                "snapshots": done | {f.name for f in new_files},
+                "parts": parts | {part_name},
+            }
+            self._save_manifest()
+            if rebuild:
+                self._delete_parts(project, lambda name: name != part_name)
+            exported[project] = len(new_files)
+        
+        return exported
+    
+    def _append_rows(self, rows: Dict[str, List[Dict]], status: ProjectStatus, previous: Optional[ProjectStatus]):
+        """Flatten one snapshot into table rows"""
+        rows["snapshots"].append({
+            "project_name": status.project_name,
+            "page_id": status.page_id,
+            "timestamp": status.timestamp,
+            "overall_status": status.overall_status,
+            "phase": status.phase,
+            "street_date": status.street_date,
+            "mp_date": status.mp_date,
+            "risk_count": len(status.risks),
+            "key_callouts": list(status.key_callouts),
+        })
+        
+        for risk in status.risks:
+            rows["risks"].append({
+                "project_name": status.project_name,
+                "timestamp": status.timestamp,
+                "description": risk.description,
+                "owner": risk.owner,
+                "eta": risk.eta,
+                "status": risk.status,
+                "comment": risk.comment,
+            })
+        
+        for name, value in status.metrics.items():
+            rows["metrics"].append({
+                "project_name": status.project_name,
+                "timestamp": status.timestamp,
+                "name": name,
+                "value": _metric_value(value),
+                "value_text": _as_text(value),
+            })
+        
+        if previous is not None:
+            for change in self.analyzer.detect_changes(previous, status):
+                rows["changes"].append({
+                    "project_name": change.project_name,
+                    "timestamp": change.timestamp,
+                    "field": change.field,
+                    "old_value": _as_text(change.old_value),
+                    "new_value": _as_text(change.new_value),
+                    "severity": change.severity,
+                })
+    
+    def _write_partition(self, table: str, project: str, part_name: str, rows: List[Dict]):
+        """Write one part file into the table's project partition"""
+        if not rows:
+            return
+        
+        partition_dir = self.export_root / table / f"project={project}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        
+        arrow_table = pa.Table.from_pylist(rows, schema=self.schemas[table])
+        if self.format == "parquet":
+            path = partition_dir / f"{part_name}.parquet"
+            pq.write_table(arrow_table, path)
+        else:
+            path = partition_dir / f"{part_name}.arrow"
+            feather.write_feather(arrow_table, path)
+    
+    def read(self, table: str, columns: Optional[List[str]] = None, filter=None) -> "pa.Table":
+        """
+        Read an exported table as a single Arrow table
+        
+        Args:
+            table: One of snapshots, risks, metrics, changes
+            columns: Optional column projection
+            filter: Optional pyarrow.dataset expression, e.g.
+                ds.field("project") == "Flan"
+        """
+        return read_table(self.export_root, table, columns=columns, filter=filter, format=self.format)
+
+
+def read_table(export_root: str, table: str, columns: Optional[List[str]] = None,
+               filter=None, format: str = "parquet") -> "pa.Table":
+    """Scan an exported table with project partition pruning"""
+    _require_pyarrow()
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    
+    table_dir = Path(export_root) / table
+    if not table_dir.exists():
+        return _schemas()[table].empty_table()
+    
+    dataset = ds.dataset(
+        str(table_dir),
+        format="parquet" if format == "parquet" else "ipc",
+        partitioning="hive"
+    )
+    return dataset.to_table(columns=columns, filter=filter)
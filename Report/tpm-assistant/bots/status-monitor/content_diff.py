@@ -0,0 +1,242 @@
+"""
+Content Diff - Section-aware diff of raw status page content
+
+Splits markdown into heading sections, hashes each section and only runs a
+line-level diff on sections whose hashes differ. Line comparison works on
+per-line hashes after trimming the common prefix and suffix, so unchanged
+regions of multi-megabyte pages cost a single hashing pass.
+
+The edit region is diffed with patience diff: lines that occur exactly once
+on each side anchor the alignment (longest increasing subsequence, n log n)
+and the gaps between anchors are diffed the same way. A gap with no unique
+lines left falls back to comparing line counts. Nothing is quadratic, so
+there is no size cap.
+"""
+
+import hashlib
+import re
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple
+
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+
+@dataclass
+class Section:
+    """A heading and the lines under it (up to the next heading)"""
+    heading: str
+    level: int
+    lines: List[str]
+    digest: bytes = b""
+
+
+@dataclass
+class SectionDiff:
+    """Text changes within one section"""
+    heading: str
+    change_type: str  # added/removed/modified
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def split_sections(content: str) -> List[Section]:
+    """Split markdown content into sections by heading"""
+    sections = []
+    current = Section(heading="", level=0, lines=[])
+    
+    for line in content.splitlines():
+        match = HEADING_RE.match(line)
+        if match:
+            sections.append(current)
+            current = Section(heading=match.group(2), level=len(match.group(1)), lines=[])
+        else:
+            current.lines.append(line)
+    sections.append(current)
+    
+    # Drop an empty preamble before the first heading
+    if not sections[0].heading and not any(l.strip() for l in sections[0].lines):
+        sections = sections[1:]
+    
+    for section in sections:
+        hasher = hashlib.blake2b(digest_size=16)
+        for line in section.lines:
+            hasher.update(line.encode('utf-8', 'surrogatepass'))
+            hasher.update(b"\n")
+        section.digest = hasher.digest()
+    
+    return sections
+
+
+def _keyed(sections: List[Section]) -> Dict[Tuple[str, int], Section]:
+    """Key sections by (heading, occurrence) so repeated headings stay distinct"""
+    seen = Counter()
+    keyed = {}
+    for section in sections:
+        key = (section.heading, seen[section.heading])
+        seen[section.heading] += 1
+        keyed[key] = section
+    return keyed
+
+
+def _unique_anchors(old: List[int], new: List[int], alo: int, ahi: int,
+                    blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """Longest in-order run of lines that occur exactly once on both sides"""
+    old_counts = Counter(old[alo:ahi])
+    new_positions: Dict[int, int] = {}
+    new_counts = Counter()
+    for j in range(blo, bhi):
+        new_counts[new[j]] += 1
+        new_positions[new[j]] = j
+    
+    pairs = [(i, new_positions[old[i]]) for i in range(alo, ahi)
+             if old_counts[old[i]] == 1 and new_counts.get(old[i]) == 1]
+    if not pairs:
+        return []
+    
+    # Patience sorting: tails[k] is the pair index ending the best run of length k + 1
+    tails: List[int] = []
+    tail_js: List[int] = []
+    back = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        k = bisect_left(tail_js, j)
+        back[index] = tails[k - 1] if k else -1
+        if k == len(tails):
+            tails.append(index)
+            tail_js.append(j)
+        else:
+            tails[k] = index
+            tail_js[k] = j
+    
+    anchors = []
+    index = tails[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = back[index]
+    anchors.reverse()
+    return anchors
+
+
+def _surplus(lines: List[str], hashes: List[int], lo: int, hi: int, extra: Counter) -> List[str]:
+    """The first extra[h] lines in lines[lo:hi] with each hash h"""
+    picked = []
+    for i in range(lo, hi):
+        if extra[hashes[i]] > 0:
+            extra[hashes[i]] -= 1
+            picked.append(lines[i])
+    return picked
+
+
+def diff_lines(old: List[str], new: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Diff two line lists
+    
+    Returns:
+        Tuple of (added_lines, removed_lines), each in page order
+    """
+    old_hashes = [hash(line) for line in old]
+    new_hashes = [hash(line) for line in new]
+    added = []
+    removed = []
+    
+    # Ranges still to diff, popped in page order
+    stack = [(0, len(old), 0, len(new))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        
+        # Trim common prefix/suffix so only the edit region is examined
+        while alo < ahi and blo < bhi and old_hashes[alo] == new_hashes[blo]:
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and old_hashes[ahi - 1] == new_hashes[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+        
+        if alo == ahi or blo == bhi:
+            removed.extend(old[alo:ahi])
+            added.extend(new[blo:bhi])
+            continue
+        
+        anchors = _unique_anchors(old_hashes, new_hashes, alo, ahi, blo, bhi)
+        if not anchors:
+            # Only repeated lines left: report the surplus copies on each side
+            old_counts = Counter(old_hashes[alo:ahi])
+            new_counts = Counter(new_hashes[blo:bhi])
+            removed.extend(_surplus(old, old_hashes, alo, ahi, old_counts - new_counts))
+            added.extend(_surplus(new, new_hashes, blo, bhi, new_counts - old_counts))
+            continue
+        
+        gaps = []
+        for i, j in anchors:
+            gaps.append((alo, i, blo, j))
+            alo, blo = i + 1, j + 1
+        gaps.append((alo, ahi, blo, bhi))
+        stack.extend(reversed(gaps))
+    
+    return added, removed
+
+
+def diff_content(old_content: str, new_content: str) -> List[SectionDiff]:
+    """Diff two page versions section by section, in new-page order"""
+    if old_content == new_content:
+        return []
+    
+    old_sections = _keyed(split_sections(old_content))
+    new_sections = _keyed(split_sections(new_content))
+    diffs = []
+    
+    for key, new_section in new_sections.items():
+        old_section = old_sections.get(key)
+        if old_section is None:
+            diffs.append(SectionDiff(
+                heading=new_section.heading,
+                change_type="added",
+                added=[l for l in new_section.lines if l.strip()]
+            ))
+        elif old_section.digest != new_section.digest:
+            added, removed = diff_lines(old_section.lines, new_section.lines)
+            added = [l for l in added if l.strip()]
+            removed = [l for l in removed if l.strip()]
+            if added or removed:
+                diffs.append(SectionDiff(
+                    heading=new_section.heading,
+                    change_type="modified",
+                    added=added,
+                    removed=removed
+                ))
+    
+    for key, old_section in old_sections.items():
+        if key not in new_sections:
+            diffs.append(SectionDiff(
+                heading=old_section.heading,
+                change_type="removed",
+                removed=[l for l in old_section.lines if l.strip()]
+            ))
+    
+    return diffs
+
+
+def format_content_diff(diffs: List[SectionDiff], max_lines: int = 10) -> List[str]:
+    """Render section diffs as markdown report lines"""
+    lines = []
+    for diff in diffs:
+        heading = diff.heading or "(top of page)"
+        lines.append(f"### {heading} ({diff.change_type})")
+        shown = 0
+        for line in diff.removed:
+            if shown >= max_lines:
+                break
+            lines.append(f"- ➖ {line.strip()}")
+            shown += 1
+        for line in diff.added:
+            if shown >= max_lines:
+                break
+            lines.append(f"- ➕ {line.strip()}")
+            shown += 1
+        hidden = len(diff.added) + len(diff.removed) - shown
+        if hidden > 0:
+            lines.append(f"- … {hidden} more changed line(s)")
+        lines.append("")
+    return lines
@@ -0,0 +1,241 @@
+"""
+Metric Rules - Config-driven metric extraction for status pages
+
+Each rule declares a metric name, an anchor regex that identifies where the
+metric is mentioned, a value pattern with one capture group, a type and a
+unit. The literal prefixes of all anchors are compiled into one trie-shaped
+pattern that scans the page once; its cost stays flat as rules are added.
+Anchor and value patterns are only evaluated around trigger hits.
+
+Rule fields (metric_rules.json, or .yaml if PyYAML is installed):
+    name       Metric key written into ProjectStatus.metrics
+    anchor     Regex fragment locating the metric (case-insensitive)
+    value      Regex with one capture group for the value
+    position   "after" (default): value follows the anchor on the same line
+               "before": value precedes the anchor, separated only by
+               whitespace (newlines included) and at most BEFORE_WINDOW
+               characters back
+    type       int | float | percent | str
+    unit       Optional unit label, e.g. "/5" or "devices"
+    trigger    Optional literal that always starts the anchor; derived from
+               the anchor's leading literal text when omitted
+
+Anchors may not contain top-level alternation ("a|b"): only the first
+branch's literal prefix would be scanned for. Put alternatives in a group
+after a shared prefix, or write one rule per alternative.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+DEFAULT_RULES_PATH = Path(__file__).parent / "metric_rules.json"
+
+VALUE_TYPES = ("int", "float", "percent", "str")
+
+# How far before an anchor a "before" value may start
+BEFORE_WINDOW = 200
+
+
+@dataclass
+class MetricRule:
+    """A single metric extraction rule"""
+    name: str
+    anchor: str
+    value: str
+    position: str = "after"
+    type: str = "str"
+    unit: Optional[str] = None
+    trigger: Optional[str] = None
+    
+    def convert(self, raw: str) -> Any:
+        """Convert a captured value to the rule's type"""
+        if self.type == "int":
+            return int(raw)
+        if self.type == "float":
+            return float(raw)
+        if self.type == "percent":
+            return f"{raw}%"
+        return raw.strip()
+
+
+def _literal_prefix(anchor: str) -> str:
+    """Leading literal text of an anchor regex, e.g. 'devices?\\s*set' -> 'device'"""
+    prefix = []
+    for char in anchor:
+        if not (char.isalnum() or char == " "):
+            if char in "?*{" and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return "".join(prefix).lower()
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether a regex has a '|' outside every group and character class"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Compile literal words into a trie-shaped regex (one branch per distinct prefix)"""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+    
+    return build(trie)
+
+
+class MetricRuleSet:
+    """Compiled set of metric rules that extracts every metric in one scan"""
+    
+    def __init__(self, rules: List[MetricRule]):
+        self.rules = rules
+        self.units = {rule.name: rule.unit for rule in rules if rule.unit}
+        
+        # Rules are grouped by trigger literal; one trie pattern finds every trigger
+        self._trigger_rules: Dict[str, List[tuple]] = {}
+        for rule in rules:
+            if rule.type not in VALUE_TYPES:
+                raise ValueError(f"Metric rule {rule.name}: unknown type {rule.type}")
+            if rule.position not in ("after", "before"):
+                raise ValueError(f"Metric rule {rule.name}: unknown position {rule.position}")
+            
+            if _has_top_level_alternation(rule.anchor):
+                raise ValueError(f"Metric rule {rule.name}: anchor alternation must be inside a group")
+            
+            trigger = (rule.trigger or _literal_prefix(rule.anchor)).lower()
+            if not trigger:
+                raise ValueError(f"Metric rule {rule.name}: anchor has no literal prefix, set 'trigger'")
+            
+            anchor_re = re.compile(rule.anchor, re.IGNORECASE)
+            if rule.position == "before":
+                value_re = re.compile(rf'(?:{rule.value})\s*\Z', re.IGNORECASE)
+            else:
+                value_re = re.compile(rule.value, re.IGNORECASE)
+            if value_re.groups < 1:
+                raise ValueError(f"Metric rule {rule.name}: value pattern needs a capture group")
+            
+            self._trigger_rules.setdefault(trigger, []).append((rule, anchor_re, value_re))
+        
+        pattern = _trie_pattern(list(self._trigger_rules))
+        # Zero-width lookahead so overlapping triggers are all reported
+        self._triggers_re = re.compile(f"(?=({pattern}))") if rules else None
+        self._triggers_re_ci = re.compile(f"(?=({pattern}))", re.IGNORECASE) if rules else None
+    
+    def extract(self, content: str) -> Dict[str, Any]:
+        """Extract all configured metrics from content in a single pass"""
+        metrics = {}
+        if not self._triggers_re:
+            return metrics
+        
+        # Scanning lowercased text is much faster than a case-insensitive scan,
+        # but only valid when lowercasing keeps every offset unchanged
+        lowered = content.lower()
+        if len(lowered) == len(content):
+            hits = self._triggers_re.finditer(lowered)
+        else:
+            hits = self._triggers_re_ci.finditer(content)
+        
+        remaining = len(self.rules)
+        for hit in hits:
+            start = hit.start()
+            matched = hit.group(1).lower()
+            
+            # Shorter triggers that prefix the longest match can also apply
+            for length in range(len(matched), 0, -1):
+                candidates = self._trigger_rules.get(matched[:length])
+                if not candidates:
+                    continue
+                
+                for rule, anchor_re, value_re in candidates:
+                    if rule.name in metrics:
+                        continue
+                    anchor_match = anchor_re.match(content, start)
+                    if not anchor_match:
+                        continue
+                    
+                    end = anchor_match.end()
+                    if rule.position == "before":
+                        # Like the \s* it stands in for, the gap may span lines
+                        window_start = max(0, start - BEFORE_WINDOW)
+                        while 0 < window_start < start and not content[window_start - 1].isspace():
+                            window_start += 1
+                        value_match = value_re.search(content, window_start, start)
+                    else:
+                        line_end = content.find("\n", end)
+                        if line_end == -1:
+                            line_end = len(content)
+                        value_match = value_re.search(content, end, line_end)
+                    
+                    if value_match:
+                        try:
+                            metrics[rule.name] = rule.convert(value_match.group(1))
+                        except ValueError:
+                            continue
+                        remaining -= 1
+            
+            if remaining == 0:
+                break
+        
+        return metrics
+
+
+def load_metric_rules(path: Optional[str] = None) -> MetricRuleSet:
+    """Load and compile metric rules from a JSON (or YAML) config file"""
+    path = Path(path) if path else DEFAULT_RULES_PATH
+    
+    with open(path, 'r') as f:
+        if path.suffix in (".yaml", ".yml"):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    
+    if isinstance(data, dict):
+        data = data.get("metrics", [])
+    
+    return MetricRuleSet([MetricRule(**rule) for rule in data])
+
+
+_default_rules: Optional[MetricRuleSet] = None
+
+
+def default_metric_rules() -> MetricRuleSet:
+    """Rules from metric_rules.json next to this module (compiled once)"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = load_metric_rules()
+    return _default_rules
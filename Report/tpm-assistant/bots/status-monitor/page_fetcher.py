@@ -0,0 +1,162 @@
+"""
+Page Fetcher - Conditional Confluence page fetches keyed on version number
+
+Keeps the last Confluence version seen for each page_id. Each check first
+asks the MCP server for the page's latest version number (a metadata-only
+call) and only downloads the body when that number has advanced, so
+unchanged pages cost one small request instead of a full page transfer and
+parse.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from backfill import VersionBackfiller
+
+
+@dataclass
+class PageFetch:
+    """A fetched page body and the version it belongs to"""
+    page_id: str
+    version: Optional[int]
+    content: str
+
+
+# Confluence's sort key for newest-first version listings
+NEWEST_FIRST = {"sort": "-modified-date"}
+
+
+def _version_numbers(result: Any) -> List[int]:
+    """Version numbers in a versions/metadata response, in response order"""
+    if isinstance(result, dict):
+        if "results" in result:
+            result = result["results"]
+        elif "version" in result:
+            version = result["version"]
+            return [int(version["number"]) if isinstance(version, dict) else int(version)]
+        elif "number" in result:
+            return [int(result["number"])]
+    
+    numbers = []
+    for item in result or []:
+        number = item.get("number") or item.get("version", {}).get("number")
+        if number is not None:
+            numbers.append(int(number))
+    return numbers
+
+
+def _latest_version_number(result: Any) -> Optional[int]:
+    """Pull the newest version number out of a versions/metadata response"""
+    numbers = _version_numbers(result)
+    return max(numbers) if numbers else None
+
+
+class ConditionalPageFetcher:
+    """Fetches page bodies only when their Confluence version has advanced"""
+    
+    def __init__(
+        self,
+        client,
+        state_path: str = "./data/history/page_versions.json",
+        versions_tool: str = None,
+        page_tool: str = None
+    ):
+        """
+        Args:
+            client: MCP client exposing call_tool(tool_name, params)
+            state_path: JSON file holding the last seen version per page_id
+            versions_tool: Metadata tool returning page versions
+            page_tool: Tool returning the page body
+        """
+        self.client = client
+        self.state_path = Path(state_path)
+        self.versions_tool = versions_tool or VersionBackfiller.VERSIONS_TOOL
+        self.page_tool = page_tool or VersionBackfiller.PAGE_TOOL
+        self.stats = {"checked": 0, "fetched": 0, "skipped": 0}
+        self._lock = threading.Lock()
+        self._seen: Dict[str, Dict[str, Any]] = {}
+        # Whether the versions tool honours NEWEST_FIRST; None until observed
+        self._newest_first: Optional[bool] = None
+        
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                self._seen = json.load(f)
+    
+    def last_seen(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Last recorded {"version": int, "project_name": str} for a page"""
+        return self._seen.get(str(page_id))
+    
+    def latest_version(self, page_id: str) -> Optional[int]:
+        """
+        Look up the page's current version number without fetching the body
+        
+        Only the newest version is requested. The versions tool's sort order
+        is not documented, so until it has been observed two versions are
+        requested to check that newest-first sorting is honoured; if it is
+        not, lookups fall back to the full version list.
+        """
+        if self._newest_first is False:
+            return _latest_version_number(self.client.call_tool(self.versions_tool, {"pageId": page_id}))
+        
+        limit = 1 if self._newest_first else 2
+        numbers = _version_numbers(self.client.call_tool(
+            self.versions_tool, {"pageId": page_id, "limit": limit, **NEWEST_FIRST}
+        ))
+        if self._newest_first is None and len(numbers) >= 2:
+            self._newest_first = numbers[0] > numbers[1]
+            if not self._newest_first:
+                return self.latest_version(page_id)
+        return max(numbers) if numbers else None
+    
+    def fetch_if_changed(self, page_id: str) -> Optional[PageFetch]:
+        """
+        Fetch the page body if its version advanced since the last mark_seen
+        
+        Returns:
+            PageFetch with the new body, or None if the page is unchanged.
+            If the version lookup fails, the body is fetched unconditionally.
+        """
+        page_id = str(page_id)
+        with self._lock:
+            self.stats["checked"] += 1
+        
+        try:
+            version = self.latest_version(page_id)
+        except Exception as e:
+            print(f"⚠️  Version lookup failed for {page_id}, fetching body: {e}")
+            version = None
+        
+        seen = self.last_seen(page_id)
+        if version is not None and seen and version <= seen.get("version", -1):
+            with self._lock:
+                self.stats["skipped"] += 1
+            return None
+        
+        result = self.client.call_tool(self.page_tool, {"pageId": page_id, "format": "markdown"})
+        if isinstance(result, dict):
+            content = result.get("content") or result.get("body") or ""
+            if version is None:
+                version = _latest_version_number(result) if "version" in result else None
+        else:
+            content = result or ""
+        
+        with self._lock:
+            self.stats["fetched"] += 1
+        return PageFetch(page_id=page_id, version=version, content=content)
+    
+    def mark_seen(self, page_id: str, version: Optional[int], project_name: str):
+        """Record a processed version so later checks can skip it"""
+        if version is None:
+            return
+        
+        with self._lock:
+            self._seen[str(page_id)] = {"version": version, "project_name": project_name}
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".json.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self._seen, f, indent=2)
+            os.replace(tmp_path, self.state_path)
@@ -0,0 +1,218 @@
+"""
+Poll Scheduler - Change-rate-adaptive polling of status pages
+
+Instead of polling every page with the same effort, the scheduler estimates
+each page's change rate from StatusStorage history and splits a global poll
+budget across pages in proportion to the square root of that rate (the
+allocation that maximizes average freshness for a fixed budget). Volatile
+pages are polled more often, quiet pages less often, with jitter to spread
+load and a concurrency cap on simultaneous polls.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Callable, Optional
+
+from status_monitor import StatusStorage
+
+
+@dataclass
+class PageTarget:
+    """A status page to monitor"""
+    project_name: str
+    page_id: str
+
+
+def load_targets(path: str) -> List[PageTarget]:
+    """Load pages from a config file with a top-level `projects` list (JSON or YAML)"""
+    path = Path(path)
+    with open(path, 'r') as f:
+        if path.suffix in (".yaml", ".yml"):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    
+    return [
+        PageTarget(project_name=p["name"], page_id=str(p["page_id"]))
+        for p in data.get("projects", [])
+    ]
+
+
+class PollScheduler:
+    """Schedules page polls based on observed change frequency"""
+    
+    def __init__(
+        self,
+        storage: StatusStorage,
+        targets: List[PageTarget],
+        polls_per_hour: float = 12.0,
+        min_interval: float = 15 * 60,
+        max_interval: float = 24 * 60 * 60,
+        jitter: float = 0.1,
+        max_concurrency: int = 4,
+        history_limit: int = 50
+    ):
+        """
+        Args:
+            storage: StatusStorage with each project's snapshot history
+            targets: Pages to poll
+            polls_per_hour: Global MCP poll budget shared by all pages
+            min_interval: Shortest interval between polls of one page (seconds)
+            max_interval: Longest interval between polls of one page (seconds)
+            jitter: Random +/- fraction applied to each interval
+            max_concurrency: Maximum polls running at once
+            history_limit: Snapshots considered when estimating change rate
+        """
+        self.storage = storage
+        self.targets = {t.page_id: t for t in targets}
+        self.polls_per_hour = polls_per_hour
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.history_limit = history_limit
+        
+        self._rates: Dict[str, float] = {}
+        # Stagger first polls so pages don't all start at once
+        start = time.time()
+        self._next_due: Dict[str, float] = {
+            page_id: start + random.uniform(0, self.jitter * self.min_interval)
+            for page_id in self.targets
+        }
+        self._lock = threading.Lock()
+    
+    def estimate_change_rate(self, project_name: str, now: Optional[datetime] = None) -> float:
+        """
+        Estimate page changes per hour from stored snapshots
+        
+        Counts snapshots whose raw content differs from the one before, over
+        the time from the oldest considered snapshot until now, so a page that
+        has gone quiet since its last change decays toward a lower rate. One
+        pseudo-change spread over a day gives new pages a sane default.
+        """
+        history = self.storage.get_content_hashes(project_name, limit=self.history_limit)
+        if len(history) < 2:
+            return 1.0 / 24
+        
+        changes = sum(1 for prev, cur in zip(history, history[1:]) if prev[1] != cur[1])
+        now = now or datetime.now()
+        span_hours = max(0.0, (now - history[0][0]).total_seconds() / 3600)
+        return (changes + 1) / (span_hours + 24)
+    
+    def refresh_rates(self):
+        """Re-estimate change rates for every page from storage"""
+        rates = {
+            page_id: self.estimate_change_rate(target.project_name)
+            for page_id, target in self.targets.items()
+        }
+        with self._lock:
+            self._rates.update(rates)
+    
+    def plan(self) -> Dict[str, float]:
+        """
+        Compute the polling interval (seconds) for each page
+        
+        Poll frequency is proportional to sqrt(change rate), normalized so the
+        sum over all pages matches polls_per_hour, then clamped to
+        [min_interval, max_interval].
+        """
+        with self._lock:
+            rates = dict(self._rates)
+        if not rates:
+            self.refresh_rates()
+            with self._lock:
+                rates = dict(self._rates)
+        
+        weights = {page_id: math.sqrt(rates.get(page_id, 0.0)) for page_id in self.targets}
+        total = sum(weights.values())
+        
+        intervals = {}
+        for page_id, weight in weights.items():
+            if total <= 0 or weight <= 0:
+                intervals[page_id] = self.max_interval
+                continue
+            polls_per_hour = self.polls_per_hour * weight / total
+            interval = 3600.0 / polls_per_hour
+            intervals[page_id] = min(self.max_interval, max(self.min_interval, interval))
+        
+        return intervals
+    
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+    
+    def due(self, now: Optional[float] = None) -> List[PageTarget]:
+        """Pages whose next poll time has passed, most overdue first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            overdue = sorted(
+                (due_at, page_id) for page_id, due_at in self._next_due.items() if due_at <= now
+            )
+        return [self.targets[page_id] for _, page_id in overdue]
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """Time until the next page becomes due"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return max(0.0, min(self._next_due.values(), default=now) - now)
+    
+    def record_poll(self, target: PageTarget, now: Optional[float] = None):
+        """Update the page's change rate and schedule its next poll"""
+        now = time.time() if now is None else now
+        rate = self.estimate_change_rate(target.project_name, datetime.fromtimestamp(now))
+        with self._lock:
+            self._rates[target.page_id] = rate
+        interval = self.plan()[target.page_id]
+        with self._lock:
+            self._next_due[target.page_id] = now + self._jittered(interval)
+    
+    def record_failure(self, target: PageTarget, now: Optional[float] = None):
+        """Retry a failed poll after min_interval, leaving its change rate alone"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._next_due[target.page_id] = now + self._jittered(self.min_interval)
+    
+    def run_due(self, poll_fn: Callable[[PageTarget], None]) -> int:
+        """
+        Poll all due pages, at most max_concurrency at a time
+        
+        Args:
+            poll_fn: Fetches and checks one page, e.g. calling
+                StatusMonitor.check_for_changes and saving the snapshot;
+                raises if the poll failed, so the page is retried instead
+                of being rescheduled as if it had been seen
+        
+        Returns:
+            Number of pages polled
+        """
+        targets = self.due()
+        if not targets:
+            return 0
+        
+        def poll(target: PageTarget):
+            try:
+                poll_fn(target)
+            except Exception as e:
+                print(f"❌ Poll failed for {target.project_name} ({target.page_id}): {e}")
+                self.record_failure(target)
+            else:
+                self.record_poll(target)
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            list(pool.map(poll, targets))
+        
+        return len(targets)
+    
+    def run_forever(self, poll_fn: Callable[[PageTarget], None], stop_event: Optional[threading.Event] = None):
+        """Poll pages as they become due until stop_event is set"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.run_due(poll_fn)
+            stop_event.wait(self.seconds_until_next())
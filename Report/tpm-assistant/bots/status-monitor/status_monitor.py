@@ -5,6 +5,8 @@ This bot reads Confluence pages via RBKS MCP, extracts structured data,
 and detects changes over time.
 """
 
+import bisect
+import hashlib
 import json
 import re
 from dataclasses import dataclass, asdict
@@ -12,6 +14,9 @@ from datetime import datetime, date
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from content_diff import SectionDiff, diff_content, format_content_diff
+from metric_rules import MetricRuleSet, default_metric_rules, load_metric_rules
+
 
 @dataclass
 class Risk:
@@ -70,14 +75,25 @@ class StatusChange:
     old_value: Any
     new_value: Any
     severity: str  # info/warning/critical
+    flapping: int = 0  # Reversals within the flap window, set on flapping summaries
     
     def __str__(self) -> str:
-        return f"[{self.severity.upper()}] {self.field}: {self.old_value} → {self.new_value}"
+        text = f"[{self.severity.upper()}] {self.field}: {self.old_value} → {self.new_value}"
+        if self.flapping:
+            text += f" (flapping: {self.flapping} reversals)"
+        return text
 
 
 class StatusParser:
     """Parses Confluence markdown content to extract structured status"""
     
+    def __init__(self, metric_rules_path: str = None):
+        """
+        Args:
+            metric_rules_path: Optional metric rule config (default: metric_rules.json)
+        """
+        self.metric_rules = load_metric_rules(metric_rules_path) if metric_rules_path else None
+    
     @staticmethod
     def extract_status(content: str) -> str:
         """Extract overall status (Green/Yellow/Red)"""
@@ -221,40 +237,25 @@ class StatusParser:
         return risks
     
     @staticmethod
-    def extract_metrics(content: str) -> Dict[str, Any]:
-        """Extract numerical metrics (setup rate, CSAT, etc.)"""
-        metrics = {}
-        
-        # Alpha trials metrics
-        setup_match = re.search(r'(\d+)\s*\((\d+)%\)\s*(?:trials\s*)?devices?\s*(?:have\s*been\s*)?set\s*up', content, re.IGNORECASE)
-        if setup_match:
-            metrics['alpha_devices_setup'] = int(setup_match.group(1))
-            metrics['alpha_setup_rate'] = f"{setup_match.group(2)}%"
-        
-        # CSAT scores
-        csat_patterns = [
-            (r'setup.*?(\d+\.\d+)/5', 'csat_setup'),
-            (r'response\s*time.*?(\d+\.\d+)/5', 'csat_response_time'),
-            (r'audio\s*quality.*?(\d+\.\d+)/5', 'csat_audio_quality'),
-        ]
-        
-        for pattern, key in csat_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                metrics[key] = float(match.group(1))
-        
-        return metrics
+    def extract_metrics(content: str, rules: Optional[MetricRuleSet] = None) -> Dict[str, Any]:
+        """Extract numerical metrics (setup rate, CSAT, etc.) using configured metric rules"""
+        rules = rules or default_metric_rules()
+        return rules.extract(content)
+    
+    @staticmethod
+    def parse_project_name(content: str) -> str:
+        """Project name from the page's top-level title"""
+        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        if title_match:
+            return title_match.group(1).strip()
+        return "Unknown Project"
     
     def parse(self, content: str, page_id: str, project_name: str = None) -> ProjectStatus:
         """Parse Confluence content into structured ProjectStatus"""
         
         # Extract project name from content if not provided
         if not project_name:
-            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            if title_match:
-                project_name = title_match.group(1).strip()
-            else:
-                project_name = "Unknown Project"
+            project_name = self.parse_project_name(content)
         
         status = ProjectStatus(
             project_name=project_name,
@@ -264,7 +265,7 @@ class StatusParser:
             phase=self.extract_phase(content),
             key_callouts=self.extract_key_callouts(content),
             risks=self.extract_risks(content),
-            metrics=self.extract_metrics(content),
+            metrics=self.extract_metrics(content, self.metric_rules),
             raw_content=content
         )
         
@@ -279,20 +280,149 @@ class StatusParser:
 class StatusStorage:
     """Stores and retrieves historical status data"""
     
+    SNAPSHOT_FORMAT = '%Y%m%d_%H%M%S'
+    
     def __init__(self, storage_path: str = "./data/history"):
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        # project dir name -> (dir mtime_ns, sorted timestamps, matching paths)
+        self._timestamp_index: Dict[str, tuple] = {}
+        # snapshot path -> (file mtime_ns, hash of raw_content)
+        self._content_hashes: Dict[Path, tuple] = {}
+    
+    @staticmethod
+    def _hash_content(content: str) -> str:
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
     
     def save(self, status: ProjectStatus):
         """Save status snapshot"""
         project_dir = self.storage_path / status.project_name.replace(" ", "_")
         project_dir.mkdir(exist_ok=True)
         
-        filename = f"{status.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
+        filename = f"{status.timestamp.strftime(self.SNAPSHOT_FORMAT)}.json"
         filepath = project_dir / filename
         
         with open(filepath, 'w') as f:
             json.dump(status.to_dict(), f, indent=2)
+        self._content_hashes[filepath] = (filepath.stat().st_mtime_ns, self._hash_content(status.raw_content))
+    
+    def save_many(self, statuses: List[ProjectStatus]):
+        """Save a batch of snapshots (e.g. from a history backfill)"""
+        for status in statuses:
+            self.save(status)
+    
+    def has_snapshot(self, project_name: str, timestamp: datetime) -> bool:
+        """Check whether a snapshot already exists for this exact second"""
+        project_dir = self.storage_path / project_name.replace(" ", "_")
+        return (project_dir / f"{timestamp.strftime(self.SNAPSHOT_FORMAT)}.json").exists()
+    
+    def list_projects(self) -> List[str]:
+        """List project directory names that have stored snapshots"""
+        return sorted(
+            p.name for p in self.storage_path.iterdir()
+            if p.is_dir() and not p.name.startswith(".")
+        )
+    
+    def list_snapshots(self, project_name: str) -> List[Path]:
+        """List snapshot files for a project, oldest first"""
+        project_dir = self.storage_path / project_name.replace(" ", "_")
+        
+        if not project_dir.exists():
+            return []
+        
+        return sorted(project_dir.glob("*.json"))
+    
+    def load_snapshot(self, path: Path) -> ProjectStatus:
+        """Load a single snapshot file"""
+        with open(path, 'r') as f:
+            return ProjectStatus.from_dict(json.load(f))
+    
+    def _get_timestamp_index(self, project_name: str) -> tuple:
+        """
+        Sorted (timestamps, paths) for a project, built from snapshot filenames
+        
+        The index is cached and only rebuilt when the project directory changes,
+        so repeated lookups never parse snapshot JSON.
+        """
+        dir_name = project_name.replace(" ", "_")
+        project_dir = self.storage_path / dir_name
+        
+        if not project_dir.exists():
+            return [], []
+        
+        mtime = project_dir.stat().st_mtime_ns
+        cached = self._timestamp_index.get(dir_name)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+        
+        timestamps = []
+        paths = []
+        for path in self.list_snapshots(project_name):
+            try:
+                timestamps.append(datetime.strptime(path.stem, self.SNAPSHOT_FORMAT))
+            except ValueError:
+                continue
+            paths.append(path)
+        
+        self._timestamp_index[dir_name] = (mtime, timestamps, paths)
+        return timestamps, paths
+    
+    def get_content_hashes(self, project_name: str, limit: int = 10) -> List[tuple]:
+        """
+        (timestamp, raw_content hash) of the newest snapshots, oldest first
+        
+        Hashes are cached per snapshot file and primed by save(), so only
+        snapshots this storage has not hashed before are parsed.
+        """
+        timestamps, paths = self._get_timestamp_index(project_name)
+        start = max(0, len(paths) - limit)
+        
+        hashes = []
+        for timestamp, path in zip(timestamps[start:], paths[start:]):
+            mtime = path.stat().st_mtime_ns
+            cached = self._content_hashes.get(path)
+            if not cached or cached[0] != mtime:
+                cached = (mtime, self._hash_content(self.load_snapshot(path).raw_content))
+                self._content_hashes[path] = cached
+            hashes.append((timestamp, cached[1]))
+        
+        return hashes
+    
+    def get_as_of(self, project_name: str, when: datetime) -> Optional[ProjectStatus]:
+        """
+        Get the status that was in effect for a project at a given time
+        
+        Binary-searches the snapshot timestamp index and loads only the
+        matching snapshot.
+        
+        Snapshot timestamps are naive local time; a timezone-aware `when`
+        is converted to local time first.
+        
+        Returns:
+            Latest snapshot taken at or before `when`, or None if the project
+            had no snapshots yet
+        """
+        timestamps, paths = self._get_timestamp_index(project_name)
+        if when.tzinfo is not None:
+            when = when.astimezone().replace(tzinfo=None)
+        
+        # Filenames have second resolution
+        pos = bisect.bisect_right(timestamps, when.replace(microsecond=0))
+        if pos == 0:
+            return None
+        
+        return self.load_snapshot(paths[pos - 1])
+    
+    def get_portfolio_as_of(self, when: datetime, projects: List[str] = None) -> Dict[str, ProjectStatus]:
+        """Get the status in effect at `when` for every (or the given) project"""
+        portfolio = {}
+        
+        for project in projects or self.list_projects():
+            status = self.get_as_of(project, when)
+            if status:
+                portfolio[status.project_name] = status
+        
+        return portfolio
     
     def get_latest(self, project_name: str) -> Optional[ProjectStatus]:
         """Get most recent status for a project"""
@@ -406,10 +536,11 @@ class StatusAnalyzer:
 class StatusMonitor:
     """Main Status Monitor Bot"""
     
-    def __init__(self, storage_path: str = "./data/history"):
-        self.parser = StatusParser()
+    def __init__(self, storage_path: str = "./data/history", deduplicator=None, metric_rules_path: str = None):
+        self.parser = StatusParser(metric_rules_path)
         self.storage = StatusStorage(storage_path)
         self.analyzer = StatusAnalyzer()
+        self.deduplicator = deduplicator  # Optional AlertDeduplicator
     
     def check_page(self, page_content: str, page_id: str, project_name: str = None) -> ProjectStatus:
         """
@@ -431,13 +562,8 @@ class StatusMonitor:
         
         return status
     
-    def check_for_changes(self, page_content: str, page_id: str, project_name: str = None) -> tuple[ProjectStatus, List[StatusChange]]:
-        """
-        Check page and detect changes from previous version
-        
-        Returns:
-            Tuple of (current_status, list_of_changes)
-        """
+    def _check_against_previous(self, page_content: str, page_id: str, project_name: str = None) -> tuple[ProjectStatus, Optional[ProjectStatus], List[StatusChange]]:
+        """Parse page, detect changes from the stored latest snapshot and save"""
         # Get current status
         current_status = self.parser.parse(page_content, page_id, project_name)
         
@@ -449,12 +575,93 @@ class StatusMonitor:
         if previous_status:
             changes = self.analyzer.detect_changes(previous_status, current_status)
         
+        # Drop repeated/flapping alerts
+        if self.deduplicator and changes:
+            changes = self.deduplicator.filter(changes)
+        
         # Save current status
         self.storage.save(current_status)
         
+        return current_status, previous_status, changes
+    
+    def check_for_changes(self, page_content: str, page_id: str, project_name: str = None) -> tuple[ProjectStatus, List[StatusChange]]:
+        """
+        Check page and detect changes from previous version
+        
+        Returns:
+            Tuple of (current_status, list_of_changes)
+        """
+        current_status, _, changes = self._check_against_previous(page_content, page_id, project_name)
         return current_status, changes
     
-    def generate_report(self, status: ProjectStatus, changes: List[StatusChange] = None) -> str:
+    def check_for_content_changes(self, page_content: str, page_id: str, project_name: str = None) -> tuple[ProjectStatus, List[StatusChange], List[SectionDiff]]:
+        """
+        Check page and detect both field changes and raw text changes
+        
+        Returns:
+            Tuple of (current_status, list_of_changes, section_diffs)
+        """
+        current_status, previous_status, changes = self._check_against_previous(page_content, page_id, project_name)
+        
+        content_diff = []
+        if previous_status:
+            content_diff = diff_content(previous_status.raw_content, current_status.raw_content)
+        
+        return current_status, changes, content_diff
+    
+    def check_remote_page(self, fetcher, page_id: str, project_name: str = None) -> tuple[Optional[ProjectStatus], List[StatusChange]]:
+        """
+        Check a page through a ConditionalPageFetcher
+        
+        Returns:
+            Tuple of (status, changes). If the page version has not advanced,
+            nothing is downloaded and the latest stored status is returned
+            with no changes.
+        """
+        fetch = fetcher.fetch_if_changed(page_id)
+        if fetch is None:
+            seen = fetcher.last_seen(page_id) or {}
+            name = project_name or seen.get("project_name")
+            return (self.storage.get_latest(name) if name else None), []
+        
+        status, changes = self.check_for_changes(fetch.content, page_id, project_name)
+        fetcher.mark_seen(page_id, fetch.version, status.project_name)
+        return status, changes
+    
+    def get_status_as_of(self, project_name: str, when: datetime) -> Optional[ProjectStatus]:
+        """Get the status a project's page reported at a given time"""
+        return self.storage.get_as_of(project_name, when)
+    
+    def generate_portfolio_report(self, as_of: datetime = None, projects: List[str] = None) -> str:
+        """Generate a one-line-per-project rollup of status as of a given time"""
+        as_of = as_of or datetime.now()
+        portfolio = self.storage.get_portfolio_as_of(as_of, projects)
+        
+        report = []
+        report.append("# Portfolio Status Report")
+        report.append(f"As of: {as_of.strftime('%Y-%m-%d %H:%M:%S')}")
+        report.append("")
+        
+        if not portfolio:
+            report.append("No project snapshots recorded at this time.")
+            return "\n".join(report)
+        
+        status_emoji = {"Green": "🟢", "Yellow": "🟡", "Red": "🔴", "Unknown": "⚪"}
+        for name in sorted(portfolio):
+            status = portfolio[name]
+            line = f"- {status_emoji.get(status.overall_status, '⚪')} **{name}**: {status.overall_status}"
+            if status.phase:
+                line += f" | Phase: {status.phase}"
+            if status.street_date:
+                line += f" | Street: {status.street_date}"
+            line += f" | Open risks: {len(status.risks)}"
+            line += f" (snapshot {status.timestamp.strftime('%Y-%m-%d %H:%M')})"
+            report.append(line)
+        
+        report.append("")
+        return "\n".join(report)
+    
+    def generate_report(self, status: ProjectStatus, changes: List[StatusChange] = None, content_diff: List[SectionDiff] = None) -> str:
         """Generate a human-readable status report"""
         report = []
         report.append(f"# {status.project_name} Status Report")
@@ -483,6 +690,11 @@ class StatusMonitor:
                 report.append(f"- {severity_emoji.get(change.severity, 'ℹ️')} {change}")
             report.append("")
         
+        # Raw page text changes
+        if content_diff:
+            report.append("## What Changed")
+            report.extend(format_content_diff(content_diff))
+        
         # Key callouts
         if status.key_callouts:
             report.append("## Key Callouts")
@@ -0,0 +1,6 @@
+"""Make the status monitor modules importable by bare name, as cli.py does."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,112 @@
+"""Tests for AlertDeduplicator suppression windows and flap detection"""
+
+from datetime import datetime, timedelta
+
+from alert_dedup import AlertDeduplicator
+from status_monitor import StatusChange
+
+
+START = datetime(2026, 1, 15, 9, 0)
+
+
+def change(minutes, old="Green", new="Yellow", severity="warning", field="overall_status"):
+    return StatusChange(
+        project_name="Flan",
+        timestamp=START + timedelta(minutes=minutes),
+        field=field,
+        old_value=old,
+        new_value=new,
+        severity=severity
+    )
+
+
+def test_repeat_suppressed_inside_window_and_emitted_after_expiry():
+    dedup = AlertDeduplicator(suppression_windows={"warning": 3600}, flap_threshold=100)
+    
+    assert len(dedup.filter([change(0)])) == 1
+    assert dedup.filter([change(30)]) == []
+    assert dedup.filter([change(59)]) == []
+    assert dedup.suppressed_count(change(59)) == 2
+    
+    # The window is measured from the last emitted alert, so this one goes out
+    emitted = dedup.filter([change(61)])
+    assert len(emitted) == 1
+    assert dedup.suppressed_count(change(61)) == 0
+
+
+def test_windows_are_per_severity():
+    dedup = AlertDeduplicator(suppression_windows={"critical": 600, "warning": 3600}, flap_threshold=100)
+    
+    dedup.filter([change(0, severity="critical"), change(0, old="A", new="B")])
+    later = dedup.filter([change(15, severity="critical"), change(15, old="A", new="B")])
+    
+    assert [c.severity for c in later] == ["critical"]
+
+
+def test_flapping_field_collapses_into_one_alert():
+    dedup = AlertDeduplicator(flap_window=3600, flap_threshold=3, suppression_windows={"warning": 1})
+    values = ["Green", "Yellow"]
+    
+    emitted = []
+    for i in range(8):
+        emitted += dedup.filter([change(i * 5, old=values[i % 2], new=values[(i + 1) % 2])])
+    
+    # Three normal transitions, then one flapping summary, then silence
+    flapping = [c for c in emitted if c.flapping]
+    assert len(emitted) == 4
+    assert len(flapping) == 1
+    assert flapping[0].flapping == 3
+    assert (flapping[0].old_value, flapping[0].new_value) == ("Yellow", "Green")
+    assert "(flapping: 3 reversals)" in str(flapping[0])
+    assert dedup.is_flapping("Flan", "overall_status")
+
+
+def test_forward_changes_are_not_flapping():
+    dedup = AlertDeduplicator(flap_window=6 * 3600, flap_threshold=3)
+    steps = [("Green", "Yellow"), ("Yellow", "Red"), ("Red", "Blocked"), ("Blocked", "Cancelled")]
+    
+    emitted = []
+    for i, (old, new) in enumerate(steps):
+        emitted += dedup.filter([change(i * 30, old=old, new=new)])
+    
+    assert [c.new_value for c in emitted] == ["Yellow", "Red", "Blocked", "Cancelled"]
+    assert not any(c.flapping for c in emitted)
+    assert not dedup.is_flapping("Flan", "overall_status")
+
+
+def test_flapping_alert_repeats_once_flap_window_expires():
+    dedup = AlertDeduplicator(flap_window=3600, flap_threshold=2, suppression_windows={"warning": 1})
+    values = ["Green", "Yellow"]
+    
+    def flip(minutes, i):
+        return dedup.filter([change(minutes, old=values[i % 2], new=values[(i + 1) % 2])])
+    
+    first = [flip(m, i) for i, m in enumerate([0, 5, 10, 15])]
+    assert sum(1 for batch in first for c in batch if c.flapping) == 1
+    
+    # Still flapping two hours later: a fresh summary once the flap window has passed
+    second = [flip(m, i) for i, m in enumerate([120, 125, 130])]
+    assert sum(1 for batch in second for c in batch if c.flapping) == 1
+
+
+def test_prune_uses_change_time_not_wall_clock():
+    dedup = AlertDeduplicator(suppression_windows={"warning": 3600}, flap_window=3600)
+    dedup.filter([change(0)])
+    
+    # Months-old changes are still recent relative to each other
+    dedup.prune()
+    assert dedup.filter([change(10)]) == []
+    
+    dedup.prune(now=(START + timedelta(days=2)).timestamp())
+    assert len(dedup.filter([change(20)])) == 1
+
+
+def test_snapshot_round_trip_keeps_suppression(tmp_path):
+    path = tmp_path / "dedup.json"
+    dedup = AlertDeduplicator(suppression_windows={"warning": 3600}, snapshot_path=str(path))
+    dedup.filter([change(0)])
+    dedup.snapshot()
+    
+    restored = AlertDeduplicator(suppression_windows={"warning": 3600}, snapshot_path=str(path))
+    assert restored.filter([change(10)]) == []
+    assert len(restored.filter([change(61)])) == 1
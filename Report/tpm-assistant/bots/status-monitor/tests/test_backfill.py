@@ -0,0 +1,99 @@
+"""Tests for resumable version-history backfill against a local version store"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from backfill import LocalVersionStore, VersionBackfiller
+from status_monitor import StatusStorage
+
+
+PAGE_ID = "2814198025"
+STATUSES = ["Green", "Green", "Yellow", "Red", "Yellow", "Green"]
+
+
+def page(status, setup):
+    return f"# Flan\n\nStatus: **{status}**\n\n{setup} (80%) devices have been set up\n"
+
+
+@pytest.fixture
+def versions_dir(tmp_path):
+    page_dir = tmp_path / "versions" / PAGE_ID
+    page_dir.mkdir(parents=True)
+    versions = []
+    for number, status in enumerate(STATUSES, 1):
+        versions.append({"number": number, "when": f"2026-02-{number:02d}T09:00:00"})
+        (page_dir / f"{number}.md").write_text(page(status, number * 10))
+    (page_dir / "versions.json").write_text(json.dumps(versions))
+    return tmp_path / "versions"
+
+
+class FailingStore(LocalVersionStore):
+    """Local store whose page fetches start failing after a number of calls"""
+    
+    def __init__(self, root, fail_after):
+        super().__init__(root)
+        self.fail_after = fail_after
+    
+    def call_tool(self, tool_name, params):
+        if tool_name == VersionBackfiller.PAGE_TOOL:
+            if self.fail_after == 0:
+                raise ConnectionError("MCP server exited")
+            self.fail_after -= 1
+        return super().call_tool(tool_name, params)
+
+
+def fetched_versions(store):
+    return [params["version"] for tool, params in store.calls if tool == VersionBackfiller.PAGE_TOOL]
+
+
+def backfiller(store, storage, **kwargs):
+    return VersionBackfiller(store, storage, rate_limit=0, max_workers=1, batch_size=2, **kwargs)
+
+
+def test_interrupted_backfill_resumes_where_it_stopped(versions_dir, tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    
+    # Dies fetching version 5: batches 1-2 and 3-4 are saved and checkpointed
+    failing = FailingStore(versions_dir, fail_after=4)
+    with pytest.raises(ConnectionError):
+        backfiller(failing, storage).backfill(PAGE_ID, "Flan")
+    assert backfiller(failing, storage)._load_done(PAGE_ID) == {1, 2, 3, 4}
+    
+    store = LocalVersionStore(versions_dir)
+    assert backfiller(store, storage).backfill(PAGE_ID, "Flan") == 2
+    assert fetched_versions(store) == [5, 6]
+    
+    history = [storage.load_snapshot(path) for path in storage.list_snapshots("Flan")]
+    assert [s.timestamp for s in history] == [datetime(2026, 2, day, 9, 0) for day in range(1, 7)]
+    assert [s.overall_status for s in history] == STATUSES
+    assert [s.metrics["alpha_devices_setup"] for s in history] == [10, 20, 30, 40, 50, 60]
+    
+    # Nothing left to do on a third run
+    again = LocalVersionStore(versions_dir)
+    assert backfiller(again, storage).backfill(PAGE_ID, "Flan") == 0
+    assert fetched_versions(again) == []
+
+
+def test_project_name_from_newest_version_fetches_it_once(versions_dir, tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    store = LocalVersionStore(versions_dir)
+    
+    assert backfiller(store, storage).backfill(PAGE_ID) == len(STATUSES)
+    assert sorted(fetched_versions(store)) == [1, 2, 3, 4, 5, 6]
+    assert len(storage.list_snapshots("Flan")) == len(STATUSES)
+
+
+def test_backfill_uses_configured_metric_rules(versions_dir, tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({"metrics": [
+        {"name": "devices", "anchor": r"devices\s*have\s*been\s*set\s*up", "value": r"(\d+)\s*\(\d+%\)\s*",
+         "position": "before", "type": "int"},
+    ]}))
+    storage = StatusStorage(str(tmp_path / "history"))
+    
+    backfiller(LocalVersionStore(versions_dir), storage, metric_rules_path=str(rules)).backfill(PAGE_ID, "Flan")
+    
+    latest = storage.load_snapshot(storage.list_snapshots("Flan")[-1])
+    assert latest.metrics == {"devices": 60}
@@ -0,0 +1,58 @@
+"""Tests for the --adaptive polling mode of cli.py"""
+
+import json
+import sys
+from pathlib import Path
+
+import cli
+from poll_scheduler import PollScheduler
+from status_monitor import StatusStorage
+
+
+class FakeConfluence:
+    """MCP client stand-in serving one version of each page"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+    
+    def call_tool(self, tool_name, params):
+        self.calls.append(tool_name)
+        if tool_name == "confluence_get_page_versions":
+            return {"results": [{"number": 3, "when": "2026-03-01T09:00:00"}]}
+        return self.pages[params["pageId"]]
+
+
+def test_adaptive_mode_polls_every_configured_page(tmp_path, monkeypatch, capsys):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"projects": [
+        {"name": "Flan", "page_id": "1"},
+        {"name": "Brie", "page_id": 2},
+    ]}))
+    client = FakeConfluence({"1": "# Flan\n**Green**\n", "2": "# Brie\n**Red**\n"})
+    monkeypatch.setattr(cli, "rbks_client", lambda: client)
+    monkeypatch.syspath_prepend(str(Path(cli.__file__).resolve().parents[3]))
+    import mcp_session_pool
+    monkeypatch.setattr(mcp_session_pool, "_shared_pools", {})
+    
+    # One pass over the due pages instead of looping until Ctrl-C
+    def run_once(self, poll_fn, stop_event=None):
+        self._next_due = dict.fromkeys(self._next_due, 0.0)
+        self.run_due(poll_fn)
+    monkeypatch.setattr(PollScheduler, "run_forever", run_once)
+    
+    storage_path = tmp_path / "history"
+    monkeypatch.setattr(sys, "argv", ["cli.py", "--adaptive", str(config), "--storage-path", str(storage_path)])
+    assert cli.main() == 0
+    
+    storage = StatusStorage(str(storage_path))
+    assert storage.get_latest("Flan").overall_status == "Green"
+    assert storage.get_latest("Brie").overall_status == "Red"
+    seen = json.loads((storage_path / "page_versions.json").read_text())
+    assert seen == {"1": {"version": 3, "project_name": "Flan"}, "2": {"version": 3, "project_name": "Brie"}}
+    assert "Polling 2 page(s) adaptively" in capsys.readouterr().out
+    
+    # Polls went through the process-wide pool's one warm session
+    pool = mcp_session_pool._shared_pools["rbks-mcp-servers"]
+    assert pool.stats["created"] == 1
+    pool.close()
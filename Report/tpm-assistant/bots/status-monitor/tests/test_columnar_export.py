@@ -0,0 +1,116 @@
+"""Tests for incremental columnar export after a history backfill"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from columnar_export import ColumnarExporter
+from status_monitor import ProjectStatus, StatusStorage
+
+
+def snapshot(ts, status):
+    return ProjectStatus(project_name="Flan", page_id="1", timestamp=ts, overall_status=status)
+
+
+def exported(exporter, table):
+    rows = exporter.read(table).to_pylist()
+    return sorted((row["timestamp"], row.get("overall_status") or row.get("new_value")) for row in rows)
+
+
+def test_backfilled_snapshots_are_exported(tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    exporter = ColumnarExporter(storage, str(tmp_path / "columnar"))
+    storage.save_many([
+        snapshot(datetime(2026, 3, 1, 9, 0), "Green"),
+        snapshot(datetime(2026, 3, 3, 9, 0), "Red"),
+    ])
+    assert exporter.export() == {"Flan": 2}
+    assert exporter.export() == {"Flan": 0}
+    
+    # Backfill lands between and before what was already exported
+    storage.save_many([
+        snapshot(datetime(2026, 2, 27, 9, 0), "Green"),
+        snapshot(datetime(2026, 3, 2, 9, 0), "Yellow"),
+    ])
+    assert exporter.export() == {"Flan": 4}
+    
+    assert [status for _, status in exported(exporter, "snapshots")] == ["Green", "Green", "Yellow", "Red"]
+    # Changes are recomputed against the filled-in history, with no stale Green -> Red row
+    assert exported(exporter, "changes") == [
+        (datetime(2026, 3, 2, 9, 0), "Yellow"),
+        (datetime(2026, 3, 3, 9, 0), "Red"),
+    ]
+    
+    # A reopened exporter sees the same manifest
+    assert ColumnarExporter(storage, str(tmp_path / "columnar")).export() == {"Flan": 0}
+
+
+def test_new_snapshots_are_appended(tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    exporter = ColumnarExporter(storage, str(tmp_path / "columnar"))
+    storage.save_many([snapshot(datetime(2026, 3, 1, 9, 0), "Green")])
+    exporter.export()
+    storage.save_many([snapshot(datetime(2026, 3, 2, 9, 0), "Red")])
+    
+    assert exporter.export() == {"Flan": 1}
+    assert len(list((tmp_path / "columnar" / "snapshots" / "project=Flan").iterdir())) == 2
+    assert exported(exporter, "changes") == [(datetime(2026, 3, 2, 9, 0), "Red")]
+
+
+def test_legacy_watermark_manifest(tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    storage.save_many([
+        snapshot(datetime(2026, 3, 1, 9, 0), "Green"),
+        snapshot(datetime(2026, 3, 2, 9, 0), "Red"),
+    ])
+    first = storage.list_snapshots("Flan")[0].name
+    root = tmp_path / "columnar"
+    root.mkdir()
+    (root / "_manifest.json").write_text(json.dumps({"Flan": first}))
+    
+    assert ColumnarExporter(storage, str(root)).export() == {"Flan": 1}
+
+
+def test_parts_from_a_crashed_run_are_not_read_twice(tmp_path, monkeypatch):
+    storage = StatusStorage(str(tmp_path / "history"))
+    exporter = ColumnarExporter(storage, str(tmp_path / "columnar"))
+    storage.save_many([snapshot(datetime(2026, 3, 1, 9, 0), "Green")])
+    exporter.export()
+    storage.save_many([snapshot(datetime(2026, 3, 2, 9, 0), "Red")])
+    
+    # Die after the part files are written but before the manifest is saved
+    def crash():
+        raise OSError("disk full")
+    monkeypatch.setattr(exporter, "_save_manifest", crash)
+    with pytest.raises(OSError):
+        exporter.export()
+    
+    # The next run also picks up a newer snapshot, so its part name differs
+    storage.save_many([snapshot(datetime(2026, 3, 3, 9, 0), "Yellow")])
+    restarted = ColumnarExporter(storage, str(tmp_path / "columnar"))
+    assert restarted.export() == {"Flan": 2}
+    assert [status for _, status in exported(restarted, "snapshots")] == ["Green", "Red", "Yellow"]
+    assert exported(restarted, "changes") == [
+        (datetime(2026, 3, 2, 9, 0), "Red"),
+        (datetime(2026, 3, 3, 9, 0), "Yellow"),
+    ]
+
+
+def test_rebuild_replaces_old_parts(tmp_path):
+    storage = StatusStorage(str(tmp_path / "history"))
+    exporter = ColumnarExporter(storage, str(tmp_path / "columnar"))
+    for day in (1, 3):
+        storage.save_many([snapshot(datetime(2026, 3, day, 9, 0), "Green")])
+        exporter.export()
+    storage.save_many([snapshot(datetime(2026, 3, 2, 9, 0), "Red")])
+    
+    exporter.export()
+    
+    parts = list((tmp_path / "columnar" / "snapshots" / "project=Flan").iterdir())
+    assert len(parts) == 1
+    manifest = json.loads((tmp_path / "columnar" / "_manifest.json").read_text())
+    assert manifest["Flan"]["parts"] == [parts[0].stem]
+    assert len(manifest["Flan"]["snapshots"]) == 3
@@ -0,0 +1,114 @@
+"""Tests for section-aware content diffs"""
+
+from content_diff import diff_content, diff_lines, format_content_diff, split_sections
+
+
+PAGE = """Intro line
+
+## Status
+Overall: Green
+Phase: EVT
+
+## Risks
+- Supplier delay
+- Thermal margin
+
+## Notes
+First note
+"""
+
+
+def test_split_sections_by_heading():
+    sections = split_sections(PAGE)
+    
+    assert [(s.heading, s.level) for s in sections] == [("", 0), ("Status", 2), ("Risks", 2), ("Notes", 2)]
+    assert sections[1].lines == ["Overall: Green", "Phase: EVT", ""]
+    # Same text hashes the same, different text doesn't
+    assert split_sections(PAGE)[2].digest == sections[2].digest
+    assert sections[1].digest != sections[2].digest
+
+
+def test_split_sections_drops_empty_preamble():
+    assert [s.heading for s in split_sections("\n\n# Title\nbody")] == ["Title"]
+
+
+def test_diff_lines_keeps_page_order():
+    old = ["a", "b", "c", "d", "e"]
+    new = ["a", "x", "c", "d", "y", "e"]
+    
+    assert diff_lines(old, new) == (["x", "y"], ["b"])
+
+
+def test_diff_lines_moved_line():
+    added, removed = diff_lines(["a", "b", "c"], ["c", "a", "b"])
+    
+    assert added == ["c"] and removed == ["c"]
+
+
+def test_diff_lines_repeated_lines_only():
+    # No line is unique, so the gap falls back to changed line counts
+    assert diff_lines(["|", "|", "x", "x"], ["|", "x", "|", "x", "|"]) == (["|"], [])
+
+
+def test_diff_lines_large_page_is_fast_and_exact():
+    old = [f"row {i}" for i in range(50000)]
+    new = list(old)
+    for i in range(0, 50000, 500):
+        new[i] = f"edited {i}"
+    
+    added, removed = diff_lines(old, new)
+    
+    assert added == [f"edited {i}" for i in range(0, 50000, 500)]
+    assert removed == [f"row {i}" for i in range(0, 50000, 500)]
+
+
+def test_diff_content_added_removed_and_modified():
+    new_page = PAGE.replace("Overall: Green", "Overall: Yellow").replace(
+        "## Notes\nFirst note\n", "## Decisions\nShip in May\n")
+    
+    diffs = {d.heading: d for d in diff_content(PAGE, new_page)}
+    
+    assert diffs["Status"].change_type == "modified"
+    assert (diffs["Status"].added, diffs["Status"].removed) == (["Overall: Yellow"], ["Overall: Green"])
+    assert (diffs["Decisions"].change_type, diffs["Decisions"].added) == ("added", ["Ship in May"])
+    assert (diffs["Notes"].change_type, diffs["Notes"].removed) == ("removed", ["First note"])
+    assert "Risks" not in diffs
+
+
+def test_diff_content_moved_section_is_unchanged():
+    moved = "Intro line\n\n## Notes\nFirst note\n\n## Status\nOverall: Green\nPhase: EVT\n\n" \
+            "## Risks\n- Supplier delay\n- Thermal margin\n"
+    
+    assert diff_content(PAGE, moved) == []
+
+
+def test_diff_content_duplicate_headings_compared_by_occurrence():
+    old = "## Week\nshipped A\n## Week\nshipped B\n"
+    new = "## Week\nshipped A\n## Week\nshipped C\n## Week\nshipped D\n"
+    
+    diffs = diff_content(old, new)
+    
+    assert [(d.heading, d.change_type, d.added, d.removed) for d in diffs] == [
+        ("Week", "modified", ["shipped C"], ["shipped B"]),
+        ("Week", "added", ["shipped D"], []),
+    ]
+
+
+def test_diff_content_ignores_blank_line_edits():
+    assert diff_content(PAGE, PAGE.replace("Phase: EVT\n", "Phase: EVT\n\n\n")) == []
+
+
+def test_format_content_diff_truncates():
+    diffs = diff_content("## Log\n", "## Log\n" + "\n".join(f"entry {i}" for i in range(15)))
+    
+    lines = format_content_diff(diffs, max_lines=3)
+    
+    assert lines == [
+        "### Log (modified)",
+        "- ➕ entry 0",
+        "- ➕ entry 1",
+        "- ➕ entry 2",
+        "- … 12 more changed line(s)",
+        "",
+    ]
+    assert format_content_diff(diff_content("", "preamble"))[0] == "### (top of page) (added)"
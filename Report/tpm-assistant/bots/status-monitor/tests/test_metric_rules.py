@@ -0,0 +1,59 @@
+"""Tests for config-driven metric extraction"""
+
+import random
+import re
+
+import pytest
+
+from metric_rules import MetricRule, MetricRuleSet, default_metric_rules
+
+
+def legacy_metrics(content):
+    """The hard-coded regexes metric_rules.json replaced"""
+    metrics = {}
+    setup_match = re.search(r'(\d+)\s*\((\d+)%\)\s*(?:trials\s*)?devices?\s*(?:have\s*been\s*)?set\s*up', content, re.IGNORECASE)
+    if setup_match:
+        metrics['alpha_devices_setup'] = int(setup_match.group(1))
+        metrics['alpha_setup_rate'] = f"{setup_match.group(2)}%"
+    for pattern, key in [
+        (r'setup.*?(\d+\.\d+)/5', 'csat_setup'),
+        (r'response\s*time.*?(\d+\.\d+)/5', 'csat_response_time'),
+        (r'audio\s*quality.*?(\d+\.\d+)/5', 'csat_audio_quality'),
+    ]:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            metrics[key] = float(match.group(1))
+    return metrics
+
+
+@pytest.mark.parametrize("content", [
+    "42 (84%) trials devices have been set up\nSetup: 4.5/5",
+    "42 (84%)\ndevices set up",
+    "42 (84%) trials\n\n  Devices have been\nset up",
+    "42\n(84%) device setup",
+    "Response time\n 3.9/5\nresponse time is 4.1/5",
+    "AUDIO QUALITY 4.0/5 and setup 3.2/5",
+    "no metrics here",
+])
+def test_default_rules_match_legacy_regexes(content):
+    assert default_metric_rules().extract(content) == legacy_metrics(content)
+
+
+def test_default_rules_match_legacy_regexes_on_generated_pages():
+    rng = random.Random(31)
+    pieces = ["setup", "set up", "Devices", "device", "have been", "trials", "Response time",
+              "audio quality", "(12%)", "(7%)", "40", "3", "4.5/5", "2.0/5", " ", " ", "\n", "\n\n",
+              ":", "-", "x"]
+    for _ in range(5000):
+        content = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 30)))
+        assert default_metric_rules().extract(content) == legacy_metrics(content), content
+
+
+def test_top_level_alternation_in_anchor_is_rejected():
+    with pytest.raises(ValueError, match="alternation"):
+        MetricRuleSet([MetricRule(name="x", anchor="setup|onboarding", value=r"(\d+)")])
+
+
+def test_alternation_inside_group_is_allowed():
+    rules = MetricRuleSet([MetricRule(name="x", anchor=r"devices?\s*(?:set|wired)\s*up", value=r"(\d+)", type="int")])
+    assert rules.extract("Devices wired up: 7") == {"x": 7}
@@ -0,0 +1,68 @@
+"""Tests for version-conditional page fetches"""
+
+import pytest
+
+from page_fetcher import ConditionalPageFetcher
+
+
+class FakeConfluence:
+    """
+    Serves versions 1..3 of one page, honoring limit
+    
+    order: "sorted" honors the newest-first sort param, "newest" and "oldest"
+    always list in that fixed order.
+    """
+    
+    def __init__(self, order):
+        self.order = order
+        self.calls = []
+        self.params = []
+    
+    def call_tool(self, tool, params):
+        self.calls.append(tool)
+        if tool == "confluence_get_page_versions":
+            self.params.append(params)
+            versions = [{"number": n, "when": f"2026-03-0{n}T09:00:00"} for n in (1, 2, 3)]
+            newest_first = self.order == "newest" or (self.order == "sorted" and params.get("sort") == "-modified-date")
+            if newest_first:
+                versions.reverse()
+            return {"results": versions[:params.get("limit", len(versions))]}
+        return {"content": "body v3", "version": {"number": 3}}
+
+
+@pytest.mark.parametrize("order", ["sorted", "newest", "oldest"])
+def test_latest_version_ignores_response_order(tmp_path, order):
+    fetcher = ConditionalPageFetcher(FakeConfluence(order), str(tmp_path / "versions.json"))
+    assert fetcher.latest_version("42") == 3
+    assert fetcher.latest_version("42") == 3
+
+
+def test_latest_version_requests_only_the_newest_once_order_is_known(tmp_path):
+    client = FakeConfluence("sorted")
+    fetcher = ConditionalPageFetcher(client, str(tmp_path / "versions.json"))
+    for _ in range(3):
+        fetcher.latest_version("42")
+    
+    assert [params.get("limit") for params in client.params] == [2, 1, 1]
+
+
+def test_latest_version_falls_back_to_full_list_when_sort_is_ignored(tmp_path):
+    client = FakeConfluence("oldest")
+    fetcher = ConditionalPageFetcher(client, str(tmp_path / "versions.json"))
+    fetcher.latest_version("42")
+    fetcher.latest_version("42")
+    
+    assert [params.get("limit") for params in client.params] == [2, None, None]
+
+
+def test_unchanged_page_is_not_refetched(tmp_path):
+    client = FakeConfluence("oldest")
+    fetcher = ConditionalPageFetcher(client, str(tmp_path / "versions.json"))
+    
+    page = fetcher.fetch_if_changed("42")
+    assert (page.version, page.content) == (3, "body v3")
+    fetcher.mark_seen("42", page.version, "Flan")
+    
+    reopened = ConditionalPageFetcher(client, str(tmp_path / "versions.json"))
+    assert reopened.fetch_if_changed("42") is None
+    assert client.calls.count("confluence_get_page") == 1
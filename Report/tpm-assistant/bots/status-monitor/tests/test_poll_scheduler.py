@@ -0,0 +1,85 @@
+"""Tests for change-rate estimation in the poll scheduler"""
+
+from datetime import datetime, timedelta
+
+from poll_scheduler import PageTarget, PollScheduler
+from status_monitor import ProjectStatus, StatusStorage
+
+
+START = datetime(2026, 3, 1, 9, 0)
+
+
+def snapshot(hours, content):
+    return ProjectStatus(project_name="Flan", page_id="1", timestamp=START + timedelta(hours=hours),
+                         overall_status="Green", raw_content=content)
+
+
+def scheduler(storage):
+    return PollScheduler(storage, [PageTarget("Flan", "1")])
+
+
+def test_rate_counts_content_changes_over_time_until_now(tmp_path):
+    storage = StatusStorage(str(tmp_path))
+    storage.save_many([snapshot(0, "a"), snapshot(1, "a"), snapshot(2, "b"), snapshot(3, "c")])
+    
+    # 2 changes + 1 pseudo-change over (24h since the first snapshot + 24h)
+    rate = scheduler(storage).estimate_change_rate("Flan", now=START + timedelta(hours=24))
+    assert rate == 3 / 48
+    
+    # A page that has since gone quiet decays toward a lower rate
+    quiet = scheduler(storage).estimate_change_rate("Flan", now=START + timedelta(days=10))
+    assert quiet < rate
+
+
+def test_rate_uses_cached_hashes_instead_of_reloading_snapshots(tmp_path, monkeypatch):
+    storage = StatusStorage(str(tmp_path))
+    storage.save_many([snapshot(0, "a"), snapshot(1, "b")])
+    
+    def fail(path):
+        raise AssertionError(f"loaded {path}")
+    
+    monkeypatch.setattr(storage, "load_snapshot", fail)
+    sched = scheduler(storage)
+    assert sched.estimate_change_rate("Flan", now=START + timedelta(hours=1)) == 2 / 25
+    sched.record_poll(PageTarget("Flan", "1"), now=(START + timedelta(hours=1)).timestamp())
+
+
+def test_rate_hashes_snapshots_written_by_another_process(tmp_path):
+    StatusStorage(str(tmp_path)).save_many([snapshot(0, "a"), snapshot(1, "a"), snapshot(2, "b")])
+    
+    fresh = StatusStorage(str(tmp_path))
+    assert scheduler(fresh).estimate_change_rate("Flan", now=START) == 2 / 24
+
+
+def test_failed_poll_is_retried_without_counting_as_a_poll(tmp_path, monkeypatch):
+    storage = StatusStorage(str(tmp_path))
+    sched = PollScheduler(storage, [PageTarget("Flan", "1"), PageTarget("Quiet", "2")],
+                          min_interval=600, max_interval=86400, jitter=0)
+    monkeypatch.setattr("poll_scheduler.time.time", lambda: 1_000_000.0)
+    sched._next_due = {"1": 0.0, "2": 0.0}
+    sched._rates = {"1": 0.5, "2": 0.5}
+    
+    def poll(target):
+        if target.page_id == "1":
+            raise ConnectionError("MCP server exited")
+    
+    assert sched.run_due(poll) == 2
+    
+    # The failed page comes back after min_interval with its rate untouched;
+    # the successful one gets a full planned interval
+    assert sched._next_due["1"] == 1_000_000.0 + 600
+    assert sched._rates["1"] == 0.5
+    assert sched._next_due["2"] > 1_000_000.0 + 600
+    assert sched._rates["2"] != 0.5
+
+
+def test_plan_splits_budget_by_sqrt_rate(tmp_path):
+    sched = PollScheduler(StatusStorage(str(tmp_path)), [PageTarget("Busy", "1"), PageTarget("Quiet", "2")],
+                          polls_per_hour=10, min_interval=60, max_interval=86400)
+    sched._rates = {"1": 4.0, "2": 1.0}
+    
+    intervals = sched.plan()
+    
+    # sqrt weights 2:1 -> 6.67 and 3.33 polls per hour
+    assert round(intervals["1"]) == 540
+    assert round(intervals["2"]) == 1080
@@ -0,0 +1,34 @@
+"""Tests for as-of lookups over stored status history"""
+
+from datetime import datetime, timedelta, timezone
+
+from status_monitor import ProjectStatus, StatusStorage
+
+
+def snapshot(ts, status):
+    return ProjectStatus(project_name="Flan", page_id="1", timestamp=ts, overall_status=status)
+
+
+def test_as_of_returns_latest_snapshot_at_or_before(tmp_path):
+    storage = StatusStorage(str(tmp_path))
+    storage.save_many([
+        snapshot(datetime(2026, 1, 10, 9, 0), "Green"),
+        snapshot(datetime(2026, 1, 12, 9, 0), "Yellow"),
+        snapshot(datetime(2026, 1, 14, 9, 0), "Red"),
+    ])
+    
+    assert storage.get_as_of("Flan", datetime(2026, 1, 9)) is None
+    assert storage.get_as_of("Flan", datetime(2026, 1, 12, 9, 0)).overall_status == "Yellow"
+    assert storage.get_as_of("Flan", datetime(2026, 1, 13)).overall_status == "Yellow"
+    assert storage.get_as_of("Flan", datetime(2026, 2, 1)).overall_status == "Red"
+
+
+def test_as_of_accepts_timezone_aware_times(tmp_path):
+    storage = StatusStorage(str(tmp_path))
+    local = datetime(2026, 1, 12, 9, 0)
+    storage.save_many([snapshot(local, "Green"), snapshot(local + timedelta(hours=2), "Red")])
+    
+    # The same instant as `local` plus one hour, expressed in UTC
+    aware = (local + timedelta(hours=1)).astimezone(timezone.utc)
+    assert storage.get_as_of("Flan", aware).overall_status == "Green"
+    assert storage.get_as_of("Flan", datetime.fromisoformat("2000-01-01T00:00+00:00")) is None